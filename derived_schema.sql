@@ -0,0 +1,435 @@
+-- DERIVED SCHEMA
+-- Maintained structures computed from the source-of-truth tables.
+-- Nothing here is truth. Every row can be dropped and recomputed.
+-- All statements are idempotent (applied at init and by scripts/migrate_v5.py).
+
+-- 1. Correlation Cache (Screen Time / Work Waste vs Hamartia)
+-- Keyed by the data version the result was computed from.
+-- A stale version is never served; it is simply recomputed.
+CREATE TABLE IF NOT EXISTS correlation_cache (
+    data_version TEXT PRIMARY KEY,
+    result JSONB NOT NULL,
+    computed_at TIMESTAMP NOT NULL DEFAULT NOW()
+);
+
+-- 2. Pattern Scan Indexes (Multi-Horizon Report)
+-- The report scans unconfessed sins plus the last year, ordered by time.
+CREATE INDEX IF NOT EXISTS idx_hamartia_created_at
+    ON hamartia_log (created_at, id);
+CREATE INDEX IF NOT EXISTS idx_hamartia_unconfessed_created_at
+    ON hamartia_log (created_at, id) WHERE confessed = FALSE;
+
+-- 3. Pattern Sketches (Approximate Analytics)
+-- One row per (completed month, source), folded once by the first
+-- approximate read after the month ends; sketch_cursor records the last
+-- day folded. Inserts do no sketch work. The current month is sketched
+-- from its own rows at read time, through the date indexes.
+CREATE TABLE IF NOT EXISTS pattern_sketches (
+    bucket DATE NOT NULL,
+    source TEXT NOT NULL CHECK (source IN ('hamartia', 'context_events')),
+    sketch JSONB NOT NULL,
+    updated_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (bucket, source)
+);
+
+CREATE TABLE IF NOT EXISTS sketch_cursor (
+    source TEXT PRIMARY KEY CHECK (source IN ('hamartia', 'context_events')),
+    folded_through DATE NOT NULL
+);
+
+-- Sketches were once maintained on insert, current month included:
+-- drop the partial month, which is now read from the rows
+DELETE FROM pattern_sketches WHERE bucket >= date_trunc('month', CURRENT_DATE);
+INSERT INTO sketch_cursor (source, folded_through)
+SELECT source, (date_trunc('month', CURRENT_DATE) - INTERVAL '1 day')::date
+FROM (VALUES ('hamartia'), ('context_events')) AS sources (source)
+ON CONFLICT (source) DO NOTHING;
+
+CREATE INDEX IF NOT EXISTS idx_context_events_date
+    ON context_events (date);
+
+-- 4. Passion Closure (Evagrian Genealogy Rollups)
+-- Every (ancestor, descendant) pair of passion_ontology, including each
+-- passion with itself at depth 0. Rebuilt after any change to the
+-- ontology, so analytics roll up to root passions with one join.
+CREATE TABLE IF NOT EXISTS passion_closure (
+    ancestor_id INTEGER NOT NULL REFERENCES passion_ontology(id) ON DELETE CASCADE,
+    descendant_id INTEGER NOT NULL REFERENCES passion_ontology(id) ON DELETE CASCADE,
+    depth INTEGER NOT NULL,
+    ancestor_is_root BOOLEAN NOT NULL,
+    PRIMARY KEY (ancestor_id, descendant_id)
+);
+CREATE INDEX IF NOT EXISTS idx_passion_closure_descendant
+    ON passion_closure (descendant_id, ancestor_is_root);
+
+CREATE OR REPLACE FUNCTION rebuild_passion_closure() RETURNS void AS $$
+BEGIN
+    DELETE FROM passion_closure;
+    INSERT INTO passion_closure (ancestor_id, descendant_id, depth, ancestor_is_root)
+    WITH RECURSIVE walk (ancestor_id, descendant_id, depth) AS (
+        SELECT id, id, 0 FROM passion_ontology
+        UNION ALL
+        SELECT po.parent_passion_id, w.descendant_id, w.depth + 1
+        FROM walk w
+        JOIN passion_ontology po ON po.id = w.ancestor_id
+        WHERE po.parent_passion_id IS NOT NULL
+          AND w.depth < 64  -- Guard against a cycle in the ontology
+    )
+    SELECT w.ancestor_id, w.descendant_id, w.depth, a.parent_passion_id IS NULL
+    FROM walk w
+    JOIN passion_ontology a ON a.id = w.ancestor_id;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION passion_closure_refresh() RETURNS trigger AS $$
+BEGIN
+    PERFORM rebuild_passion_closure();
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS passion_closure_refresh ON passion_ontology;
+CREATE TRIGGER passion_closure_refresh
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON passion_ontology
+    FOR EACH STATEMENT EXECUTE FUNCTION passion_closure_refresh();
+
+SELECT rebuild_passion_closure();
+
+-- 5. Sin Lineage (parent_sin_id Closure)
+-- hamartia_log is append-only and parent_sin_id never changes, so the
+-- closure only ever grows: one row per (ancestor, descendant) pair,
+-- written by log_hamartia in the same transaction as the sin.
+CREATE INDEX IF NOT EXISTS idx_hamartia_parent_sin
+    ON hamartia_log (parent_sin_id) WHERE parent_sin_id IS NOT NULL;
+
+CREATE TABLE IF NOT EXISTS hamartia_lineage (
+    ancestor_id INTEGER NOT NULL REFERENCES hamartia_log(id),
+    descendant_id INTEGER NOT NULL REFERENCES hamartia_log(id),
+    depth INTEGER NOT NULL,
+    PRIMARY KEY (ancestor_id, descendant_id)
+);
+CREATE INDEX IF NOT EXISTS idx_hamartia_lineage_descendant
+    ON hamartia_lineage (descendant_id, depth);
+
+-- One row per lineage tree, keyed by its root sin
+CREATE TABLE IF NOT EXISTS hamartia_lineage_tree (
+    root_id INTEGER PRIMARY KEY REFERENCES hamartia_log(id),
+    size INTEGER NOT NULL DEFAULT 1,
+    max_depth INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_hamartia_lineage_tree_size
+    ON hamartia_lineage_tree (size DESC, root_id);
+
+CREATE OR REPLACE FUNCTION rebuild_hamartia_lineage() RETURNS void AS $$
+BEGIN
+    DELETE FROM hamartia_lineage_tree;
+    DELETE FROM hamartia_lineage;
+    INSERT INTO hamartia_lineage (ancestor_id, descendant_id, depth)
+    WITH RECURSIVE walk (ancestor_id, descendant_id, depth) AS (
+        SELECT id, id, 0 FROM hamartia_log
+        UNION ALL
+        SELECT h.parent_sin_id, w.descendant_id, w.depth + 1
+        FROM walk w
+        JOIN hamartia_log h ON h.id = w.ancestor_id
+        WHERE h.parent_sin_id IS NOT NULL
+    )
+    SELECT ancestor_id, descendant_id, depth FROM walk;
+
+    INSERT INTO hamartia_lineage_tree (root_id, size, max_depth)
+    SELECT l.ancestor_id, COUNT(*), MAX(l.depth)
+    FROM hamartia_lineage l
+    JOIN hamartia_log h ON h.id = l.ancestor_id
+    WHERE h.parent_sin_id IS NULL
+    GROUP BY l.ancestor_id;
+END;
+$$ LANGUAGE plpgsql;
+
+SELECT rebuild_hamartia_lineage()
+WHERE NOT EXISTS (SELECT 1 FROM hamartia_lineage);
+
+-- 6. Passion Transitions (Markov Matrix)
+-- Counts of passion A followed by passion B (consecutive sins), with the
+-- distribution of the time between them. Maintained by log_hamartia
+-- from hamartia_cursor (the previous sin), so no self-join is needed.
+-- Gap buckets: <1h, 1-6h, 6-24h, 1-3d, 3-7d, 7-30d, >30d
+CREATE TABLE IF NOT EXISTS passion_transitions (
+    from_passion TEXT NOT NULL,
+    to_passion TEXT NOT NULL,
+    count INTEGER NOT NULL DEFAULT 0,
+    total_seconds DOUBLE PRECISION NOT NULL DEFAULT 0,
+    gap_histogram INTEGER[] NOT NULL DEFAULT '{0,0,0,0,0,0,0}',
+    PRIMARY KEY (from_passion, to_passion)
+);
+
+-- Single row: the most recent sin folded into passion_transitions
+CREATE TABLE IF NOT EXISTS hamartia_cursor (
+    id BOOLEAN PRIMARY KEY DEFAULT TRUE CHECK (id),
+    last_sin_id INTEGER REFERENCES hamartia_log(id),
+    last_passion TEXT,
+    last_created_at TIMESTAMP
+);
+
+CREATE OR REPLACE FUNCTION rebuild_passion_transitions() RETURNS void AS $$
+BEGIN
+    DELETE FROM passion_transitions;
+    DELETE FROM hamartia_cursor;
+
+    INSERT INTO passion_transitions (from_passion, to_passion, count, total_seconds, gap_histogram)
+    SELECT from_passion, to_passion, COUNT(*), SUM(gap),
+        ARRAY[
+            COUNT(*) FILTER (WHERE bucket = 0),
+            COUNT(*) FILTER (WHERE bucket = 1),
+            COUNT(*) FILTER (WHERE bucket = 2),
+            COUNT(*) FILTER (WHERE bucket = 3),
+            COUNT(*) FILTER (WHERE bucket = 4),
+            COUNT(*) FILTER (WHERE bucket = 5),
+            COUNT(*) FILTER (WHERE bucket = 6)
+        ]::INTEGER[]
+    FROM (
+        SELECT from_passion, to_passion, gap,
+            width_bucket(gap, ARRAY[3600, 21600, 86400, 259200, 604800, 2592000]::DOUBLE PRECISION[]) AS bucket
+        FROM (
+            SELECT
+                LAG(passions) OVER w AS from_passion,
+                passions AS to_passion,
+                EXTRACT(EPOCH FROM created_at - LAG(created_at) OVER w)::DOUBLE PRECISION AS gap
+            FROM hamartia_log
+            WINDOW w AS (ORDER BY created_at, id)
+        ) pairs
+        WHERE from_passion IS NOT NULL
+    ) bucketed
+    GROUP BY from_passion, to_passion;
+
+    INSERT INTO hamartia_cursor (last_sin_id, last_passion, last_created_at)
+    SELECT id, passions, created_at
+    FROM hamartia_log
+    ORDER BY created_at DESC, id DESC
+    LIMIT 1;
+END;
+$$ LANGUAGE plpgsql;
+
+SELECT rebuild_passion_transitions()
+WHERE NOT EXISTS (SELECT 1 FROM hamartia_cursor);
+
+-- 7. Metric Baselines (Welford Running Mean/Variance)
+-- One row per daily metric, folded from completed days only (never today).
+-- baseline_cursor records the last day folded per source table; the
+-- first mutation of a new day folds the days since, usually just one.
+CREATE TABLE IF NOT EXISTS metric_baseline (
+    metric TEXT PRIMARY KEY,
+    source TEXT NOT NULL CHECK (source IN ('daily_state', 'daily_work_state')),
+    n BIGINT NOT NULL DEFAULT 0,
+    mean DOUBLE PRECISION NOT NULL DEFAULT 0,
+    m2 DOUBLE PRECISION NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS baseline_cursor (
+    source TEXT PRIMARY KEY CHECK (source IN ('daily_state', 'daily_work_state')),
+    folded_through DATE NOT NULL
+);
+
+-- 8. Liturgical Seasons (Range Table)
+-- The season label of each day is upstream truth, written by
+-- populate_liturgical_calendar.py. liturgical_season collapses consecutive
+-- days of one season into a single range, so sins join to seasons with one
+-- GiST range probe per day instead of a day-by-day calendar join.
+ALTER TABLE liturgical_calendar ADD COLUMN IF NOT EXISTS season TEXT;
+
+CREATE TABLE IF NOT EXISTS liturgical_season (
+    id SERIAL PRIMARY KEY,
+    season TEXT NOT NULL,
+    during DATERANGE NOT NULL,
+    EXCLUDE USING gist (during WITH &&)
+);
+
+CREATE INDEX IF NOT EXISTS idx_liturgical_season_during
+    ON liturgical_season USING gist (during);
+
+CREATE OR REPLACE FUNCTION rebuild_liturgical_seasons() RETURNS VOID AS $$
+BEGIN
+    DELETE FROM liturgical_season;
+    -- Gaps and islands: consecutive dates of one season share date - row_number
+    INSERT INTO liturgical_season (season, during)
+    SELECT season, daterange(MIN(date), MAX(date), '[]')
+    FROM (
+        SELECT date, season,
+               date - (ROW_NUMBER() OVER (PARTITION BY season ORDER BY date))::INTEGER AS island
+        FROM liturgical_calendar
+        WHERE season IS NOT NULL
+    ) days
+    GROUP BY season, island;
+END;
+$$ LANGUAGE plpgsql;
+
+SELECT rebuild_liturgical_seasons()
+WHERE NOT EXISTS (SELECT 1 FROM liturgical_season);
+
+-- 9. Timeline Ordering
+-- logos timeline streams every event source ordered by its timestamp,
+-- one server-side cursor per source. Each needs an index in that order.
+-- Penance completions had no timestamp before; earlier ones stay NULL.
+ALTER TABLE confession_log ADD COLUMN IF NOT EXISTS penance_completed_at TIMESTAMP;
+
+CREATE INDEX IF NOT EXISTS idx_confession_created_at
+    ON confession_log (created_at, id);
+
+CREATE INDEX IF NOT EXISTS idx_confession_penance_completed_at
+    ON confession_log (penance_completed_at, id)
+    WHERE penance_completed_at IS NOT NULL;
+
+CREATE INDEX IF NOT EXISTS idx_daily_state_updated_at
+    ON daily_state (updated_at, date);
+
+CREATE INDEX IF NOT EXISTS idx_daily_work_state_updated_at
+    ON daily_work_state (updated_at, date);
+
+CREATE INDEX IF NOT EXISTS idx_commitment_created_at
+    ON commitment_log (created_at, id);
+
+CREATE INDEX IF NOT EXISTS idx_commitment_resolved_at
+    ON commitment_log (updated_at, id)
+    WHERE status <> 'active';
+
+-- Status reads the open commitments and the unreviewed abandonments on
+-- every call; both sets stay small however long the log grows.
+CREATE INDEX IF NOT EXISTS idx_commitment_active
+    ON commitment_log (id)
+    WHERE status = 'active';
+
+CREATE INDEX IF NOT EXISTS idx_commitment_abandoned_unprocessed
+    ON commitment_log (id)
+    WHERE status = 'abandoned' AND processed = FALSE;
+
+CREATE INDEX IF NOT EXISTS idx_context_events_timestamp
+    ON context_events (timestamp, id);
+
+-- 10. Full-Text Search
+-- Generated tsvector columns (description outranks context) with GIN
+-- indexes. Generated columns are computed by Postgres on write, so no
+-- mutation code changes and the log itself is untouched.
+ALTER TABLE hamartia_log ADD COLUMN IF NOT EXISTS search_vector TSVECTOR
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', description), 'A')
+        || setweight(to_tsvector('english', COALESCE(context, '')), 'B')
+    ) STORED;
+
+ALTER TABLE confession_log ADD COLUMN IF NOT EXISTS search_vector TSVECTOR
+    GENERATED ALWAYS AS (
+        to_tsvector('english', COALESCE(notes, ''))
+    ) STORED;
+
+CREATE INDEX IF NOT EXISTS idx_hamartia_search
+    ON hamartia_log USING gin (search_vector);
+
+CREATE INDEX IF NOT EXISTS idx_confession_search
+    ON confession_log USING gin (search_vector);
+
+-- 11. Unconfessed Paging
+-- log confess pages through unconfessed sins on (date, id), optionally
+-- for one passion; record_sacrament absolves by the same filters.
+CREATE INDEX IF NOT EXISTS idx_hamartia_unconfessed_date
+    ON hamartia_log (date, id)
+    WHERE confessed = FALSE;
+
+CREATE INDEX IF NOT EXISTS idx_hamartia_unconfessed_passion_date
+    ON hamartia_log (passions, date, id)
+    WHERE confessed = FALSE;
+
+-- 12. Staged Absolution
+-- record_sacrament links sins to a 'staging' confession in bounded batches,
+-- then marks it 'complete' in one single-row commit. Until then its sins
+-- still count as unconfessed, so the health view is redefined accordingly.
+ALTER TABLE confession_log ADD COLUMN IF NOT EXISTS status TEXT NOT NULL DEFAULT 'complete'
+    CHECK (status IN ('staging', 'complete'));
+
+-- The scope a staging confession absolves (its sin ids, or its filters
+-- pinned by through_id), so an interrupted run can be finished exactly.
+-- Confessions staged before these columns have no through_id.
+ALTER TABLE confession_log ADD COLUMN IF NOT EXISTS absolve_sin_ids INTEGER[];
+ALTER TABLE confession_log ADD COLUMN IF NOT EXISTS absolve_passion TEXT;
+ALTER TABLE confession_log ADD COLUMN IF NOT EXISTS absolve_start DATE;
+ALTER TABLE confession_log ADD COLUMN IF NOT EXISTS absolve_end DATE;
+ALTER TABLE confession_log ADD COLUMN IF NOT EXISTS absolve_through_id INTEGER;
+
+CREATE INDEX IF NOT EXISTS idx_confession_staging
+    ON confession_log (id)
+    WHERE status = 'staging';
+
+CREATE INDEX IF NOT EXISTS idx_hamartia_absolution
+    ON hamartia_log (absolution_id)
+    WHERE absolution_id IS NOT NULL;
+
+CREATE OR REPLACE VIEW system_health_today AS
+SELECT
+    CURRENT_DATE as date,
+    ds.prayer_minutes,
+    ds.reading_minutes,
+    ds.screen_time_minutes,
+    ds.fasted,
+    ds.prayed,
+    -- Granular fields for Phase 4 diagnostic
+    ds.prayer_interruptions,
+    ds.fast_break_reason,
+    ds.screen_time_work,
+    ds.screen_time_social,
+    ds.screen_time_entertainment,
+    ds.screen_time_edifying,
+    
+    lc.fast_type,
+    lc.feast,
+    lc.feast_level,
+    -- One indexable branch each: the unconfessed partial indexes, then
+    -- sins under a confession still being recorded ('staging')
+    (SELECT COUNT(*) FROM (
+        SELECT id FROM hamartia_log WHERE confessed = FALSE
+        UNION ALL
+        SELECT h.id
+        FROM confession_log c
+        JOIN hamartia_log h ON h.absolution_id = c.id AND h.confessed = TRUE
+        WHERE c.status = 'staging'
+    ) AS unconfessed) as unconfessed_count
+FROM daily_state ds
+LEFT JOIN liturgical_calendar lc ON lc.date = CURRENT_DATE
+WHERE ds.date = CURRENT_DATE
+GROUP BY
+    ds.prayer_minutes,
+    ds.reading_minutes,
+    ds.screen_time_minutes,
+    ds.fasted,
+    ds.prayed,
+    ds.prayer_interruptions,
+    ds.fast_break_reason,
+    ds.screen_time_work,
+    ds.screen_time_social,
+    ds.screen_time_entertainment,
+    ds.screen_time_edifying,
+    lc.fast_type,
+    lc.feast,
+    lc.feast_level;
+
+-- 13. Data Version and Health Cache
+-- Every mutation bumps data_version in its own transaction (a row update,
+-- so readers never see a version before the data it stands for).
+-- health_cache memoizes the rendered health check per (version, date),
+-- with the unconfessed count it was computed from.
+CREATE TABLE IF NOT EXISTS data_version (
+    id BOOLEAN PRIMARY KEY DEFAULT TRUE CHECK (id),
+    version BIGINT NOT NULL DEFAULT 0
+);
+
+INSERT INTO data_version (id) VALUES (TRUE)
+ON CONFLICT (id) DO NOTHING;
+
+CREATE TABLE IF NOT EXISTS health_cache (
+    version BIGINT NOT NULL,
+    date DATE NOT NULL,
+    variant TEXT NOT NULL,
+    state TEXT NOT NULL,
+    output TEXT NOT NULL,
+    unconfessed_count BIGINT,
+    computed_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (version, date, variant)
+);
+
+-- Entries memoized before the count was stored are recomputed
+ALTER TABLE health_cache ADD COLUMN IF NOT EXISTS unconfessed_count BIGINT;
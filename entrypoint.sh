@@ -11,6 +11,12 @@ done
 # Initialize DB if needed (migrates schema)
 python3 scripts/migrate_v4.py
 
+# Apply derived structures (caches, maintained aggregates)
+python3 scripts/migrate_v5.py
+
+# Replace full-text uniqueness with a digest index (online, idempotent)
+python3 scripts/migrate_v6.py
+
 # Populate liturgical calendar (Ortho-fix)
 python3 scripts/populate_liturgical_calendar.py
 
@@ -6,7 +6,12 @@ Allows running via:
 """
 
 import sys
-from logos.cli import main
 
 if __name__ == "__main__":
+    # Prompt fast path: no argparse, no psycopg2, no alignment
+    if sys.argv[1:2] == ["prompt"]:
+        from logos.prompt import main as prompt_main
+        sys.exit(prompt_main(sys.argv[2:]))
+
+    from logos.cli import main
     sys.exit(main())
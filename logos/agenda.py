@@ -8,8 +8,11 @@ Applies Spirit Core principles to work:
 4. Passion-based failure diagnosis.
 """
 
+import time
 from datetime import date
-from logos.db import get_connection
+from logos.db import get_connection, bump_data_version
+from logos.metrics import observe_call
+from logos.baseline import fold_completed_days
 from logos.mutations import PASSIONS
 
 
@@ -23,7 +26,7 @@ def commit(description, work_type, minutes):
     """
     conn = get_connection()
     try:
-        cur = conn.cursor()
+        cur = conn.cursor(tag="agenda.commit")
         cur.execute("""
             INSERT INTO commitment_log (date, description, type, committed_minutes)
             VALUES (CURRENT_DATE, %s, %s, %s)
@@ -31,6 +34,7 @@ def commit(description, work_type, minutes):
         """, (description, work_type, minutes))
         
         cid = cur.fetchone()[0]
+        bump_data_version(cur)
         conn.commit()
         return cid
     finally:
@@ -56,7 +60,7 @@ def log_work(category, minutes, encroached=False):
 
     conn = get_connection()
     try:
-        cur = conn.cursor()
+        cur = conn.cursor(tag="agenda.log_work")
         
         # Ensure row exists
         cur.execute("""
@@ -64,7 +68,7 @@ def log_work(category, minutes, encroached=False):
             ON CONFLICT (date) DO NOTHING
         """)
         
-        query = f"UPDATE daily_work_state SET {category} = {category} + %s"
+        query = f"UPDATE daily_work_state SET {category} = {category} + %s, updated_at = NOW()"
         params = [minutes]
         
         if encroached:
@@ -73,6 +77,8 @@ def log_work(category, minutes, encroached=False):
         query += " WHERE date = CURRENT_DATE"
         
         cur.execute(query, params)
+        fold_completed_days(cur, "daily_work_state")
+        bump_data_version(cur)
         conn.commit()
     finally:
         cur.close()
@@ -83,11 +89,12 @@ def log_context_switch(from_type, to_type, passion=None, lag=0):
     """Log a context switch event."""
     conn = get_connection()
     try:
-        cur = conn.cursor()
+        cur = conn.cursor(tag="agenda.log_context_switch")
         cur.execute("""
             INSERT INTO context_events (date, from_type, to_type, trigger_passion, resumption_lag_minutes)
             VALUES (CURRENT_DATE, %s, %s, %s, %s)
         """, (from_type, to_type, passion, lag))
+        bump_data_version(cur)
         conn.commit()
     finally:
         cur.close()
@@ -101,6 +108,7 @@ def abandon_commitment(commitment_id, passion, confess_as_sin=True):
     
     Orthodox anthropology: Failure to work is a spiritual failure.
     "If anyone will not work, neither shall he eat." (2 Thess 3:10)
+    """
     from logos.mutations import log_hamartia
     
     if passion not in PASSIONS:
@@ -108,7 +116,7 @@ def abandon_commitment(commitment_id, passion, confess_as_sin=True):
 
     conn = get_connection()
     try:
-        cur = conn.cursor()
+        cur = conn.cursor(tag="agenda.abandon_commitment")
         
         # Get description for the sin log
         cur.execute("SELECT description FROM commitment_log WHERE id = %s", (commitment_id,))
@@ -129,18 +137,21 @@ def abandon_commitment(commitment_id, passion, confess_as_sin=True):
         if cur.rowcount == 0:
             raise ValueError("Commitment not found or not active.")
             
+        bump_data_version(cur)
         conn.commit()
         
-        # Orthodox Theology: Work failure IS spiritual failure
-        log_hamartia(
-            passion=passion,
-            description=f"Abandoned work commitment: {desc}",
-            context="work_layer"
-        )
-        
     finally:
         cur.close()
         conn.close()
+    
+    # Orthodox Theology: Work failure IS spiritual failure
+    # (after the connection is returned: log_hamartia takes its own, and
+    # under logos serve a worker holding two would exhaust the pool)
+    log_hamartia(
+        passion=passion,
+        description=f"Abandoned work commitment: {desc}",
+        context="work_layer"
+    )
 
 
 def calculate_work_health():
@@ -149,9 +160,10 @@ def calculate_work_health():
     FROZEN LOGIC.
     Returns: dict with 'state' and 'diagnosis'
     """
+    started = time.perf_counter()
     conn = get_connection()
     try:
-        cur = conn.cursor()
+        cur = conn.cursor(tag="agenda.calculate_work_health")
         
         # 1. Get Daily State
         cur.execute("""
@@ -212,3 +224,4 @@ def calculate_work_health():
     finally:
         cur.close()
         conn.close()
+        observe_call("agenda.calculate_work_health", time.perf_counter() - started)
@@ -27,6 +27,8 @@ def calculate_system_state(daily_state, liturgical_context, unconfessed_count):
     # 1. THE FOUNDATION: HAMARTIA (The Burden)
     # "My iniquities have gone over my head; like a heavy burden they are too heavy for me." (Psalm 38:4)
     # -------------------------------------------------------------------------
+    if unconfessed_count >= 5:
+        return {
             "state": "CRITICAL",
             "diagnosis": "Paralysis of the Will",
             "counsel": "Go to confession immediately. Do not delay. (James 5:16)",
@@ -0,0 +1,301 @@
+"""
+Approximate Pattern Analytics (Streaming Sketches).
+
+"Be sober, be vigilant." (1 Peter 5:8)
+Exact GROUP BY over millions of rows is the slowest part of health.
+Each completed month is sketched once, folded by the first read after
+it ends; the current month is sketched from its own rows at read time.
+Inserts do no sketch work. Every approximate figure is reported with
+its error bound.
+
+The exact report (logos.patterns) remains the default.
+"""
+
+import json
+import math
+import psycopg2
+from logos.db import get_connection
+from logos.sketches import (CountMinSketch, SpaceSaving, HyperLogLog, count_min_from_dict,
+                            space_saving_from_dict, hyperloglog_from_dict)
+
+
+ALL = "All"
+
+
+def _new_sketch(source):
+    """Empty sketch set for a bucket of the given source."""
+    if source == "hamartia":
+        return {
+            "passions": SpaceSaving(k=16),
+            "descriptions": SpaceSaving(k=64),
+            "description_counts": CountMinSketch(),
+            "days": {ALL: HyperLogLog()},
+        }
+    return {
+        "triggers": SpaceSaving(k=16),
+        "days": {ALL: HyperLogLog()},
+    }
+
+
+def _encode(sketch):
+    encoded = {}
+    for name, value in sketch.items():
+        if name == "days":
+            encoded[name] = {key: hll.to_dict() for key, hll in value.items()}
+        else:
+            encoded[name] = value.to_dict()
+    return encoded
+
+
+def _decode(data):
+    decoded = {}
+    for name, value in data.items():
+        if name == "days":
+            decoded[name] = {key: hyperloglog_from_dict(d) for key, d in value.items()}
+        elif name == "description_counts":
+            decoded[name] = count_min_from_dict(value)
+        else:
+            decoded[name] = space_saving_from_dict(value)
+    return decoded
+
+
+def _merge(into, sketch):
+    for name, value in sketch.items():
+        if name == "days":
+            for key, hll in value.items():
+                if key in into["days"]:
+                    into["days"][key].merge(hll)
+                else:
+                    into["days"][key] = hll
+        else:
+            into[name].merge(value)
+    return into
+
+
+def _add_hamartia(sketch, day, passion, description):
+    sketch["passions"].add(passion)
+    sketch["descriptions"].add(description)
+    sketch["description_counts"].add(description)
+    sketch["days"][ALL].add(day)
+    sketch["days"].setdefault(passion, HyperLogLog()).add(day)
+
+
+def _add_context(sketch, day, passion):
+    if passion:
+        sketch["triggers"].add(passion)
+        sketch["days"].setdefault(passion, HyperLogLog()).add(day)
+    sketch["days"][ALL].add(day)
+
+
+# Rows folded into each source's sketches, by month bucket. Every query
+# is bounded by date, so it reads through the date index.
+SOURCE_ROWS = {
+    "hamartia": """
+        SELECT date_trunc('month', date)::date, date, passions, description
+        FROM hamartia_log
+    """,
+    "context_events": """
+        SELECT date_trunc('month', date)::date, date, trigger_passion
+        FROM context_events
+    """,
+}
+
+
+def _sketch_rows(conn, source, where, params=None):
+    """
+    Sketch the source's rows matching `where`, one sketch per month.
+
+    Streams rows through a server-side cursor so memory stays bounded.
+
+    Returns:
+        dict: {bucket date: sketch}
+    """
+    buckets = {}
+    cur = conn.cursor(name=f"sketch_{source}", tag="approx._sketch_rows")
+    cur.execute(SOURCE_ROWS[source] + f" WHERE {where}", params)
+    for row in cur:
+        bucket, day = row[0], row[1].isoformat()
+        sketch = buckets.setdefault(bucket, _new_sketch(source))
+        if source == "hamartia":
+            _add_hamartia(sketch, day, row[2], row[3])
+        else:
+            _add_context(sketch, day, row[2])
+    cur.close()
+    return buckets
+
+
+def _store_buckets(cur, source, buckets):
+    for bucket, sketch in buckets.items():
+        cur.execute("""
+            INSERT INTO pattern_sketches (bucket, source, sketch)
+            VALUES (%s, %s, %s)
+        """, (bucket, source, json.dumps(_encode(sketch))))
+
+
+def fold_completed_months(conn):
+    """
+    Fold every month that has ended since the last fold into
+    pattern_sketches, and commit.
+
+    Usually a no-op; the first read of a new month folds the month
+    before. The cursor row is locked, so concurrent readers fold once.
+
+    Returns:
+        int: Buckets written
+    """
+    cur = conn.cursor(tag="approx.fold_completed_months")
+    written = 0
+    for source in SOURCE_ROWS:
+        cur.execute("""
+            SELECT folded_through FROM sketch_cursor
+            WHERE source = %s
+            FOR UPDATE
+        """, (source,))
+        row = cur.fetchone()
+        if row is None:
+            print(f"error: no sketch cursor for {source}; apply derived_schema.sql", flush=True)
+            raise SystemExit(1)
+        buckets = _sketch_rows(conn, source,
+                               "date > %s AND date < date_trunc('month', CURRENT_DATE)", (row[0],))
+        _store_buckets(cur, source, buckets)
+        cur.execute("""
+            UPDATE sketch_cursor
+            SET folded_through = (date_trunc('month', CURRENT_DATE) - INTERVAL '1 day')::date
+            WHERE source = %s
+        """, (source,))
+        written += len(buckets)
+    conn.commit()
+    cur.close()
+    return written
+
+
+def rebuild_sketches(conn):
+    """
+    Rebuild every completed month's sketches from the source tables.
+
+    Used by the migration (backfill) and for recovery.
+    """
+    cur = conn.cursor(tag="approx.rebuild_sketches")
+    cur.execute("DELETE FROM pattern_sketches")
+    written = 0
+    for source in SOURCE_ROWS:
+        buckets = _sketch_rows(conn, source, "date < date_trunc('month', CURRENT_DATE)")
+        _store_buckets(cur, source, buckets)
+        cur.execute("""
+            INSERT INTO sketch_cursor (source, folded_through)
+            VALUES (%s, (date_trunc('month', CURRENT_DATE) - INTERVAL '1 day')::date)
+            ON CONFLICT (source) DO UPDATE SET folded_through = EXCLUDED.folded_through
+        """, (source,))
+        written += len(buckets)
+    conn.commit()
+    cur.close()
+    return written
+
+
+def approximate_patterns(conn=None, since=None):
+    """
+    Approximate pattern report from merged monthly sketches.
+
+    Args:
+        conn: Optional database connection (will create new if None)
+        since: Optional date; buckets from its month onward are merged.
+               Defaults to the month of the last confession (a superset
+               of the sins since that confession), or all history.
+
+    Returns:
+        dict: {
+            "since": first bucket merged (date or None),
+            "total": exact number of sins folded,
+            "passions": [(name, count, lower_bound), ...],
+            "descriptions": [(text, upper_bound, lower_bound), ...],
+            "days": {passion: (estimate, relative_error)},
+            "switches": exact number of context switches folded,
+            "triggers": [(passion, count, lower_bound), ...],
+        }
+    """
+    should_close = False
+    if conn is None:
+        conn = get_connection()
+        should_close = True
+
+    try:
+        cur = conn.cursor(tag="approx.approximate_patterns")
+        fold_completed_months(conn)
+        if since is None:
+            cur.execute("""
+                SELECT date_trunc('month', MAX(date))::date FROM confession_log
+                WHERE status = 'complete'
+            """)
+            since = cur.fetchone()[0]
+
+        cur.execute("""
+            SELECT source, sketch FROM pattern_sketches
+            WHERE %s::date IS NULL OR bucket >= date_trunc('month', %s::date)
+            ORDER BY bucket ASC
+        """, (since, since))
+
+        merged = {"hamartia": _new_sketch("hamartia"), "context_events": _new_sketch("context_events")}
+        for source, data in cur.fetchall():
+            _merge(merged[source], _decode(data))
+
+        # The current month is not folded yet: sketch its rows directly
+        for source in SOURCE_ROWS:
+            current = _sketch_rows(conn, source, "date >= date_trunc('month', CURRENT_DATE)")
+            for sketch in current.values():
+                _merge(merged[source], sketch)
+
+        sins = merged["hamartia"]
+        switches = merged["context_events"]
+        return {
+            "since": since,
+            "total": sins["passions"].total,
+            "passions": sins["passions"].top(),
+            # Both sketches overestimate: the tighter upper bound wins
+            "descriptions": [
+                (text, min(count, sins["description_counts"].estimate(text)), lower)
+                for text, count, lower in sins["descriptions"].top(3)
+            ],
+            "days": {
+                key: (round(hll.estimate()), hll.relative_error())
+                for key, hll in sins["days"].items()
+            },
+            "switches": switches["triggers"].total,
+            "triggers": switches["triggers"].top(3),
+        }
+
+    except psycopg2.Error as e:
+        print(f"error: failed to read pattern sketches: {e}", flush=True)
+        raise SystemExit(1)
+    finally:
+        cur.close()
+        if should_close:
+            conn.close()
+
+
+def format_approximate_patterns(report):
+    """
+    Format the approximate report. Every figure carries its bound.
+
+    Returns:
+        list: Output lines
+    """
+    lines = []
+    since = report["since"] or "beginning"
+    lines.append(f"  (approximate, buckets since {since}; {report['total']} sin(s) folded)")
+
+    if report["passions"]:
+        name, count, lower = report["passions"][0]
+        lines.append(f"  Dominant: {name} ({lower}-{count} occurrences)")
+        days, err = report["days"].get(name, (0, 0))
+        lines.append(f"    on ~{days} distinct day(s) (±{math.ceil(days * err)} at 1σ)")
+
+    for text, count, lower in report["descriptions"]:
+        if count < 2:
+            continue
+        lines.append(f"  Recurring: \"{text}\" ({lower}-{count}x)")
+
+    if report["triggers"]:
+        name, count, lower = report["triggers"][0]
+        lines.append(f"  Switch Trigger: {name} ({lower}-{count} of {report['switches']} switches)")
+
+    return lines
@@ -0,0 +1,210 @@
+"""
+Personal Baselines and Anomaly Detection.
+
+"Let a man examine himself." (1 Cor 11:28)
+A day is measured against the person's own history, not an ideal.
+
+Running mean/variance (Welford) per daily metric, folded from completed
+days in O(1) per mutation. Detection reads one baseline row per metric
+and today's/yesterday's values; it never scans history.
+
+The baseline informs; it does not alter the state. Alignment is untouched.
+"""
+
+import psycopg2
+from logos.db import get_connection
+
+
+# Metrics per source table
+METRIC_SOURCES = {
+    "daily_state": [
+        "prayer_minutes",
+        "prayer_interruptions",
+        "screen_time_work",
+        "screen_time_social",
+        "screen_time_entertainment",
+        "screen_time_edifying",
+    ],
+    "daily_work_state": [
+        "deep_work_creative",
+        "deep_work_analytical",
+        "deep_work_learning",
+        "shallow_work_necessary",
+        "shallow_work_admin",
+        "shallow_work_waste",
+    ],
+}
+
+# A day is an outlier at |z| >= Z_THRESHOLD once MIN_DAYS are folded
+Z_THRESHOLD = 3.0
+MIN_DAYS = 14
+
+
+def welford_update(n, mean, m2, value):
+    """
+    Fold one observation into a running (n, mean, m2).
+
+    Returns:
+        tuple: (n, mean, m2)
+    """
+    n += 1
+    delta = value - mean
+    mean += delta / n
+    m2 += delta * (value - mean)
+    return n, mean, m2
+
+
+def stddev(n, m2):
+    """Sample standard deviation, or None with fewer than two days."""
+    if n < 2:
+        return None
+    return (m2 / (n - 1)) ** 0.5
+
+
+def z_score(value, n, mean, m2):
+    """Standard score of value against the baseline, or None if undefined."""
+    sd = stddev(n, m2)
+    if n < MIN_DAYS or not sd:
+        return None
+    return (value - mean) / sd
+
+
+def _fold_rows(cur, source, rows):
+    """Fold completed-day rows (value tuples aligned with METRIC_SOURCES)."""
+    metrics = METRIC_SOURCES[source]
+    cur.execute("""
+        SELECT metric, n, mean, m2 FROM metric_baseline
+        WHERE source = %s
+        FOR UPDATE
+    """, (source,))
+    state = {row[0]: (row[1], row[2], row[3]) for row in cur.fetchall()}
+
+    for values in rows:
+        for metric, value in zip(metrics, values):
+            n, mean, m2 = state.get(metric, (0, 0.0, 0.0))
+            state[metric] = welford_update(n, mean, m2, value or 0)
+
+    for metric, (n, mean, m2) in state.items():
+        cur.execute("""
+            INSERT INTO metric_baseline (metric, source, n, mean, m2)
+            VALUES (%s, %s, %s, %s, %s)
+            ON CONFLICT (metric) DO UPDATE
+            SET n = EXCLUDED.n, mean = EXCLUDED.mean, m2 = EXCLUDED.m2
+        """, (metric, source, n, mean, m2))
+
+
+def fold_completed_days(cur, source):
+    """
+    Fold every completed day not yet in the baseline.
+
+    Must run inside the mutation's transaction. After the first mutation
+    of a day this selects nothing, so the steady-state cost is O(1).
+    """
+    metrics = METRIC_SOURCES[source]
+    cur.execute("""
+        INSERT INTO baseline_cursor (source, folded_through)
+        VALUES (%s, DATE '-infinity')
+        ON CONFLICT (source) DO NOTHING
+    """, (source,))
+    cur.execute("""
+        SELECT folded_through FROM baseline_cursor
+        WHERE source = %s
+        FOR UPDATE
+    """, (source,))
+    folded_through = cur.fetchone()[0]
+
+    # source and metrics come from METRIC_SOURCES, never from input
+    cur.execute(f"""
+        SELECT {', '.join(metrics)}
+        FROM {source}
+        WHERE date > %s AND date < CURRENT_DATE
+        ORDER BY date ASC
+    """, (folded_through,))
+    rows = cur.fetchall()
+    if not rows:
+        return 0
+
+    _fold_rows(cur, source, rows)
+    cur.execute("""
+        UPDATE baseline_cursor
+        SET folded_through = CURRENT_DATE - 1
+        WHERE source = %s
+    """, (source,))
+    return len(rows)
+
+
+def rebuild_baselines(conn):
+    """
+    Recompute every baseline from all completed days.
+
+    Used by the migration (backfill) and for recovery.
+    """
+    cur = conn.cursor(tag="baseline.rebuild_baselines")
+    cur.execute("DELETE FROM metric_baseline")
+    cur.execute("DELETE FROM baseline_cursor")
+    folded = 0
+    for source in METRIC_SOURCES:
+        folded += fold_completed_days(cur, source)
+    conn.commit()
+    cur.close()
+    return folded
+
+
+def detect_anomalies(conn=None):
+    """
+    Compare today (so far) and yesterday against the personal baseline.
+
+    Today is incomplete, so only values already above the baseline are
+    flagged. Yesterday is complete and is flagged in either direction.
+
+    Returns:
+        list: Dicts with date, metric, value, mean, stddev, z
+    """
+    should_close = False
+    if conn is None:
+        conn = get_connection()
+        should_close = True
+
+    try:
+        cur = conn.cursor(tag="baseline.detect_anomalies")
+        cur.execute("""
+            SELECT metric, n, mean, m2 FROM metric_baseline
+        """)
+        baselines = {row[0]: (row[1], row[2], row[3]) for row in cur.fetchall()}
+        if not baselines:
+            return []
+
+        anomalies = []
+        for source, metrics in METRIC_SOURCES.items():
+            cur.execute(f"""
+                SELECT date, date = CURRENT_DATE, {', '.join(metrics)}
+                FROM {source}
+                WHERE date IN (CURRENT_DATE, CURRENT_DATE - 1)
+            """)
+            for row in cur.fetchall():
+                day, is_today = row[0], row[1]
+                for metric, value in zip(metrics, row[2:]):
+                    if metric not in baselines:
+                        continue
+                    n, mean, m2 = baselines[metric]
+                    z = z_score(value or 0, n, mean, m2)
+                    if z is None:
+                        continue
+                    if z >= Z_THRESHOLD or (not is_today and z <= -Z_THRESHOLD):
+                        anomalies.append({
+                            "date": day,
+                            "metric": metric,
+                            "value": value or 0,
+                            "mean": mean,
+                            "stddev": stddev(n, m2),
+                            "z": z,
+                        })
+        return anomalies
+
+    except psycopg2.Error as e:
+        print(f"error: failed to read baselines: {e}", flush=True)
+        raise SystemExit(1)
+    finally:
+        cur.close()
+        if should_close:
+            conn.close()
@@ -0,0 +1,171 @@
+"""
+Batch Mode: Many Commands, One Connection, One Transaction.
+
+"Let all things be done decently and in order." (1 Cor 14:40)
+
+Replays a day's entries from a file (or stdin), one command per line in
+the same grammar as `logos`. By default the batch is all or nothing: the
+first failing line rolls everything back. With savepoints, each line is
+its own savepoint; a failing line is rolled back alone and the rest are
+committed together at the end.
+
+A line fails when its command raises or would have exited nonzero.
+Commands cannot prompt: a line needing input fails (pass values as
+options, e.g. `log add ... --yes`), and a command that always prompts
+is refused before anything runs.
+"""
+
+import io
+import sys
+import time
+import shlex
+
+
+# Commands that cannot run inside a batch (interactive, or long-running)
+EXCLUDED_COMMANDS = ("batch", "shell", "prompt", "watch", "serve")
+
+# Commands that always read stdin (notes, confirmation), so can never succeed
+PROMPTING_COMMANDS = (("log", "confess"),)
+
+
+def read_commands(source):
+    """
+    Parse a batch file into (line number, argv) pairs.
+
+    Blank lines and # comments are skipped.
+
+    Raises:
+        ValueError: On a line shlex cannot split, an excluded command, or
+            one that always prompts
+    """
+    commands = []
+    for number, line in enumerate(source, 1):
+        try:
+            argv = shlex.split(line, comments=True)
+        except ValueError as e:
+            raise ValueError(f"line {number}: {e}")
+        if not argv:
+            continue
+        if argv[0] in EXCLUDED_COMMANDS:
+            raise ValueError(f"line {number}: '{argv[0]}' cannot run in a batch")
+        if tuple(argv[:2]) in PROMPTING_COMMANDS:
+            raise ValueError(f"line {number}: '{' '.join(argv[:2])}' always prompts "
+                             f"and cannot run in a batch")
+        commands.append((number, argv))
+    return commands
+
+
+def run_command(argv):
+    """
+    Parse and run one command.
+
+    Returns:
+        tuple: (args or None, exit code)
+    """
+    from logos.cli import build_parser, command_name
+    from logos.db import name_command
+    args = None
+    try:
+        args = build_parser(argv).parse_args(argv)
+        if args.command is None:
+            return args, 2
+        name_command(command_name(args))
+        code = args.func(args)
+        return args, code or 0
+    except SystemExit as e:
+        # argparse and database errors have already printed their message
+        if e.code is None:
+            return args, 0
+        return args, e.code if isinstance(e.code, int) else 1
+    except EOFError:
+        print("error: command needs input; pass every value as an option", flush=True)
+        return args, 1
+    except Exception as e:
+        print(f"error: {e}", flush=True)
+        return args, 1
+
+
+def run_batch(commands, savepoints=False):
+    """
+    Run every command on one connection inside one transaction.
+
+    Args:
+        commands: (line number, argv) pairs from read_commands
+        savepoints: Roll back failing lines alone instead of the whole batch
+
+    Returns:
+        dict: results [(line, argv, exit code, ms)], committed, mutated,
+              elapsed_ms
+    """
+    from logos.cli import _is_mutation, command_name
+    from logos.db import open_session, close_session
+    from logos.metrics import observe_command
+
+    session = open_session(deferred=True)
+    cur = session.conn.cursor(tag="batch.run_batch")
+    results = []
+    mutated = False
+    committed = False
+    started = time.perf_counter()
+
+    # Commands must not read the batch itself (or a terminal) as their input
+    stdin = sys.stdin
+    sys.stdin = io.StringIO("")
+    try:
+        for number, argv in commands:
+            if savepoints:
+                cur.execute("SAVEPOINT batch_line")
+            line_started = time.perf_counter()
+            args, code = run_command(argv)
+            elapsed = (time.perf_counter() - line_started) * 1000
+            if args is not None and args.command is not None:
+                observe_command(command_name(args), elapsed / 1000)
+            results.append((number, argv, code, elapsed))
+
+            if code == 0:
+                mutated = mutated or (args is not None and _is_mutation(args))
+                if savepoints:
+                    cur.execute("RELEASE SAVEPOINT batch_line")
+            elif savepoints:
+                cur.execute("ROLLBACK TO SAVEPOINT batch_line")
+            else:
+                break
+
+        if savepoints or all(code == 0 for _, _, code, _ in results):
+            session.conn.commit()
+            committed = True
+        else:
+            session.conn.rollback()
+    finally:
+        sys.stdin = stdin
+        cur.close()
+        close_session()
+
+    return {
+        "results": results,
+        "committed": committed,
+        "mutated": mutated and committed,
+        "elapsed_ms": (time.perf_counter() - started) * 1000,
+    }
+
+
+def format_report(report, total, savepoints=False):
+    """Per-line results, then the outcome and throughput."""
+    lines = ["", "Batch Results:", "=" * 70]
+    for number, argv, code, ms in report["results"]:
+        status = "ok" if code == 0 else f"failed (exit {code})"
+        lines.append(f"  {number:>4}  {status:<16} {ms:>8.1f} ms  {shlex.join(argv)}")
+
+    ran = len(report["results"])
+    failed = sum(1 for _, _, code, _ in report["results"] if code != 0)
+    if ran < total:
+        lines.append(f"  ({total - ran} line(s) not run)")
+    lines.append("=" * 70)
+
+    mode = "savepoint per line" if savepoints else "single transaction"
+    outcome = "committed" if report["committed"] else "rolled back"
+    lines.append(f"{ran} of {total} line(s) run, {failed} failed; {outcome} ({mode})")
+    seconds = report["elapsed_ms"] / 1000
+    if seconds > 0:
+        lines.append(f"Throughput: {ran / seconds:.0f} commands/s ({report['elapsed_ms']:.1f} ms total)")
+    return "\n".join(lines)
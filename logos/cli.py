@@ -6,24 +6,32 @@ No implicit state. No global configuration.
 Every command reads truth from the database.
 """
 
+import os
 import sys
+import time
 import argparse
 from datetime import datetime, date
-from logos.alignment import calculate_system_state
-from logos.db import fetch_system_health_today
-    PASSIONS, log_hamartia, update_daily_state,
-    fetch_unconfessed_sins, fetch_today_state,
-    record_sacrament, complete_penance, FAST_BREAK_REASONS
+from logos.constants import PASSIONS, FAST_BREAK_REASONS, SCREEN_TIME_CATEGORIES, QUERY_ORDERS
 from logos.cli_agenda import register_agenda_commands
+from logos.cli_patterns import register_pattern_commands
+from logos.cli_timeline import register_timeline_commands, parse_date
+from logos.prompt import spawn_refresh, main as prompt_main
 
+# Everything that reaches the database (psycopg2, alignment, mutations) is
+# imported inside the command that needs it, so `logos --help` and argument
+# errors never pay for it. tests/test_startup.py holds the budget.
 
-def format_health_output(diagnostic, health_data):
+
+def format_health_output(diagnostic, health_data, approx=False, anomalies=None, failures=None):
     """
     Format system health output in systemctl style.
     
     Args:
         diagnostic: dict with keys "state", "diagnosis", "counsel"
         health_data: dict with health information
+        approx: Use sketch-based pattern analysis (with error bounds)
+        anomalies: Outliers against the personal baseline (detect_anomalies)
+        failures: Optional list; sections that could not be read are appended
         
     Returns:
         str: Formatted output
@@ -67,6 +75,17 @@ def format_health_output(diagnostic, health_data):
     lines.append("")
     lines.append(f"Counsel: {counsel}")
     
+    # Outliers against the personal baseline (informational, any state)
+    if anomalies:
+        lines.append("")
+        lines.append("Anomalies:")
+        for a in anomalies:
+            day = "today" if a["date"] == health_data["date"] else str(a["date"])
+            lines.append(
+                f"  - {a['metric']}: {a['value']} {day} "
+                f"(baseline {a['mean']:.0f} ± {a['stddev']:.0f}, z={a['z']:+.1f})"
+            )
+    
     # Warnings for non-stable states
     if state != "STABLE":
         lines.append("")
@@ -94,15 +113,21 @@ def format_health_output(diagnostic, health_data):
                  lines.append(f"  - Signal-to-noise ratio degraded ({signal:.0f}:{noise})")
 
         # Pattern Analysis (Phase 6)
-        if health_data["unconfessed_count"] > 0:
+        if health_data["unconfessed_count"] > 0 and approx:
+            from logos.approx import approximate_patterns, format_approximate_patterns
+            lines.append("")
+            lines.append("Pattern Analysis:")
+            lines.extend(format_approximate_patterns(approximate_patterns()))
+        elif health_data["unconfessed_count"] > 0:
+            import psycopg2
+            from logos import trace
+            from logos.patterns import analyze_hamartia_patterns
+            lines.append("")
+            lines.append("Pattern Analysis:")
+            span = trace.begin("patterns (analyze_hamartia_patterns)")
+            failure = None
             try:
-                from logos.patterns import analyze_hamartia_patterns
-                conn = get_connection()
-                patterns = analyze_hamartia_patterns(conn)
-                conn.close() # optimize later
-                
-                lines.append("")
-                lines.append("Pattern Analysis:")
+                patterns = analyze_hamartia_patterns()
                 if patterns["dominant_passion"]:
                     lines.append(f"  Dominant: {patterns['dominant_passion']} ({patterns['dominant_count']} occurrences)")
                 if patterns["peak_time"]:
@@ -111,19 +136,31 @@ def format_health_output(diagnostic, health_data):
                     lines.append(f"  Chain: {patterns['causal_chain']}")
                 if patterns["screen_correlation"]:
                     lines.append(f"  ! High screen entertainment correlates with sin")
-            except Exception:
-                pass # Fail silently on pattern error to preserve core health output
+            except psycopg2.Error as e:
+                # Core health output is preserved, but the failure is shown
+                failure = str(e).strip().split("\n")[0] or type(e).__name__
+                lines.append(f"  Unavailable: {failure}")
+                if failures is not None:
+                    failures.append("patterns")
+            finally:
+                trace.end(span, detail=f"failed: {failure}" if failure else None)
     
     return "\n".join(lines)
 
 
-def cmd_health(args):
+def compute_health(approx=False):
     """
-    health — Display system health status.
+    Read today's health, apply alignment logic and render the output.
     
-    Reads from database, applies alignment logic, outputs state.
-    No mutation. No caching. Always true.
+    Returns:
+        tuple: (state, output, unconfessed_count, failures). failures names
+               the sections rendered as unavailable; such output is not cached.
     """
+    from logos import trace
+    from logos.alignment import calculate_system_state
+    from logos.baseline import detect_anomalies
+    from logos.db import fetch_system_health_today
+    
     health_data = fetch_system_health_today()
     
     # Prepare arguments for alignment function
@@ -151,14 +188,73 @@ def cmd_health(args):
     unconfessed_count = health_data["unconfessed_count"]
     
     # Evaluate system state
-    diagnostic = calculate_system_state(daily_state, liturgical_context, unconfessed_count)
+    span = trace.begin("alignment (calculate_system_state)")
+    try:
+        diagnostic = calculate_system_state(daily_state, liturgical_context, unconfessed_count)
+    finally:
+        trace.end(span)
+    
+    span = trace.begin("baseline (detect_anomalies)")
+    try:
+        anomalies = detect_anomalies()
+    finally:
+        trace.end(span)
     
-    # Output result
-    output = format_health_output(diagnostic, health_data)
+    failures = []
+    span = trace.begin("render (format_health_output)")
+    try:
+        output = format_health_output(diagnostic, health_data, approx=approx,
+                                      anomalies=anomalies, failures=failures)
+    finally:
+        trace.end(span)
+    return diagnostic["state"], output, unconfessed_count, failures
+
+
+def health_snapshot(approx=False, fresh=False):
+    """
+    Today's health, memoized per (data version, date).
+    
+    Every mutation bumps the version, so a cached result is exactly as
+    true as a fresh one; fresh=True recomputes anyway. Output with a
+    section that failed (a lock or statement timeout) is served once and
+    not stored, so the next call retries it. The unconfessed count is the
+    one the state was computed from.
+    
+    Returns:
+        tuple: (version, state, output, unconfessed_count)
+    """
+    from logos import trace
+    from logos.db import fetch_health_cache, store_health_cache
+    
+    variant = "approx" if approx else "exact"
+    version, today, cached = fetch_health_cache(variant)
+    if cached and not fresh:
+        state, output, unconfessed = cached
+        span = trace.begin("health memo hit", f"version {version}")
+        trace.end(span)
+    else:
+        span = trace.begin("compute health", f"version {version}")
+        try:
+            state, output, unconfessed, failures = compute_health(approx)
+        finally:
+            trace.end(span)
+        if not failures:
+            store_health_cache(version, today, variant, state, output, unconfessed)
+    return version, state, output, unconfessed
+
+
+def cmd_health(args):
+    """
+    health — Display system health status.
+    
+    Reads from database, applies alignment logic, outputs state.
+    No mutation. Memoized per (data version, date).
+    """
+    _, state, output, _ = health_snapshot(approx=getattr(args, "approx", False),
+                                       fresh=getattr(args, "fresh", False))
     print(output)
     
     # Exit code reflects state
-    state = diagnostic["state"]
     if state == "CRITICAL":
         return 2
     elif state == "DEGRADED":
@@ -174,6 +270,8 @@ def cmd_log_add(args):
     Requires explicit categorization of the passion.
     No edits. No deletes. Only confession can change state.
     """
+    from logos.mutations import log_hamartia
+    
     # Interactive mode: select passion
     if not args.passion:
         print("\nSelect Passion (Evagrius of Pontus):")
@@ -209,19 +307,21 @@ def cmd_log_add(args):
     else:
         description = args.description
     
-    # Confirmation
-    print(f"\nConfirm: [{passion}] \"{description}\"?", end=" ")
-    try:
-        confirm = input("(y/n) ")
-        if confirm.lower() != 'y':
-            print("Cancelled.")
-            return 0
-    except KeyboardInterrupt:
-        print("\nerror: cancelled", flush=True)
-        return 1
+    # Confirmation (--yes for scripts and batches)
+    if not getattr(args, "yes", False):
+        print(f"\nConfirm: [{passion}] \"{description}\"?", end=" ")
+        try:
+            confirm = input("(y/n) ")
+            if confirm.lower() != 'y':
+                print("Cancelled.")
+                return 0
+        except KeyboardInterrupt:
+            print("\nerror: cancelled", flush=True)
+            return 1
     
     # Log it (append-only)
-    unconfessed_count = log_hamartia(passion, description)
+    parent_sin_id = getattr(args, "parent", None)
+    unconfessed_count = log_hamartia(passion, description, parent_sin_id=parent_sin_id)
     
     print(f"\nLogged. Unconfessed Count: {unconfessed_count}")
     print()
@@ -238,18 +338,42 @@ def cmd_log_confess(args):
     
     "Whose sins you forgive are forgiven them." (John 20:23)
     """
-    sins = fetch_unconfessed_sins()
+    from logos.mutations import count_unconfessed_sins, fetch_unconfessed_page, record_sacrament
+    
+    if args.page_size < 1:
+        print("error: --page-size must be at least 1", flush=True)
+        return 1
     
-    if not sins:
-        print("No unconfessed sins. Glory to God.")
+    filters = {"passion": args.passion, "start": args.start, "end": args.end}
+    total, through_id = count_unconfessed_sins(**filters)
+    
+    if not total:
+        if any(v is not None for v in filters.values()):
+            print("No unconfessed sins match these filters.")
+        else:
+            print("No unconfessed sins. Glory to God.")
         return 0
     
-    print(f"\nUnconfessed Sins ({len(sins)}):")
+    # Stream the list a page at a time (keyset on date, id)
+    paged = sys.stdin.isatty() and sys.stdout.isatty()
+    print(f"\nUnconfessed Sins ({total}):")
     print("=" * 70)
-    for sin in sins:
-        print(f"  [{sin['id']}] {sin['date']} | {sin['passions']}")
-        print(f"      {sin['description']}")
-        print()
+    after = None
+    shown = 0
+    while True:
+        page = fetch_unconfessed_page(after, args.page_size, through_id=through_id, **filters)
+        for sin in page:
+            print(f"  [{sin['id']}] {sin['date']} | {sin['passions']}")
+            print(f"      {sin['description']}")
+            print()
+        shown += len(page)
+        if len(page) < args.page_size or shown >= total:
+            break
+        after = (page[-1]["date"], page[-1]["id"])
+        if paged:
+            answer = input(f"-- {shown} of {total} (Enter for more, q to stop listing) --")
+            if answer.strip().lower() == "q":
+                break
     
     print("=" * 70)
     print("\n── THE SACRAMENT ──")
@@ -276,7 +400,7 @@ def cmd_log_confess(args):
         
         notes = input("Notes (or press Enter to skip): ").strip() or None
         
-        print(f"\nRecord absolution of {len(sins)} sin(s) by Fr. {spiritual_father}?")
+        print(f"\nRecord absolution of {total} sin(s) by Fr. {spiritual_father}?")
         print(f"Penance: {penance}")
         confirm = input("(yes/no) ")
         if confirm.lower() != 'yes':
@@ -287,9 +411,19 @@ def cmd_log_confess(args):
         print("\nerror: cancelled", flush=True)
         return 1
     
-    # Record the Sacrament
-    sin_ids = [sin['id'] for sin in sins]
-    result = record_sacrament(spiritual_father, penance, notes, sin_ids)
+    # Record the Sacrament (absolved server-side by the same filters)
+    def show_progress(count):
+        print(f"\r  Absolving... {count}/{total}", end="", flush=True)
+    
+    result = record_sacrament(spiritual_father, penance, notes,
+                              through_id=through_id, progress=show_progress, **filters)
+    if result["count_absolved"]:
+        print()
+    for confession_id in result["resumed"]:
+        print(f"✓ Interrupted sacrament {confession_id} finished over its own scope")
+    for confession_id in result["stranded"]:
+        print(f"warning: interrupted sacrament {confession_id} has no recorded scope; "
+              f"it stays staging and its sins still count as unconfessed", file=sys.stderr, flush=True)
     
     print(f"\n✓ Sacrament recorded (ID: {result['confession_id']})")
     print(f"✓ {result['count_absolved']} sin(s) absolved.")
@@ -301,6 +435,81 @@ def cmd_log_confess(args):
     return 0
 
 
+def cmd_log_lineage(args):
+    """
+    log lineage — Show the lineage of a sin (read-only).
+    
+    "When desire has conceived, it gives birth to sin." (James 1:15)
+    Without an ID, lists the largest lineage trees.
+    """
+    from logos.lineage import fetch_ancestors, fetch_descendants, fetch_largest_trees
+    
+    if args.id is None:
+        trees = fetch_largest_trees(args.largest)
+        if not trees:
+            print("No sin lineage recorded.")
+            return 0
+        
+        print(f"\nLargest Lineage Trees ({len(trees)}):")
+        print("=" * 70)
+        for tree in trees:
+            print(f"  [{tree['root_id']}] {tree['date']} | {tree['passions']}"
+                  f" — {tree['size']} sin(s), depth {tree['max_depth']}")
+            print(f"      {tree['description']}")
+        print()
+        return 0
+    
+    ancestors = fetch_ancestors(args.id)
+    descendants = fetch_descendants(args.id)
+    
+    depth = len(ancestors) - 1
+    print(f"\nLineage of [{args.id}] (depth {depth}):")
+    print("=" * 70)
+    for level, sin in enumerate(ancestors):
+        marker = "*" if sin["id"] == args.id else " "
+        print(f"{marker} {'  ' * level}[{sin['id']}] {sin['date']} | {sin['passions']}")
+        print(f"  {'  ' * level}    {sin['description']}")
+    
+    for sin in descendants:
+        indent = "  " * (depth + sin["depth"])
+        print(f"  {indent}[{sin['id']}] {sin['date']} | {sin['passions']}")
+        print(f"  {indent}    {sin['description']}")
+    
+    print(f"\nDescendants: {len(descendants)}")
+    print()
+    return 0
+
+
+def cmd_log_search(args):
+    """
+    log search — Ranked full-text search of sins and confession notes (read-only).
+    
+    "Search me, O God, and know my heart." (Psalm 139:23)
+    """
+    from logos.search import search_log
+    
+    if args.limit < 1:
+        print("error: --limit must be at least 1", flush=True)
+        raise SystemExit(1)
+    
+    page = search_log(args.query, limit=args.limit, after=args.after,
+                      start=args.start, end=args.end)
+    if not page["results"]:
+        print("No matches.")
+        return 0
+    
+    print(f"\nMatches for \"{args.query}\":")
+    print("=" * 70)
+    for r in page["results"]:
+        print(f"  [{r['id']}] {r['date']} | {r['kind']:<10} | {r['label']}")
+        print(f"      {r['snippet']}")
+    
+    if page["next"]:
+        print(f"\nMore: logos log search \"{args.query}\" --after {page['next']}")
+    print()
+    return 0
+
+
 def cmd_ascetic(args):
     """
     ascetic — Update daily_state (today only).
@@ -311,6 +520,8 @@ def cmd_ascetic(args):
     Temporal constraint: Can only update TODAY.
     No retroactive changes allowed. No negative values (Heresy IV).
     """
+    from logos.mutations import update_daily_state, fetch_today_state
+    
     try:
         if args.subcommand == 'fast':
             reason = getattr(args, 'reason', None)
@@ -401,28 +612,188 @@ def cmd_ascetic(args):
         return 1
 
 
-def main():
+def cmd_complete_penance(args):
     """
-    LogOS command-line interface.
+    penance — Mark the penance of a confession as completed.
     
-    Entry point. No global state. All commands are independent.
+    "Bring forth fruits worthy of repentance." (Luke 3:8)
     """
-    parser = argparse.ArgumentParser(
-        prog="logos",
-        description="LogOS — Metaphysical truth engine",
-        add_help=True,
-    )
+    from logos.mutations import complete_penance
     
-    subparsers = parser.add_subparsers(dest="command", help="Available commands")
+    penance = complete_penance(args.confession_id)
+    print(f"✓ Penance completed: {penance}")
+    return 0
+
+
+def cmd_shell(args):
+    """
+    shell — Interactive session over one connection.
+    
+    Same commands as the CLI; history, completion and per-command latency.
+    """
+    from logos.shell import main as shell_main
+    
+    return shell_main()
+
+
+def cmd_batch(args):
+    """
+    batch — Run one command per line from FILE (or - for stdin).
+    
+    One connection, one transaction (or a savepoint per line), then a
+    per-line report and the throughput.
+    """
+    from logos.batch import read_commands, run_batch, format_report
+    
+    try:
+        if args.file == "-":
+            commands = read_commands(sys.stdin.read().splitlines())
+        else:
+            with open(args.file, encoding="utf-8") as f:
+                commands = read_commands(f.read().splitlines())
+    except (OSError, ValueError) as e:
+        print(f"error: {e}", flush=True)
+        return 1
+    
+    if not commands:
+        print("No commands.")
+        return 0
+    
+    report = run_batch(commands, savepoints=args.savepoints)
+    print(format_report(report, len(commands), savepoints=args.savepoints))
+    if report["mutated"]:
+        spawn_refresh()
     
-    # health command (Phase 3 - Read-only)
+    failed = any(code != 0 for _, _, code, _ in report["results"])
+    return 1 if failed or not report["committed"] else 0
+
+
+def cmd_watch(args):
+    """
+    watch — Live dashboard of system health, work health and today's practice.
+    
+    Redrawn when a mutation commits (LISTEN/NOTIFY); it never polls.
+    """
+    from logos.watch import watch
+    
+    return watch(once=args.once)
+
+
+def cmd_serve(args):
+    """
+    serve — Local HTTP/JSON API over a shared connection pool.
+    
+    Health, ascetic updates, hamartia, confession and agenda operations.
+    """
+    from logos.server import serve
+    
+    if args.workers < 1:
+        print("error: --workers must be at least 1", flush=True)
+        return 1
+    return serve(host=args.host, port=args.port, workers=args.workers)
+
+
+def cmd_db_top_queries(args):
+    """
+    db top-queries — LogOS statements ranked from pg_stat_statements.
+    
+    Each statement carries a query tag naming the function that issues
+    it, so the DBA's view maps back to the code.
+    """
+    from logos.db import fetch_top_queries
+    
+    if args.limit < 1:
+        print("error: --limit must be at least 1", flush=True)
+        return 1
+    
+    queries = fetch_top_queries(order=args.order, limit=args.limit)
+    print(f"\nLogOS Queries (pg_stat_statements, by {args.order}):")
+    print("=" * 78)
+    if not queries:
+        print("  No tagged statements recorded yet.")
+        return 0
+    print(f"  {'Total ms':>10} {'Calls':>8} {'Mean ms':>9} {'Rows':>9}  Tag")
+    for q in queries:
+        print(f"  {q['total_ms']:>10.1f} {q['calls']:>8} {q['mean_ms'] or 0:>9.2f} {q['rows']:>9}  {q['tag']}")
+        statement = " ".join(q["statement"].split())
+        if len(statement) > 66:
+            statement = statement[:65] + "…"
+        print(f"  {'':>39}  {statement}")
+    print("=" * 78)
+    return 0
+
+
+def cmd_stats(args):
+    """
+    stats — Latency percentiles per command and per query, over time windows.
+    
+    Reads the local latency history (logos.latency); no database access.
+    """
+    from logos.latency import format_stats, stats_dir
+    
+    if any(days < 1 for days in args.days):
+        print("error: --days must be at least 1", flush=True)
+        return 1
+    print(format_stats(sorted(set(args.days)), match=args.match))
+    print(f"\n(history in {stats_dir()})")
+    return 0
+
+
+# Commands that write; the prompt snapshot is refreshed after them.
+# None means every subcommand.
+MUTATING_COMMANDS = {
+    "log": {"add", "confess"},
+    "ascetic": {"fast", "pray", "read", "screen"},
+    "penance": None,
+    "commit": None,
+    "work": None,
+    "switch": None,
+    "abandon": None,
+}
+
+
+# Sessions run for as long as they are open; their commands are timed instead
+UNTIMED_COMMANDS = ("shell", "watch", "serve")
+
+
+def command_name(args):
+    """The command as recorded in latency stats, e.g. "ascetic pray"."""
+    subcommand = getattr(args, "subcommand", None)
+    return f"{args.command} {subcommand}" if subcommand else args.command
+
+
+def _is_mutation(args):
+    if args.command not in MUTATING_COMMANDS:
+        return False
+    subcommands = MUTATING_COMMANDS[args.command]
+    return subcommands is None or getattr(args, "subcommand", None) in subcommands
+
+
+def _add_health_parser(subparsers):
+    """health"""
     parser_health = subparsers.add_parser(
         "health",
         help="Display system health status"
     )
+    parser_health.add_argument("--approx", action="store_true",
+        help="Approximate pattern analysis from streaming sketches (large logs)")
+    parser_health.add_argument("--fresh", action="store_true",
+        help="Recompute even if the data version is unchanged")
     parser_health.set_defaults(func=cmd_health)
-    
-    # log command group (Phase 4 - Hamartia mutations)
+
+
+def _add_prompt_parser(subparsers):
+    """prompt (served by the fast path in __main__; listed for --help)"""
+    parser_prompt = subparsers.add_parser(
+        "prompt",
+        help="Print a shell-prompt status segment from the local snapshot"
+    )
+    parser_prompt.add_argument("--refresh", action="store_true", help="Recompute the snapshot now")
+    parser_prompt.set_defaults(func=lambda args: prompt_main(["--refresh"] if args.refresh else []))
+
+
+def _add_log_parser(subparsers):
+    """log add | confess | lineage | search"""
     parser_log = subparsers.add_parser(
         "log",
         help="Manage hamartia log"
@@ -436,6 +807,8 @@ def main():
     )
     parser_log_add.add_argument("--passion", choices=PASSIONS, help="The passion")
     parser_log_add.add_argument("--description", help="Description of the sin")
+    parser_log_add.add_argument("--parent", type=int, help="ID of the sin this one grew from")
+    parser_log_add.add_argument("--yes", "-y", action="store_true", help="Log without asking for confirmation")
     parser_log_add.set_defaults(func=cmd_log_add)
     
     # log confess
@@ -445,9 +818,36 @@ def main():
     )
     parser_log_confess.add_argument("--father", help="Name of Spiritual Father")
     parser_log_confess.add_argument("--penance", help="Penance assigned")
+    parser_log_confess.add_argument("--passion", choices=PASSIONS, help="Only sins of this passion")
+    parser_log_confess.add_argument("--from", dest="start", type=parse_date, help="Only sins on or after (YYYY-MM-DD)")
+    parser_log_confess.add_argument("--to", dest="end", type=parse_date, help="Only sins on or before (YYYY-MM-DD)")
+    parser_log_confess.add_argument("--page-size", dest="page_size", type=int, default=20, help="Sins listed per page")
     parser_log_confess.set_defaults(func=cmd_log_confess)
     
-    # ascetic command group (Phase 4 - Daily state mutations)
+    # log lineage
+    parser_log_lineage = log_subparsers.add_parser(
+        "lineage",
+        help="Show ancestors and descendants of a sin (read-only)"
+    )
+    parser_log_lineage.add_argument("id", type=int, nargs="?", help="Sin ID (omit to list largest trees)")
+    parser_log_lineage.add_argument("--largest", type=int, default=10, help="Number of trees to list")
+    parser_log_lineage.set_defaults(func=cmd_log_lineage)
+    
+    # log search
+    parser_log_search = log_subparsers.add_parser(
+        "search",
+        help="Ranked full-text search of sins and confession notes (read-only)"
+    )
+    parser_log_search.add_argument("query", help='Search terms ("argument with", -work, a or b)')
+    parser_log_search.add_argument("--limit", type=int, default=20, help="Results per page")
+    parser_log_search.add_argument("--after", help="Page token printed at the end of the previous page")
+    parser_log_search.add_argument("--from", dest="start", type=parse_date, help="First day (YYYY-MM-DD)")
+    parser_log_search.add_argument("--to", dest="end", type=parse_date, help="Last day (YYYY-MM-DD)")
+    parser_log_search.set_defaults(func=cmd_log_search)
+
+
+def _add_ascetic_parser(subparsers):
+    """ascetic fast | pray | read | screen | status"""
     parser_ascetic = subparsers.add_parser(
         "ascetic",
         help="Update daily ascetic practice (today only)"
@@ -462,14 +862,6 @@ def main():
     parser_fast.add_argument("--kept", action="store_true", help="Fast was kept")
     parser_fast.add_argument("--reason", choices=FAST_BREAK_REASONS, help="Why fast was broken")
     parser_fast.set_defaults(func=cmd_ascetic)
-
-    # penance command
-    parser_penance = subparsers.add_parser(
-        "penance", 
-        help="Complete assigned penance"
-    )
-    parser_penance.add_argument("confession_id", type=int, help="Confession ID")
-    parser_penance.set_defaults(func=cmd_complete_penance)
     
     # ascetic pray
     parser_pray = ascetic_subparsers.add_parser(
@@ -495,7 +887,7 @@ def main():
         help="Log screen time for today (use --category for Signal/Noise tracking)"
     )
     parser_screen.add_argument("--minutes", type=int, required=True, help="Minutes of screen time")
-    parser_screen.add_argument("--category", choices=['work', 'social', 'entertainment', 'edifying'],
+    parser_screen.add_argument("--category", choices=SCREEN_TIME_CATEGORIES,
         help="Screen time category: work (neutral), social/entertainment (noise), edifying (signal)")
     parser_screen.set_defaults(func=cmd_ascetic)
     
@@ -505,8 +897,20 @@ def main():
         help="Show today's ascetic practice"
     )
     parser_status.set_defaults(func=cmd_ascetic)
-    
-    # export command (Phase 7 - Collapse Resilience)
+
+
+def _add_penance_parser(subparsers):
+    """penance CONFESSION_ID"""
+    parser_penance = subparsers.add_parser(
+        "penance", 
+        help="Complete assigned penance"
+    )
+    parser_penance.add_argument("confession_id", type=int, help="Confession ID")
+    parser_penance.set_defaults(func=cmd_complete_penance)
+
+
+def _add_export_parser(subparsers):
+    """export (Phase 7 - Collapse Resilience)"""
     parser_export = subparsers.add_parser(
         "export",
         help="Export spiritual log to plaintext"
@@ -514,24 +918,193 @@ def main():
     parser_export.add_argument("--file", default="spiritual-log.txt", help="Output filename")
     parser_export.set_defaults(func=lambda args: __import__('logos.export').export.export_to_plaintext(args.file))
 
-    # Register Agenda Layer commands
-    register_agenda_commands(subparsers)
+
+def _add_shell_parser(subparsers):
+    """shell"""
+    parser_shell = subparsers.add_parser(
+        "shell",
+        help="Interactive session: many commands over one connection"
+    )
+    parser_shell.set_defaults(func=cmd_shell)
+
+
+def _add_batch_parser(subparsers):
+    """batch FILE|-"""
+    parser_batch = subparsers.add_parser(
+        "batch",
+        help="Run one command per line from a file in one transaction"
+    )
+    parser_batch.add_argument("file", help="Command file, or - for stdin")
+    parser_batch.add_argument("--savepoints", action="store_true",
+        help="Roll back only failing lines (default: any failure rolls back the batch)")
+    parser_batch.set_defaults(func=cmd_batch)
+
+
+def _add_watch_parser(subparsers):
+    """watch"""
+    parser_watch = subparsers.add_parser(
+        "watch",
+        help="Live dashboard, redrawn only when the data changes"
+    )
+    parser_watch.add_argument("--once", action="store_true", help="Draw one frame and exit")
+    parser_watch.set_defaults(func=cmd_watch)
+
+
+def _add_serve_parser(subparsers):
+    """serve"""
+    parser_serve = subparsers.add_parser(
+        "serve",
+        help="Local HTTP/JSON API (set LOGOS_API_TOKEN to require a bearer token)"
+    )
+    parser_serve.add_argument("--host", default="127.0.0.1", help="Interface to bind")
+    parser_serve.add_argument("--port", type=int, default=8765, help="TCP port")
+    parser_serve.add_argument("--workers", type=int, default=4,
+        help="Worker threads, each with one pooled connection")
+    parser_serve.set_defaults(func=cmd_serve)
+
+
+def _add_db_parser(subparsers):
+    """db top-queries"""
+    parser_db = subparsers.add_parser(
+        "db",
+        help="Database diagnostics"
+    )
+    db_subparsers = parser_db.add_subparsers(dest="subcommand", required=True,
+                                             help="Database commands")
+    
+    parser_top = db_subparsers.add_parser(
+        "top-queries",
+        help="LogOS statements ranked from pg_stat_statements (by query tag)"
+    )
+    parser_top.add_argument("--order", choices=QUERY_ORDERS, default="total",
+        help="Rank by total time, calls, rows or mean time (default: total)")
+    parser_top.add_argument("--limit", type=int, default=20, help="Statements to show")
+    parser_top.set_defaults(func=cmd_db_top_queries)
+
+
+def _add_stats_parser(subparsers):
+    """stats"""
+    parser_stats = subparsers.add_parser(
+        "stats",
+        help="Latency percentiles per command and query (local history)"
+    )
+    parser_stats.add_argument("--days", type=int, nargs="+", default=[1, 7, 30],
+        help="Window lengths in days (default: 1 7 30)")
+    parser_stats.add_argument("--match", help="Only commands and queries whose name contains this")
+    parser_stats.set_defaults(func=cmd_stats)
+
+
+# Command name(s) -> function adding their parsers, in --help order.
+# Only the requested command's parsers are built; a bare `logos`, a leading
+# option (--help) or an unknown name builds them all.
+PARSER_BUILDERS = [
+    (("health",), _add_health_parser),
+    (("watch",), _add_watch_parser),
+    (("prompt",), _add_prompt_parser),
+    (("log",), _add_log_parser),
+    (("ascetic",), _add_ascetic_parser),
+    (("penance",), _add_penance_parser),
+    (("export",), _add_export_parser),
+    (("commit", "work", "switch", "agenda-health", "abandon"), register_agenda_commands),
+    (("patterns",), register_pattern_commands),
+    (("timeline",), register_timeline_commands),
+    (("shell",), _add_shell_parser),
+    (("batch",), _add_batch_parser),
+    (("serve",), _add_serve_parser),
+    (("stats",), _add_stats_parser),
+    (("db",), _add_db_parser),
+]
+
+
+def _requested_command(argv):
+    """The command name, when it is the first argument after --trace/--explain-ms."""
+    i = 0
+    while i < len(argv):
+        arg = argv[i]
+        if arg == "--trace" or arg.startswith("--explain-ms="):
+            i += 1
+        elif arg == "--explain-ms":
+            i += 2
+        elif arg.startswith("-"):
+            return None
+        else:
+            return arg
+    return None
+
+
+def build_parser(argv):
+    """
+    The argument parser, with parsers built only for the command in argv.
+    
+    Shared by main() (and through it the shell) and batch mode, so every
+    entry point accepts exactly the same grammar.
+    """
+    parser = argparse.ArgumentParser(
+        prog="logos",
+        description="LogOS — Metaphysical truth engine",
+        add_help=True,
+    )
+    
+    parser.add_argument("--trace", action="store_true",
+        help="Print a span tree (connection, SQL, alignment, rendering) to stderr")
+    parser.add_argument("--explain-ms", type=float, metavar="MS",
+        help="With --trace: attach the plan of statements slower than MS (ANALYZE for reads)")
+    
+    subparsers = parser.add_subparsers(dest="command", help="Available commands")
+    
+    command = _requested_command(argv)
+    builders = [add for names, add in PARSER_BUILDERS if command in names]
+    for add in builders or [add for _, add in PARSER_BUILDERS]:
+        add(subparsers)
+    return parser
+
+
+def main(argv=None):
+    """
+    LogOS command-line interface.
+    
+    Entry point. No global state. All commands are independent.
+    """
+    if argv is None:
+        argv = sys.argv[1:]
     
     # Parse arguments
-    args = parser.parse_args()
+    parser = build_parser(argv)
+    args = parser.parse_args(argv)
     
     # If no command, print help
     if args.command is None:
         parser.print_help()
         return 0
     
+    # Connections opened for this command name it in pg_stat_activity
+    # (application_name; NAMEDATALEN limits it to 63 bytes)
+    os.environ["PGAPPNAME"] = f"logos {command_name(args)}"[:63]
+    
+    if args.trace:
+        from logos import trace
+        trace.start(" ".join(argv[argv.index(args.command):]), explain_ms=args.explain_ms)
+    elif args.explain_ms is not None:
+        parser.error("--explain-ms requires --trace")
+    
     # Execute command
+    started = time.perf_counter()
     try:
         exit_code = args.func(args)
+        if _is_mutation(args):
+            spawn_refresh()
         return exit_code if exit_code is not None else 0
     except Exception as e:
         print(f"error: {e}", flush=True)
         return 1
+    finally:
+        from logos import latency
+        from logos.metrics import observe_command
+        if args.command not in UNTIMED_COMMANDS:
+            observe_command(command_name(args), time.perf_counter() - started)
+        latency.flush()
+        if args.trace:
+            print(trace.format_tree(trace.stop()), file=sys.stderr, flush=True)
 
 
 if __name__ == "__main__":
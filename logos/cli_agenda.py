@@ -2,15 +2,12 @@
 LogOS Agenda CLI.
 """
 import argparse
-from logos.agenda import (
-    commit, log_work, log_context_switch, 
-    abandon_commitment, calculate_work_health
-)
-from logos.mutations import PASSIONS
+from logos.constants import PASSIONS, WORK_CATEGORIES
 
 
 def cmd_commit(args):
     """logos commit --deep "Description" --min 60"""
+    from logos.agenda import commit
     wtype = 'deep' if args.deep else 'shallow'
     if args.admin:
         wtype = 'admin'
@@ -22,6 +19,7 @@ def cmd_commit(args):
 
 def cmd_work(args):
     """logos work --category deep_work_creative --minutes 45"""
+    from logos.agenda import log_work
     log_work(args.category, args.minutes, args.encroached)
     print(f"Logged: {args.minutes}m to {args.category}")
     return 0
@@ -29,6 +27,7 @@ def cmd_work(args):
 
 def cmd_switch(args):
     """logos switch --from deep --to shallow --passion Acedia"""
+    from logos.agenda import log_context_switch
     log_context_switch(args.from_type, args.to_type, args.passion, args.lag)
     print("Context switch recorded.")
     return 0
@@ -36,6 +35,7 @@ def cmd_switch(args):
 
 def cmd_abandon(args):
     """logos abandon --id 1 --passion Acedia"""
+    from logos.agenda import abandon_commitment
     abandon_commitment(args.id, args.passion)
     print(f"Commitment {args.id} abandoned due to {args.passion}.")
     return 0
@@ -43,6 +43,7 @@ def cmd_abandon(args):
 
 def cmd_agenda_health(args):
     """logos agenda-health"""
+    from logos.agenda import calculate_work_health
     result = calculate_work_health()
     state = result['state']
     
@@ -80,10 +81,7 @@ def register_agenda_commands(subparsers):
 
     # logos work
     p_work = subparsers.add_parser("work", help="Log completed work")
-    p_work.add_argument("--category", required=True, choices=[
-        'deep_work_creative', 'deep_work_analytical', 'deep_work_learning',
-        'shallow_work_necessary', 'shallow_work_admin', 'shallow_work_waste'
-    ], help="Work category")
+    p_work.add_argument("--category", required=True, choices=WORK_CATEGORIES, help="Work category")
     p_work.add_argument("--minutes", type=int, required=True, help="Minutes of work")
     p_work.add_argument("--encroached", action="store_true", help="Encroached on prayer time")
     p_work.set_defaults(func=cmd_work)
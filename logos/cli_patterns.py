@@ -0,0 +1,161 @@
+"""
+LogOS Patterns CLI.
+"""
+from logos.constants import PASSIONS, HORIZONS, HORIZON_UNCONFESSED, ROLLUPS, WINDOWS
+
+
+def _horizon_label(horizon):
+    if horizon == HORIZON_UNCONFESSED:
+        return "Since last confession"
+    return f"Last {horizon} days"
+
+
+def print_pattern_report(report, rollup="none"):
+    """Print the pattern report for every horizon."""
+    if rollup == "root":
+        print("\nPattern Analysis (rolled up to root passions):")
+    else:
+        print("\nPattern Analysis:")
+    print("=" * 70)
+    for horizon in HORIZONS:
+        patterns = report[horizon]
+        print(f"\n  {_horizon_label(horizon)}: {patterns['sins']} sin(s)")
+        if patterns["dominant_passion"]:
+            print(f"    Dominant: {patterns['dominant_passion']} ({patterns['dominant_count']} occurrences)")
+        if patterns["peak_time"]:
+            print(f"    Peak Time: {patterns['peak_time']}")
+        if patterns["sins"]:
+            hourly = " ".join(str(c) for c in patterns["hourly"])
+            print(f"    Hourly (00-23): {hourly}")
+        if patterns["causal_chain"]:
+            print(f"    Chain: {patterns['causal_chain']} of {patterns['chain_pairs']} pair(s) within 24h")
+    print()
+
+
+def print_correlation_report(report, min_r):
+    """Print correlations with |r| >= min_r, strongest first, per window."""
+    source = "cached" if report["cached"] else "computed"
+    print(f"\nCorrelations ({source}, version {report['data_version']}):")
+    print("=" * 70)
+    for window in WINDOWS:
+        rows = [
+            r for r in report["results"]
+            if r["window"] == window and r["r"] is not None and abs(r["r"]) >= min_r
+        ]
+        rows.sort(key=lambda r: abs(r["r"]), reverse=True)
+        print(f"\n  Last {window} days:")
+        if not rows:
+            print(f"    (no correlation with |r| >= {min_r})")
+            continue
+        for r in rows:
+            print(f"    {r['metric']:<26} -> {r['target']:<10} lag {r['lag']}d  "
+                  f"r={r['r']:+.2f}  n={r['n']}")
+    print()
+
+
+def print_transition_report(matrix):
+    """Print the transition count matrix and each passion's likely successor."""
+    from logos.transitions import most_likely_successors
+
+    counts = {(c["from_passion"], c["to_passion"]): c["count"] for c in matrix}
+    passions = list(PASSIONS) + sorted(
+        {p for pair in counts for p in pair} - set(PASSIONS)
+    )
+
+    print("\nPassion Transitions (row -> column, consecutive sins):")
+    print("=" * 70)
+    header = "".join(f"{p[:6]:>7}" for p in passions)
+    print(f"{'':<10}{header}")
+    for source in passions:
+        row = "".join(f"{counts.get((source, target), 0):>7}" for target in passions)
+        print(f"{source:<10}{row}")
+
+    print("\nMost Likely Successor:")
+    successors = most_likely_successors(matrix)
+    if not successors:
+        print("  (no transitions recorded)")
+    for source in passions:
+        if source not in successors:
+            continue
+        target, count, total, typical = successors[source]
+        print(f"  {source:<10} -> {target:<10} ({count} of {total}, typically {typical})")
+    print()
+
+
+def print_season_report(report, rollup="none"):
+    """Print sin density and passion mix per liturgical season."""
+    if rollup == "root":
+        print("\nHamartia by Liturgical Season (rolled up to root passions):")
+    else:
+        print("\nHamartia by Liturgical Season:")
+    print("=" * 70)
+    if not report["seasons"]:
+        print("  (no seasons in the calendar)")
+    for entry in report["seasons"]:
+        density = f"{entry['per_week']:.1f}/week" if entry["per_week"] is not None else "-"
+        print(f"\n  {entry['season']}: {entry['sins']} sin(s) over {entry['days']} day(s) ({density})")
+        if entry["passions"]:
+            mix = ", ".join(f"{name} {count}" for name, count in entry["passions"])
+            print(f"    Mix: {mix}")
+    if report["uncovered"]:
+        print(f"\n  ! {report['uncovered']} sin(s) fall on days missing from the calendar")
+    print()
+
+
+def cmd_patterns(args):
+    """logos patterns [--correlations] [--min-r 0.3] [--approx] [--rollup root] [--transitions] [--by-season]"""
+    # Transitions and sketches are kept per passion as logged; no rollup
+    for flag, given in (("--transitions", args.transitions), ("--approx", args.approx)):
+        if given and args.rollup != "none":
+            args.parser.error(f"--rollup {args.rollup} cannot be combined with {flag}")
+
+    if args.transitions:
+        from logos.transitions import fetch_transition_matrix
+        print_transition_report(fetch_transition_matrix())
+        return 0
+
+    if args.by_season:
+        from logos.seasons import analyze_seasons
+        print_season_report(analyze_seasons(rollup=args.rollup), args.rollup)
+        return 0
+
+    if args.approx:
+        from logos.approx import approximate_patterns, format_approximate_patterns
+        print("\nPattern Analysis:")
+        print("=" * 70)
+        for line in format_approximate_patterns(approximate_patterns()):
+            print(line)
+        print()
+        return 0
+
+    if args.correlations:
+        from logos.correlation import analyze_correlations
+        report = analyze_correlations(rollup=args.rollup)
+        print_correlation_report(report, args.min_r)
+        return 0
+
+    from logos.patterns import analyze_pattern_horizons
+    report = analyze_pattern_horizons(rollup=args.rollup)
+    print_pattern_report(report, args.rollup)
+    return 0
+
+
+# Integration helper
+def register_pattern_commands(subparsers):
+    """Register pattern analysis commands with the main parser."""
+
+    # logos patterns
+    p_patterns = subparsers.add_parser("patterns", help="Analyze hamartia patterns")
+    p_patterns.add_argument("--correlations", action="store_true",
+        help="Lagged correlations of screen time and work waste with sin counts")
+    p_patterns.add_argument("--min-r", dest="min_r", type=float, default=0.3,
+        help="Only show correlations with |r| at or above this value")
+    p_patterns.add_argument("--approx", action="store_true",
+        help="Approximate report from streaming sketches (with error bounds)")
+    p_patterns.add_argument("--rollup", choices=ROLLUPS, default="none",
+        help="Report each passion (none) or roll up to root passions (root)")
+    p_patterns.add_argument("--transitions", action="store_true",
+        help="Passion-to-passion transition matrix and likely successors")
+    p_patterns.add_argument("--by-season", dest="by_season", action="store_true",
+        help="Sin density and passion mix per liturgical season (full history)")
+    p_patterns.set_defaults(func=cmd_patterns, parser=p_patterns)
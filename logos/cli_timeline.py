@@ -0,0 +1,70 @@
+"""
+LogOS Timeline CLI.
+"""
+import sys
+import shutil
+import argparse
+from datetime import datetime, date, time, timedelta
+
+
+def parse_date(value):
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid date '{value}' (expected YYYY-MM-DD)")
+
+
+def format_event(event):
+    """One timeline line: timestamp, source kind, summary."""
+    timestamp, kind, _, summary = event
+    return f"{timestamp:%Y-%m-%d %H:%M}  {kind:<10}  {summary}"
+
+
+def cmd_timeline(args):
+    """logos timeline [--from 2024-01-01] [--to 2026-12-31] [--page-size N] [--no-pager]"""
+    from logos.timeline import iter_timeline
+
+    start = datetime.combine(args.start or date.min, time.min)
+    end = datetime.combine((args.end or date.today()) + timedelta(days=1), time.min)
+    if start >= end:
+        print("error: --from must not be after --to", flush=True)
+        raise SystemExit(1)
+
+    # Page only when a person is reading; pipes get the whole stream
+    paged = sys.stdout.isatty() and sys.stdin.isatty() and not args.no_pager
+    page_size = args.page_size or max(shutil.get_terminal_size().lines - 1, 1)
+
+    events = iter_timeline(start, end)
+    shown = 0
+    try:
+        for event in events:
+            print(format_event(event), flush=paged)
+            shown += 1
+            if paged and shown % page_size == 0:
+                answer = input("-- more (Enter to continue, q to quit) --")
+                if answer.strip().lower() == "q":
+                    break
+    finally:
+        events.close()
+
+    if shown == 0:
+        print("No events in range.")
+    return 0
+
+
+# Integration helper
+def register_timeline_commands(subparsers):
+    """Register the timeline command with the main parser."""
+
+    # logos timeline
+    p_timeline = subparsers.add_parser("timeline",
+        help="Chronological feed of every event (sins, confessions, practice, work)")
+    p_timeline.add_argument("--from", dest="start", type=parse_date,
+        help="First day (YYYY-MM-DD, default: beginning)")
+    p_timeline.add_argument("--to", dest="end", type=parse_date,
+        help="Last day (YYYY-MM-DD, default: today)")
+    p_timeline.add_argument("--page-size", dest="page_size", type=int,
+        help="Lines per page (default: terminal height)")
+    p_timeline.add_argument("--no-pager", dest="no_pager", action="store_true",
+        help="Stream without pausing between pages")
+    p_timeline.set_defaults(func=cmd_timeline)
@@ -0,0 +1,49 @@
+"""
+Fixed Vocabulary Shared by the CLI and the Engine.
+
+"Let your yes be yes, and your no be no." (Matthew 5:37)
+
+Standard library only: the argument parser is built from these lists
+without importing psycopg2 or any module that talks to the database.
+The engine modules import them from here and re-export them.
+"""
+
+
+# Canonical list of the Eight Passions (Evagrius of Pontus)
+PASSIONS = [
+    "Gluttony",
+    "Lust",
+    "Avarice",
+    "Sadness",
+    "Anger",
+    "Acedia",
+    "Vainglory",
+    "Pride"
+]
+
+# Valid fast break reasons (from migrate_v4.py)
+FAST_BREAK_REASONS = ["temptation", "necessity", "charity", "ignorance", "none"]
+
+# Work categories (daily_work_state columns)
+WORK_CATEGORIES = [
+    "deep_work_creative", "deep_work_analytical", "deep_work_learning",
+    "shallow_work_necessary", "shallow_work_admin", "shallow_work_waste",
+]
+
+# Screen time categories: work (neutral), social/entertainment (noise), edifying (signal)
+SCREEN_TIME_CATEGORIES = ["work", "social", "entertainment", "edifying"]
+
+# Horizons for the multi-horizon report: unconfessed, then trailing days
+HORIZON_UNCONFESSED = "unconfessed"
+HORIZON_DAYS = (7, 30, 90, 365)
+HORIZONS = (HORIZON_UNCONFESSED,) + HORIZON_DAYS
+
+# Passion rollups: "none" reports each passion, "root" reports its root
+# in the Evagrian genealogy (Vainglory -> Pride) via passion_closure
+ROLLUPS = ("none", "root")
+
+# Correlation windows in days
+WINDOWS = (30, 90, 365)
+
+# Rankings for `logos db top-queries`
+QUERY_ORDERS = ("total", "calls", "rows", "mean")
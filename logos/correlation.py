@@ -0,0 +1,229 @@
+"""
+Correlation Engine: Screen Time and Work Waste vs Hamartia.
+
+"The lamp of the body is the eye." (Matthew 6:22)
+What enters through the eyes bears fruit in the days that follow.
+
+One range fetch. Column-wise computation. Results cached by data version.
+"""
+
+import json
+import psycopg2
+from logos.db import get_connection
+from logos.constants import PASSIONS, WINDOWS
+from logos.patterns import passion_join
+
+
+# Metrics tested against sin counts (daily_state and daily_work_state columns)
+SCREEN_CATEGORIES = [
+    "screen_time_work",
+    "screen_time_social",
+    "screen_time_entertainment",
+    "screen_time_edifying",
+]
+WORK_METRICS = ["shallow_work_waste"]
+METRICS = SCREEN_CATEGORIES + WORK_METRICS
+
+# Lags in days (metric on day t-lag vs sins on day t); WINDOWS in constants
+LAGS = (0, 1, 2)
+
+# Sin count targets: every passion, plus all sins together
+TOTAL = "All"
+TARGETS = PASSIONS + [TOTAL]
+
+
+def _fetch_data_version(cur):
+    """
+    Version of the inputs the correlations depend on.
+
+    The data_version counter is bumped by every mutation. The date is
+    included because the windows are anchored on today.
+    """
+    cur.execute("SELECT version, CURRENT_DATE FROM data_version")
+    row = cur.fetchone()
+    return f"{row[0]}|{row[1]}"
+
+
+def _fetch_range(cur, days, rollup="none"):
+    """
+    Fetch one row per day for the last `days` days (plus the lag margin).
+
+    With rollup="root", sins are counted under their root passion, so
+    non-root passions have no sins of their own.
+
+    Returns:
+        dict: {"metrics": {metric: [value or None, ...]},
+               "sins": {target: [count, ...]}}
+        Columns are ordered oldest -> newest. A metric is None on days
+        with no recorded state (missing is not zero).
+    """
+    passion_filters = ",\n".join(
+        "COUNT(*) FILTER (WHERE po.name = %s)" for _ in PASSIONS
+    )
+    cur.execute(f"""
+        WITH days AS (
+            SELECT d::date AS date
+            FROM generate_series(
+                CURRENT_DATE - (%s * INTERVAL '1 day'),
+                CURRENT_DATE,
+                INTERVAL '1 day'
+            ) AS d
+        ),
+        sins AS (
+            SELECT hl.date,
+                {passion_filters},
+                COUNT(*)
+            FROM hamartia_log hl
+            {passion_join(rollup, outer=True)}
+            WHERE hl.date >= CURRENT_DATE - (%s * INTERVAL '1 day')
+            GROUP BY hl.date
+        )
+        SELECT
+            days.date,
+            ds.screen_time_work,
+            ds.screen_time_social,
+            ds.screen_time_entertainment,
+            ds.screen_time_edifying,
+            dws.shallow_work_waste,
+            sins.*
+        FROM days
+        LEFT JOIN daily_state ds ON ds.date = days.date
+        LEFT JOIN daily_work_state dws ON dws.date = days.date
+        LEFT JOIN sins ON sins.date = days.date
+        ORDER BY days.date ASC
+    """, [days] + list(PASSIONS) + [days])
+
+    rows = cur.fetchall()
+    metrics = {m: [] for m in METRICS}
+    sins = {t: [] for t in TARGETS}
+    for row in rows:
+        for i, metric in enumerate(METRICS):
+            metrics[metric].append(row[1 + i])
+        # row[6] is sins.date (NULL when no sins that day)
+        counts = row[7:]
+        for i, target in enumerate(TARGETS):
+            sins[target].append(counts[i] if row[6] is not None else 0)
+    return {"metrics": metrics, "sins": sins}
+
+
+def pearson(xs, ys):
+    """
+    Pearson correlation over paired samples, skipping pairs with None.
+
+    Returns:
+        tuple: (r, n). r is None when fewer than 3 pairs or zero variance.
+    """
+    pairs = [(x, y) for x, y in zip(xs, ys) if x is not None and y is not None]
+    n = len(pairs)
+    if n < 3:
+        return None, n
+
+    sx = sum(p[0] for p in pairs)
+    sy = sum(p[1] for p in pairs)
+    sxx = sum(p[0] * p[0] for p in pairs)
+    syy = sum(p[1] * p[1] for p in pairs)
+    sxy = sum(p[0] * p[1] for p in pairs)
+
+    cov = n * sxy - sx * sy
+    var_x = n * sxx - sx * sx
+    var_y = n * syy - sy * sy
+    if var_x <= 0 or var_y <= 0:
+        return None, n
+    return cov / (var_x * var_y) ** 0.5, n
+
+
+def compute_correlations(data, windows=WINDOWS, lags=LAGS):
+    """
+    Compute lagged correlations for every (window, metric, target, lag).
+
+    Args:
+        data: Output of _fetch_range (columns oldest -> newest, today last)
+        windows: Window sizes in days
+        lags: Lags in days (metric precedes sin by `lag` days)
+
+    Returns:
+        list: Dicts with window, metric, target, lag, r, n
+    """
+    results = []
+    length = len(data["sins"][TOTAL])
+    for window in windows:
+        start = max(length - window, 0)
+        for metric in METRICS:
+            series = data["metrics"][metric]
+            for lag in lags:
+                # Sins on days [start, length), metric on days [start-lag, length-lag)
+                if start - lag < 0:
+                    offset = lag - start
+                else:
+                    offset = 0
+                xs = series[start - lag + offset:length - lag]
+                for target in TARGETS:
+                    ys = data["sins"][target][start + offset:length]
+                    r, n = pearson(xs, ys)
+                    results.append({
+                        "window": window,
+                        "metric": metric,
+                        "target": target,
+                        "lag": lag,
+                        "r": r,
+                        "n": n,
+                    })
+    return results
+
+
+def analyze_correlations(conn=None, rollup="none"):
+    """
+    Lagged correlations between screen time / work waste and sin counts.
+
+    Served from correlation_cache when the data version is unchanged.
+    Otherwise computed from a single range fetch and stored.
+
+    Args:
+        conn: Optional database connection (will create new if None)
+        rollup: "none" (each passion) or "root" (root passions)
+
+    Returns:
+        dict: {"data_version": str, "cached": bool, "results": list}
+    """
+    should_close = False
+    if conn is None:
+        conn = get_connection()
+        should_close = True
+
+    try:
+        cur = conn.cursor(tag="correlation.analyze_correlations")
+        version = f"{_fetch_data_version(cur)}|{rollup}"
+
+        cur.execute(
+            "SELECT result FROM correlation_cache WHERE data_version = %s",
+            (version,),
+        )
+        row = cur.fetchone()
+        if row:
+            return {"data_version": version, "cached": True, "results": row[0]}
+
+        data = _fetch_range(cur, max(WINDOWS) + max(LAGS), rollup)
+        results = compute_correlations(data)
+
+        # Only the current version is worth keeping (one entry per rollup)
+        cur.execute("""
+            DELETE FROM correlation_cache
+            WHERE data_version LIKE %s AND data_version <> %s
+        """, (f"%|{rollup}", version))
+        cur.execute("""
+            INSERT INTO correlation_cache (data_version, result)
+            VALUES (%s, %s)
+            ON CONFLICT (data_version) DO NOTHING
+        """, (version, json.dumps(results)))
+        conn.commit()
+
+        return {"data_version": version, "cached": False, "results": results}
+
+    except psycopg2.Error as e:
+        conn.rollback()
+        print(f"error: failed to compute correlations: {e}", flush=True)
+        raise SystemExit(1)
+    finally:
+        cur.close()
+        if should_close:
+            conn.close()
@@ -6,13 +6,349 @@ All queries are explicit. All errors are loud.
 """
 
 import os
+import re
+import time
+import threading
 import psycopg2
 from psycopg2 import sql
+from psycopg2.extensions import connection as _connection, cursor as _cursor, STATUS_READY
+from psycopg2.pool import ThreadedConnectionPool
+from logos.metrics import observe_query
+from logos import trace
+
+
+def unconfessed_sql(alias=None):
+    """
+    SQL predicate: the sin is not (yet) confessed.
+    
+    Absolution is linked in batches under a confession with status
+    'staging'; until that confession is complete its sins still count
+    as unconfessed. Readers use this instead of the bare flag.
+    
+    Each side of the OR has an index, so the planner can combine the two
+    scans (BitmapOr) instead of reading the whole log: the unconfessed
+    partial indexes, and idx_hamartia_absolution, whose predicate the
+    IS NOT NULL repeats. The staging IDs are read once, as an array.
+    """
+    col = f"{alias}." if alias else ""
+    return (f"({col}confessed = FALSE OR ({col}absolution_id IS NOT NULL AND "
+            f"{col}absolution_id = ANY(ARRAY("
+            f"SELECT id FROM confession_log WHERE status = 'staging'))))")
+
+
+# Channel notified (with the new version) when a mutation commits
+CHANGE_CHANNEL = "logos_changed"
+
+
+def bump_data_version(cur):
+    """
+    Advance the data version inside the caller's mutation transaction.
+    
+    Every write that can change what a reader sees calls this before
+    committing, so anything memoized by version (health, correlations)
+    is invalidated exactly when the truth changes. The same statement
+    NOTIFYs CHANGE_CHANNEL; Postgres delivers it only if the mutation
+    commits, so listeners (logos watch) never see a rolled-back change.
+    
+    Returns:
+        int: The new version
+    """
+    cur.execute("""
+        WITH bumped AS (
+            UPDATE data_version SET version = version + 1
+            WHERE id = TRUE
+            RETURNING version
+        )
+        SELECT version, pg_notify(%s, version::TEXT) FROM bumped
+    """, (CHANGE_CHANNEL,))
+    return cur.fetchone()[0]
+
+
+def _tag(issuer, query):
+    """
+    The statement prefixed with its query tag, /* logos:<issuer> */.
+    
+    The tag is stable (the issuing function, not the command), because
+    pg_stat_statements keeps the text of the first execution it sees.
+    """
+    prefix = f"/* logos:{issuer} */ "
+    return prefix + query if isinstance(query, str) else sql.SQL(prefix) + query
+
+
+# Calls whose effects a rollback leaves in place
+_NON_TRANSACTIONAL = re.compile(r"\b(nextval|setval|pg_advisory_lock|pg_try_advisory_lock)\s*\(",
+                                re.IGNORECASE)
+
+
+def _is_read(text):
+    """Whether running the statement again is harmless: a plain SELECT."""
+    words = text.split(None, 1)
+    return (bool(words) and words[0].upper() == "SELECT"
+            and not _NON_TRANSACTIONAL.search(text))
+
+
+class TimedCursor(_cursor):
+    """
+    Every connection's cursor: tags each statement with its issuer (for
+    logos db top-queries), times it into the query latency histograms
+    (logos.metrics), and into the trace when one is being recorded
+    (logos --trace).
+    
+    The issuer is the tag the cursor was opened with, "module.function"
+    of the function that opened it (conn.cursor(tag=...)). Statements run
+    on a cursor passed in (record_lineage, bump_data_version) count
+    towards the caller that owns the transaction.
+    """
+
+    tag = "other"
+
+    def execute(self, query, params=None):
+        issuer = self.tag
+        tagged = _tag(issuer, query)
+        started = time.perf_counter()
+        succeeded = False
+        try:
+            result = super().execute(tagged, params)
+            succeeded = True
+            return result
+        finally:
+            elapsed = time.perf_counter() - started
+            observe_query(issuer, elapsed)
+            if trace.active():
+                text = query if isinstance(query, str) else query.as_string(self.connection)
+                plan = None
+                if succeeded and trace.wants_plan(elapsed):
+                    plan = self._explain(tagged, text, params)
+                trace.statement(issuer, text, elapsed, self.rowcount if succeeded else None, plan)
+
+    def _explain(self, query, text, params):
+        """
+        The plan of a statement that already ran.
+        
+        Only a read is explained with ANALYZE, BUFFERS: ANALYZE executes
+        it again, and a rollback does not undo everything a write or a
+        side-effecting call does (sequences, session locks). Even a read
+        runs inside a savepoint that is always rolled back. Uses a plain
+        cursor, so the EXPLAIN is neither timed nor traced itself.
+        """
+        if self.connection.autocommit:
+            return "(no plan: autocommit connection)"
+        prefix = "EXPLAIN (ANALYZE, BUFFERS) " if _is_read(text) else "EXPLAIN "
+        explain = prefix + query if isinstance(query, str) else sql.SQL(prefix) + query
+        cur = self.connection.cursor(cursor_factory=_cursor)
+        try:
+            cur.execute("SAVEPOINT logos_explain")
+            try:
+                cur.execute(explain, params)
+                return "\n".join(row[0] for row in cur.fetchall())
+            except psycopg2.Error as e:
+                return f"(no plan: {str(e).strip()})"
+            finally:
+                cur.execute("ROLLBACK TO SAVEPOINT logos_explain")
+                cur.execute("RELEASE SAVEPOINT logos_explain")
+        finally:
+            cur.close()
+
+
+class TaggedConnection(_connection):
+    """A connection whose cursor() takes the tag its statements carry."""
+
+    def cursor(self, name=None, tag=None, **kwargs):
+        cur = super().cursor(name, **kwargs)
+        if tag is not None:
+            cur.tag = tag
+        return cur
+
+
+class SessionConnection:
+    """
+    One connection lent to every get_connection() caller in a session.
+
+    Callers keep their own commit/rollback/close discipline: close() only
+    ends whatever transaction the caller left open (a read leaves one),
+    the connection itself stays up until close_session().
+
+    In a deferred session (logos batch) the session owns the transaction:
+    callers' commit, rollback and close do nothing, and the batch commits,
+    or rolls back to a savepoint, once it knows how each line ended.
+    """
+
+    def __init__(self, conn, deferred=False):
+        self.conn = conn
+        self.deferred = deferred
+
+    def cursor(self, name=None, tag=None):
+        return self.conn.cursor(name, tag=tag)
+
+    def commit(self):
+        if not self.deferred:
+            self.conn.commit()
+
+    def rollback(self):
+        if not self.deferred:
+            self.conn.rollback()
+
+    def close(self):
+        if not self.deferred:
+            self.conn.rollback()
+
+
+class PooledConnection:
+    """
+    A pool connection lent for one unit of work (logos serve).
+
+    close() ends the caller's transaction and hands the connection back;
+    a connection that was dropped is discarded instead of reused.
+    """
+
+    def __init__(self, pool, conn):
+        self.pool = pool
+        self.conn = conn
+
+    def cursor(self, name=None, tag=None):
+        return self.conn.cursor(name, tag=tag)
+
+    def commit(self):
+        self.conn.commit()
+
+    def rollback(self):
+        self.conn.rollback()
+
+    def close(self):
+        if self.conn.closed:
+            self.pool.putconn(self.conn, close=True)
+            return
+        self.conn.rollback()
+        self.pool.putconn(self.conn)
+
+
+# The open session (logos shell, logos batch), or None: each caller
+# connects and closes
+_session = None
+
+# The open pool (logos serve), or None
+_pool = None
+
+# The command each thread runs, when it is not the process's own
+# (a batch line, a server route); see name_command
+_running = threading.local()
+
+
+def name_command(name):
+    """
+    Name the command this thread runs in pg_stat_activity.
+    
+    A session or pooled connection outlives its commands, so its
+    application_name is set again when the command gets it (see
+    get_connection). One-shot commands need no call: cli.main sets
+    PGAPPNAME before connecting.
+    """
+    _running.name = f"logos {name}"[:63]
+
+
+def _application_name():
+    return getattr(_running, "name", None) or os.environ.get("PGAPPNAME", "logos")
+
+
+def _rename(conn):
+    """
+    SET application_name on a shared connection when its command changed.
+    
+    Between units of work the connection is idle and the setting is
+    committed at once. Inside a deferred batch it joins the open
+    transaction, where a rolled-back line undoes it, so it is not
+    remembered there and is set again by the next unit of work.
+    """
+    name = _application_name()
+    if conn.closed or getattr(conn, "logos_application_name", None) == name:
+        return
+    idle = conn.status == STATUS_READY
+    cur = conn.cursor(tag="db.name_command")
+    try:
+        cur.execute("SELECT set_config('application_name', %s, false)", (name,))
+    except psycopg2.Error as e:
+        print(f"error: database connection failed: {e}", flush=True)
+        raise SystemExit(1)
+    finally:
+        cur.close()
+    if idle:
+        conn.commit()
+        conn.logos_application_name = name
+
+
+def open_session(deferred=False):
+    """Share one connection with every get_connection() until close_session()."""
+    global _session
+    _session = SessionConnection(_connect(), deferred)
+    return _session
+
+
+def close_session():
+    """Close the shared connection; callers connect on their own again."""
+    global _session
+    if _session is not None:
+        _session.conn.close()
+        _session = None
+
+
+def open_pool(maxconn):
+    """
+    Lend get_connection() callers pooled connections until close_pool().
+    
+    Threads calling get_connection() must not outnumber maxconn (the
+    server sizes its worker pool to match), or the pool raises PoolError.
+    """
+    global _pool
+    try:
+        _pool = ThreadedConnectionPool(1, maxconn, **_connect_params())
+    except psycopg2.Error as e:
+        print(f"error: database connection failed: {e}", flush=True)
+        raise SystemExit(1)
+    return _pool
+
+
+def close_pool():
+    """Close every pooled connection."""
+    global _pool
+    if _pool is not None:
+        _pool.closeall()
+        _pool = None
 
 
 def get_connection():
     """
-    Establish a connection to the LogOS database.
+    Connection for one unit of work: the session's, if one is open, or
+    one lent from the pool.
+
+    A session connection that was dropped (server restart, idle timeout)
+    is replaced transparently, unless it held a deferred transaction.
+    """
+    if _session is None:
+        if _pool is not None:
+            span = trace.begin("connection (pool)")
+            try:
+                conn = _pool.getconn()
+                try:
+                    _rename(conn)
+                except SystemExit:
+                    _pool.putconn(conn, close=True)
+                    raise
+                return PooledConnection(_pool, conn)
+            finally:
+                trace.end(span)
+        return _connect()
+    if _session.conn.closed:
+        if _session.deferred:
+            print("error: database connection lost; the batch was not committed", flush=True)
+            raise SystemExit(1)
+        _session.conn = _connect()
+    _rename(_session.conn)
+    return _session
+
+
+def _connect_params():
+    """
+    Connection parameters from the environment.
     
     Environment variables (required):
     - LOGOS_DB_HOST
@@ -21,20 +357,93 @@ def get_connection():
     - LOGOS_DB_USER
     - LOGOS_DB_PASSWORD
     
+    PGAPPNAME (optional) names the connection in pg_stat_activity,
+    unless name_command named this thread's command.
+    """
+    return {
+        "host": os.environ.get("LOGOS_DB_HOST", "localhost"),
+        "port": os.environ.get("LOGOS_DB_PORT", "5432"),
+        "database": os.environ.get("LOGOS_DB_NAME", "logos"),
+        "user": os.environ.get("LOGOS_DB_USER", "logos"),
+        "password": os.environ.get("LOGOS_DB_PASSWORD", ""),
+        # The running command ("logos ascetic pray"), set by cli.main or
+        # name_command; shared connections are renamed per command
+        "application_name": _application_name(),
+        "connection_factory": TaggedConnection,
+        "cursor_factory": TimedCursor,
+    }
+
+
+def _connect():
+    """
+    Establish a connection to the LogOS database.
+    
     Raises SystemExit if connection fails.
     """
+    span = trace.begin("connect")
     try:
-        conn = psycopg2.connect(
-            host=os.environ.get("LOGOS_DB_HOST", "localhost"),
-            port=os.environ.get("LOGOS_DB_PORT", "5432"),
-            database=os.environ.get("LOGOS_DB_NAME", "logos"),
-            user=os.environ.get("LOGOS_DB_USER", "logos"),
-            password=os.environ.get("LOGOS_DB_PASSWORD", ""),
-        )
+        params = _connect_params()
+        conn = psycopg2.connect(**params)
+        conn.logos_application_name = params["application_name"]
         return conn
     except psycopg2.Error as e:
         print(f"error: database connection failed: {e}", flush=True)
         raise SystemExit(1)
+    finally:
+        trace.end(span)
+
+
+def open_listener():
+    """
+    A dedicated autocommit connection LISTENing on CHANGE_CHANNEL.
+    
+    Listening starts before the version is read, so no change committed
+    after the returned version can be missed.
+    
+    Returns:
+        tuple: (connection, current data version)
+    """
+    conn = _connect()
+    try:
+        conn.autocommit = True
+        cur = conn.cursor(tag="db.open_listener")
+        cur.execute(f"LISTEN {CHANGE_CHANNEL}")
+        cur.execute("SELECT version FROM data_version")
+        row = cur.fetchone()
+        cur.close()
+    except psycopg2.Error as e:
+        conn.close()
+        print(f"error: failed to listen for changes: {e}", flush=True)
+        raise SystemExit(1)
+    if not row:
+        conn.close()
+        print("error: data_version missing (run scripts/migrate_v5.py)", flush=True)
+        raise SystemExit(1)
+    return conn, row[0]
+
+
+# Today's health (scripts/check_plans.py plans it)
+SYSTEM_HEALTH_SQL = """
+    SELECT
+        date,
+        prayer_minutes,
+        reading_minutes,
+        screen_time_minutes,
+        fasted,
+        prayed,
+        fast_type,
+        feast,
+        feast_level,
+        unconfessed_count,
+        prayer_interruptions,
+        fast_break_reason,
+        screen_time_work,
+        screen_time_social,
+        screen_time_entertainment,
+        screen_time_edifying
+    FROM system_health_today
+    LIMIT 1;
+"""
 
 
 def fetch_system_health_today():
@@ -59,28 +468,8 @@ def fetch_system_health_today():
     """
     conn = get_connection()
     try:
-        cur = conn.cursor()
-        cur.execute("""
-            SELECT
-                date,
-                prayer_minutes,
-                reading_minutes,
-                screen_time_minutes,
-                fasted,
-                prayed,
-                fast_type,
-                feast,
-                feast_level,
-                unconfessed_count,
-                prayer_interruptions,
-                fast_break_reason,
-                screen_time_work,
-                screen_time_social,
-                screen_time_entertainment,
-                screen_time_edifying
-            FROM system_health_today
-            LIMIT 1;
-        """)
+        cur = conn.cursor(tag="db.fetch_system_health_today")
+        cur.execute(SYSTEM_HEALTH_SQL)
         
         row = cur.fetchone()
         if not row:
@@ -120,3 +509,192 @@ def fetch_system_health_today():
     finally:
         cur.close()
         conn.close()
+
+
+def fetch_health_cache(variant):
+    """
+    Read the data version, today's date and any memoized health result.
+    
+    One indexed read: the cache row only matches the current version
+    and date, so a hit is exactly as true as recomputing.
+    
+    Returns:
+        tuple: (version, date, (state, output, unconfessed_count) or None)
+    """
+    conn = get_connection()
+    try:
+        cur = conn.cursor(tag="db.fetch_health_cache")
+        cur.execute("""
+            SELECT v.version, CURRENT_DATE, c.state, c.output, c.unconfessed_count
+            FROM data_version v
+            LEFT JOIN health_cache c
+                ON c.version = v.version
+                AND c.date = CURRENT_DATE
+                AND c.variant = %s
+        """, (variant,))
+        row = cur.fetchone()
+        if not row:
+            print("error: data_version missing (run scripts/migrate_v5.py)", flush=True)
+            raise SystemExit(1)
+        cached = (row[2], row[3], row[4]) if row[4] is not None else None
+        return row[0], row[1], cached
+    
+    except psycopg2.Error as e:
+        print(f"error: failed to read health cache: {e}", flush=True)
+        raise SystemExit(1)
+    finally:
+        cur.close()
+        conn.close()
+
+
+def store_health_cache(version, day, variant, state, output, unconfessed_count):
+    """
+    Memoize a health result computed at (version, day).
+    
+    Entries for older versions or days can never match again and are removed.
+    """
+    conn = get_connection()
+    try:
+        cur = conn.cursor(tag="db.store_health_cache")
+        cur.execute("""
+            DELETE FROM health_cache WHERE version < %s OR date < %s
+        """, (version, day))
+        cur.execute("""
+            INSERT INTO health_cache (version, date, variant, state, output, unconfessed_count)
+            VALUES (%s, %s, %s, %s, %s, %s)
+            ON CONFLICT (version, date, variant) DO NOTHING
+        """, (version, day, variant, state, output, unconfessed_count))
+        conn.commit()
+    
+    except psycopg2.Error as e:
+        conn.rollback()
+        print(f"error: failed to store health cache: {e}", flush=True)
+        raise SystemExit(1)
+    finally:
+        cur.close()
+        conn.close()
+
+
+ACTIVE_COMMITMENTS_SQL = """
+    SELECT id FROM commitment_log
+    WHERE status = 'active'
+    ORDER BY id
+"""
+
+
+def fetch_active_commitment_ids():
+    """
+    IDs of commitments still active (for completion in the shell).
+    
+    Returns:
+        list: Commitment IDs, oldest first
+    """
+    conn = get_connection()
+    try:
+        cur = conn.cursor(tag="db.fetch_active_commitment_ids")
+        cur.execute(ACTIVE_COMMITMENTS_SQL)
+        return [row[0] for row in cur.fetchall()]
+    
+    except psycopg2.Error as e:
+        print(f"error: failed to read commitments: {e}", flush=True)
+        raise SystemExit(1)
+    finally:
+        cur.close()
+        conn.close()
+
+
+WORK_COUNTERS_SQL = """
+    SELECT
+        COALESCE(SUM(deep_work_creative + deep_work_analytical + deep_work_learning), 0),
+        COALESCE(SUM(shallow_work_waste), 0),
+        (SELECT COUNT(*) FROM commitment_log
+         WHERE status = 'abandoned' AND processed = FALSE)
+    FROM daily_work_state
+    WHERE date = CURRENT_DATE
+"""
+
+
+def fetch_work_counters():
+    """
+    The raw inputs of work health, for metrics: today's signal (deep
+    work) and noise (wasted shallow work) minutes, and the entropic debt
+    (abandoned commitments not yet processed).
+    
+    Returns:
+        dict: signal, noise, debt
+    """
+    conn = get_connection()
+    try:
+        cur = conn.cursor(tag="db.fetch_work_counters")
+        cur.execute(WORK_COUNTERS_SQL)
+        row = cur.fetchone()
+        return {"signal": row[0], "noise": row[1], "debt": row[2]}
+    
+    except psycopg2.Error as e:
+        print(f"error: failed to read work counters: {e}", flush=True)
+        raise SystemExit(1)
+    finally:
+        cur.close()
+        conn.close()
+
+
+# Orderings for fetch_top_queries (constants.QUERY_ORDERS) -> result column
+TOP_QUERY_ORDERS = {
+    "total": "total_ms",
+    "calls": "calls",
+    "rows": "rows",
+    "mean": "mean_ms",
+}
+
+
+def fetch_top_queries(order="total", limit=20):
+    """
+    LogOS statements recorded by pg_stat_statements, ranked.
+    
+    Statements are matched by their query tag (see _tag), so each row
+    names the function that issues it. Requires the pg_stat_statements
+    extension (shared_preload_libraries).
+    
+    Args:
+        order: One of constants.QUERY_ORDERS
+        limit: Rows to return
+    
+    Returns:
+        list: Dicts with tag, statement, calls, total_ms, mean_ms, rows
+    """
+    conn = get_connection()
+    try:
+        cur = conn.cursor(tag="db.fetch_top_queries")
+        # Renamed in PostgreSQL 13 (when planning time was split out)
+        time_column = "total_exec_time" if cur.connection.server_version >= 130000 else "total_time"
+        cur.execute(f"""
+            SELECT
+                substring(query from '^/\\* logos:([^ ]+) \\*/') AS tag,
+                regexp_replace(query, '^/\\* logos:[^ ]+ \\*/\\s*', '') AS statement,
+                calls,
+                {time_column} AS total_ms,
+                {time_column} / NULLIF(calls, 0) AS mean_ms,
+                rows
+            FROM pg_stat_statements
+            WHERE dbid = (SELECT oid FROM pg_database WHERE datname = current_database())
+              AND query LIKE '/* logos:%%'
+            ORDER BY {TOP_QUERY_ORDERS[order]} DESC
+            LIMIT %s
+        """, (limit,))
+        return [
+            {"tag": row[0], "statement": row[1], "calls": row[2],
+             "total_ms": row[3], "mean_ms": row[4], "rows": row[5]}
+            for row in cur.fetchall()
+        ]
+    
+    except psycopg2.errors.UndefinedTable:
+        print("error: pg_stat_statements is not installed "
+              "(shared_preload_libraries = 'pg_stat_statements', then "
+              "CREATE EXTENSION pg_stat_statements as a superuser)", flush=True)
+        raise SystemExit(1)
+    except psycopg2.Error as e:
+        print(f"error: failed to read pg_stat_statements: {e}", flush=True)
+        raise SystemExit(1)
+    finally:
+        cur.close()
+        conn.close()
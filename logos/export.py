@@ -6,13 +6,13 @@ Digital systems are ephemeral. Paper endures.
 """
 
 from datetime import date
-from logos.db import get_connection
+from logos.db import get_connection, unconfessed_sql
 
 def export_to_plaintext(filepath: str):
     """Export entire spiritual log to plaintext."""
     conn = get_connection()
     try:
-        cur = conn.cursor()
+        cur = conn.cursor(tag="export.export_to_plaintext")
         
         with open(filepath, 'w') as f:
             f.write("=" * 70 + "\n")
@@ -20,9 +20,9 @@ def export_to_plaintext(filepath: str):
             f.write(f"Exported: {date.today()}\n")
             f.write("=" * 70 + "\n\n")
             
-            # Hamartia log
-            cur.execute("""
-                SELECT hl.date, po.name, hl.description, hl.confessed, hl.confessed_at
+            # Hamartia log (sins under a confession still staging are unconfessed)
+            cur.execute(f"""
+                SELECT hl.date, po.name, hl.description, {unconfessed_sql("hl")}, hl.confessed_at
                 FROM hamartia_log hl
                 JOIN passion_ontology po ON hl.passion_id = po.id
                 ORDER BY hl.date DESC, hl.id DESC
@@ -31,13 +31,14 @@ def export_to_plaintext(filepath: str):
             f.write("HAMARTIA LOG (Sins)\n")
             f.write("-" * 70 + "\n")
             for row in cur.fetchall():
-                status = "✓ CONFESSED" if row[3] else "✕ UNCONFESSED"
+                status = "✕ UNCONFESSED" if row[3] else "✓ CONFESSED"
                 f.write(f"[{row[0]}] {row[1]}: {row[2]} ({status})\n")
             
             # Confession history
             cur.execute("""
                 SELECT date, spiritual_father, penance_assigned, penance_completed
                 FROM confession_log
+                WHERE status = 'complete'
                 ORDER BY date DESC
             """)
             
@@ -0,0 +1,231 @@
+"""
+Persistent Latency History.
+
+"Remember the days of old, consider the years of many generations."
+(Deuteronomy 32:7)
+
+Every command, library entry point and SQL statement observed by
+logos.metrics is also recorded here, into compact HDR-style histograms: exact up to 32 µs,
+then 16 buckets per power of two (each within about 6% of its values).
+Only occupied buckets are stored. A process appends its histograms once,
+as one JSON line in the day's file, when the command ends (the server
+flushes once a minute). `logos stats` merges the days in each window, so
+a regression in update_daily_state or log_hamartia shows up as the data
+grows.
+
+Files: $LOGOS_STATS_DIR, or ~/.local/state/logos/latency
+($XDG_STATE_HOME). Standard library only.
+"""
+
+import os
+import sys
+import json
+import threading
+from datetime import date, timedelta
+
+
+# Values below 2 ** SUB_BITS µs have a bucket each; above, each power
+# of two is split into 2 ** (SUB_BITS - 1) buckets
+SUB_BITS = 5
+SUB_COUNT = 1 << SUB_BITS
+HALF_COUNT = SUB_COUNT >> 1
+
+KINDS = ("command", "call", "query")
+
+
+def stats_dir():
+    """Where the day files live ($LOGOS_STATS_DIR overrides)."""
+    path = os.environ.get("LOGOS_STATS_DIR")
+    if path:
+        return path
+    state = os.environ.get("XDG_STATE_HOME") or os.path.join(os.path.expanduser("~"), ".local", "state")
+    return os.path.join(state, "logos", "latency")
+
+
+def bucket_index(micros):
+    if micros < SUB_COUNT:
+        return micros
+    shift = micros.bit_length() - SUB_BITS
+    return SUB_COUNT + (shift - 1) * HALF_COUNT + (micros >> shift) - HALF_COUNT
+
+
+def bucket_upper(index):
+    """Largest value (µs) that falls in the bucket."""
+    if index < SUB_COUNT:
+        return index
+    shift, offset = divmod(index - SUB_COUNT, HALF_COUNT)
+    shift += 1
+    return ((offset + HALF_COUNT + 1) << shift) - 1
+
+
+class HdrHistogram:
+    """Sparse log-linear latency histogram, in microseconds."""
+
+    def __init__(self):
+        self.buckets = {}
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    def record(self, seconds):
+        micros = max(int(seconds * 1_000_000), 0)
+        index = bucket_index(micros)
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+        self.count += 1
+        self.total += micros
+        self.max = max(self.max, micros)
+
+    def merge(self, other):
+        for index, n in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + n
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    def percentile(self, p):
+        """Upper bound (µs) of the bucket holding the p-th percentile."""
+        if not self.count:
+            return 0
+        rank = max(int(round(p / 100 * self.count)), 1)
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                return min(bucket_upper(index), self.max)
+        return self.max
+
+    def to_json(self):
+        return {"n": self.count, "sum": self.total, "max": self.max,
+                "b": {str(i): n for i, n in self.buckets.items()}}
+
+
+def histogram_from_json(data):
+    histogram = HdrHistogram()
+    histogram.buckets = {int(i): n for i, n in data["b"].items()}
+    histogram.count = data["n"]
+    histogram.total = data["sum"]
+    histogram.max = data["max"]
+    return histogram
+
+
+# Observations not yet written: {kind: {name: HdrHistogram}}
+_lock = threading.Lock()
+_pending = {kind: {} for kind in KINDS}
+
+
+def record(kind, name, seconds):
+    with _lock:
+        histograms = _pending[kind]
+        histogram = histograms.get(name)
+        if histogram is None:
+            histogram = histograms[name] = HdrHistogram()
+        histogram.record(seconds)
+
+
+def flush(day=None):
+    """
+    Append everything recorded since the last flush to the day's file.
+
+    A failed write loses only these observations: it is reported on
+    stderr and never fails the command that was measured.
+    """
+    global _pending
+    with _lock:
+        pending, _pending = _pending, {kind: {} for kind in KINDS}
+    if not any(pending.values()):
+        return
+    line = json.dumps({kind: {name: h.to_json() for name, h in histograms.items()}
+                       for kind, histograms in pending.items() if histograms},
+                      separators=(",", ":"))
+    path = os.path.join(stats_dir(), f"{day or date.today()}.jsonl")
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # One write per flush on an O_APPEND file: concurrent processes'
+        # lines do not interleave
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+    except OSError as e:
+        print(f"warning: latency stats not saved: {e}", file=sys.stderr, flush=True)
+
+
+def _read_day(path):
+    """{kind: {name: HdrHistogram}} merged from one day file."""
+    merged = {kind: {} for kind in KINDS}
+    try:
+        with open(path, encoding="utf-8") as f:
+            lines = f.readlines()
+    except FileNotFoundError:
+        return merged
+    for line in lines:
+        try:
+            entry = json.loads(line)
+        except ValueError:
+            continue  # a line cut short by a crash
+        for kind in KINDS:
+            for name, data in entry.get(kind, {}).items():
+                _merge_into(merged[kind], name, histogram_from_json(data))
+    return merged
+
+
+def _merge_into(histograms, name, histogram):
+    existing = histograms.get(name)
+    if existing is None:
+        existing = histograms[name] = HdrHistogram()
+    existing.merge(histogram)
+
+
+def load(days, today=None):
+    """
+    The last `days` day files, newest (today) first.
+
+    Returns:
+        list: One {kind: {name: HdrHistogram}} per day
+    """
+    today = today or date.today()
+    return [_read_day(os.path.join(stats_dir(), f"{today - timedelta(days=back)}.jsonl"))
+            for back in range(days)]
+
+
+def merge_days(per_day):
+    """One {kind: {name: HdrHistogram}} for a run of days from load()."""
+    merged = {kind: {} for kind in KINDS}
+    for day in per_day:
+        for kind in KINDS:
+            for name, histogram in day[kind].items():
+                _merge_into(merged[kind], name, histogram)
+    return merged
+
+
+def format_stats(windows, match=None, today=None):
+    """
+    p50/p95/p99/max per command, entry point and query, for each window.
+
+    Args:
+        windows: Window lengths in days, e.g. (1, 7, 30)
+        match: Only names containing this text
+    """
+    per_day = load(max(windows), today)
+    loaded = {days: merge_days(per_day[:days]) for days in windows}
+    lines = []
+    for kind, title in (("command", "Commands"), ("call", "Calls (library entry points)"),
+                        ("query", "Queries (by issuing function)")):
+        names = sorted({name for merged in loaded.values() for name in merged[kind]
+                        if match is None or match in name})
+        lines.append("")
+        lines.append(f"{title}, latency in ms:")
+        lines.append("=" * 86)
+        if not names:
+            lines.append("  (nothing recorded)")
+            continue
+        lines.append(f"  {'Name':<40} {'Window':>6} {'Count':>8} {'p50':>7} {'p95':>7} {'p99':>7} {'max':>7}")
+        for name in names:
+            label = name
+            for days in windows:
+                histogram = loaded[days][kind].get(name)
+                if histogram is None:
+                    continue
+                ms = [histogram.percentile(p) / 1000 for p in (50, 95, 99)] + [histogram.max / 1000]
+                lines.append(f"  {label:<40} {f'{days}d':>6} {histogram.count:>8} "
+                             + " ".join(f"{v:>7.1f}" for v in ms))
+                label = ""
+    return "\n".join(lines)
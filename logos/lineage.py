@@ -0,0 +1,190 @@
+"""
+Sin Lineage (Indexed Traversal).
+
+"Then, when desire has conceived, it gives birth to sin;
+and sin, when it is full-grown, brings forth death." (James 1:15)
+
+hamartia_log.parent_sin_id records which sin gave birth to which.
+The lineage closure is written once, when the sin is logged, so every
+query here is a single indexed lookup regardless of chain depth.
+"""
+
+import psycopg2
+from logos.db import get_connection
+
+
+# Run by log_hamartia for every sin (scripts/check_plans.py plans them)
+LINEAGE_CLOSURE_SQL = """
+    INSERT INTO hamartia_lineage (ancestor_id, descendant_id, depth)
+    SELECT %s::INTEGER, %s::INTEGER, 0
+    UNION ALL
+    SELECT ancestor_id, %s::INTEGER, depth + 1
+    FROM hamartia_lineage
+    WHERE descendant_id = %s
+"""
+
+LINEAGE_TREE_SQL = """
+    UPDATE hamartia_lineage_tree t
+    SET size = t.size + 1,
+        max_depth = GREATEST(t.max_depth, l.depth)
+    FROM hamartia_lineage l
+    WHERE l.descendant_id = %s
+      AND l.ancestor_id = t.root_id
+"""
+
+
+def record_lineage(cur, sin_id, parent_sin_id=None):
+    """
+    Extend the lineage closure for a newly logged sin.
+
+    Must run inside the same transaction as the INSERT.
+    The new sin inherits every ancestor of its parent, one level deeper.
+    """
+    cur.execute(LINEAGE_CLOSURE_SQL, (sin_id, sin_id, sin_id, parent_sin_id))
+
+    if parent_sin_id is None:
+        cur.execute("""
+            INSERT INTO hamartia_lineage_tree (root_id) VALUES (%s)
+        """, (sin_id,))
+        return
+
+    cur.execute(LINEAGE_TREE_SQL, (sin_id,))
+
+
+def _rows_to_sins(rows):
+    return [
+        {
+            "id": row[0],
+            "date": row[1],
+            "passions": row[2],
+            "description": row[3],
+            "depth": row[4],
+        }
+        for row in rows
+    ]
+
+
+def fetch_ancestors(sin_id):
+    """
+    Retrieve the chain from the root of a sin's tree down to the sin.
+
+    Raises:
+        ValueError: If the sin does not exist
+
+    Returns:
+        list: Dicts with id, date, passions, description, depth
+              (depth = generations above sin_id; the sin itself is last, at 0)
+    """
+    conn = get_connection()
+    try:
+        cur = conn.cursor(tag="lineage.fetch_ancestors")
+        cur.execute("""
+            SELECT h.id, h.date, h.passions, h.description, l.depth
+            FROM hamartia_lineage l
+            JOIN hamartia_log h ON h.id = l.ancestor_id
+            WHERE l.descendant_id = %s
+            ORDER BY l.depth DESC
+        """, (sin_id,))
+        rows = cur.fetchall()
+        if not rows:
+            raise ValueError(f"Sin {sin_id} not found")
+        return _rows_to_sins(rows)
+
+    except psycopg2.Error as e:
+        print(f"error: failed to fetch lineage: {e}", flush=True)
+        raise SystemExit(1)
+    finally:
+        cur.close()
+        conn.close()
+
+
+def fetch_descendants(sin_id):
+    """
+    Retrieve every descendant of a sin, nearest generation first.
+
+    Returns:
+        list: Dicts with id, date, passions, description, depth
+              (depth = generations below sin_id)
+    """
+    conn = get_connection()
+    try:
+        cur = conn.cursor(tag="lineage.fetch_descendants")
+        cur.execute("""
+            SELECT h.id, h.date, h.passions, h.description, l.depth
+            FROM hamartia_lineage l
+            JOIN hamartia_log h ON h.id = l.descendant_id
+            WHERE l.ancestor_id = %s AND l.depth > 0
+            ORDER BY l.depth ASC, h.id ASC
+        """, (sin_id,))
+        return _rows_to_sins(cur.fetchall())
+
+    except psycopg2.Error as e:
+        print(f"error: failed to fetch lineage: {e}", flush=True)
+        raise SystemExit(1)
+    finally:
+        cur.close()
+        conn.close()
+
+
+def fetch_depth(sin_id):
+    """
+    Number of generations between a sin and the root of its tree.
+
+    Raises:
+        ValueError: If the sin does not exist
+    """
+    conn = get_connection()
+    try:
+        cur = conn.cursor(tag="lineage.fetch_depth")
+        cur.execute("""
+            SELECT MAX(depth) FROM hamartia_lineage WHERE descendant_id = %s
+        """, (sin_id,))
+        depth = cur.fetchone()[0]
+        if depth is None:
+            raise ValueError(f"Sin {sin_id} not found")
+        return depth
+
+    except psycopg2.Error as e:
+        print(f"error: failed to fetch lineage: {e}", flush=True)
+        raise SystemExit(1)
+    finally:
+        cur.close()
+        conn.close()
+
+
+def fetch_largest_trees(limit=10):
+    """
+    Retrieve the largest lineage trees (more than one sin).
+
+    Returns:
+        list: Dicts with root_id, date, passions, description, size, max_depth
+    """
+    conn = get_connection()
+    try:
+        cur = conn.cursor(tag="lineage.fetch_largest_trees")
+        cur.execute("""
+            SELECT t.root_id, h.date, h.passions, h.description, t.size, t.max_depth
+            FROM hamartia_lineage_tree t
+            JOIN hamartia_log h ON h.id = t.root_id
+            WHERE t.size > 1
+            ORDER BY t.size DESC, t.root_id ASC
+            LIMIT %s
+        """, (limit,))
+        return [
+            {
+                "root_id": row[0],
+                "date": row[1],
+                "passions": row[2],
+                "description": row[3],
+                "size": row[4],
+                "max_depth": row[5],
+            }
+            for row in cur.fetchall()
+        ]
+
+    except psycopg2.Error as e:
+        print(f"error: failed to fetch lineage trees: {e}", flush=True)
+        raise SystemExit(1)
+    finally:
+        cur.close()
+        conn.close()
@@ -0,0 +1,246 @@
+"""
+Metrics: Latency Histograms and Health Gauges, for Prometheus.
+
+"By their fruits ye shall know them." (Matthew 7:20)
+
+Two kinds of series. Latency histograms are observed in process: every
+SQL statement, named after the logos function that issued it, every
+call of a timed library entry point (log_hamartia, update_daily_state,
+calculate_work_health), as one unit, and every API request, named after
+its route. Health gauges come from a snapshot
+read once per (data version, date): alignment state, unconfessed sins,
+work health, entropic debt and today's counters. The server learns of
+new versions by LISTENing on logos_changed, so scrapes between changes
+read memory only.
+
+Every observation is also kept for `logos stats` (logos.latency).
+
+Standard library only: db.py imports this for every connection.
+"""
+
+import threading
+from bisect import bisect_left
+from datetime import date
+
+from logos import latency
+from logos.constants import SCREEN_TIME_CATEGORIES
+
+
+# Upper bounds (seconds) of the latency buckets; +Inf is implicit
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025,
+                   0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+STATES = ("STABLE", "DEGRADED", "CRITICAL")
+
+# As `logos health` exits, for monitoring that used to scrape run.sh
+EXIT_CODES = {"STABLE": 0, "DEGRADED": 1, "CRITICAL": 2}
+
+# Prometheus text exposition format
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class Histogram:
+    """Latency counts per bucket, with their sum and total."""
+
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, seconds):
+        self.counts[bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        self.sum += seconds
+        self.count += 1
+
+
+# Histograms by name; the server observes from its worker threads
+_lock = threading.Lock()
+_queries = {}
+_calls = {}
+_commands = {}
+
+
+def _observe(histograms, name, seconds):
+    with _lock:
+        histogram = histograms.get(name)
+        if histogram is None:
+            histogram = histograms[name] = Histogram()
+        histogram.observe(seconds)
+
+
+def observe_query(name, seconds):
+    """Record one statement's latency under the function that issued it."""
+    _observe(_queries, name, seconds)
+    latency.record("query", name, seconds)
+
+
+def observe_call(name, seconds):
+    """Record one call of a library entry point, all of its statements together."""
+    _observe(_calls, name, seconds)
+    latency.record("call", name, seconds)
+
+
+def observe_command(name, seconds):
+    """Record one command's (or API route's) latency."""
+    _observe(_commands, name, seconds)
+    latency.record("command", name, seconds)
+
+
+def collect_snapshot():
+    """
+    Read every health gauge once.
+
+    The version comes from the health memo, read first: if a mutation
+    commits while the rest is read, the snapshot is stamped older than
+    what it shows and is simply read again.
+
+    Returns:
+        dict: version, day, state, unconfessed, work (state, diagnosis),
+              counters (signal, noise, debt), today (or None)
+    """
+    from logos.cli import health_snapshot
+    from logos.agenda import calculate_work_health
+    from logos.mutations import fetch_today_state
+    from logos.db import fetch_work_counters
+
+    day = date.today()
+    version, state, _, unconfessed = health_snapshot()
+    return {
+        "version": version,
+        "day": day,
+        "state": state,
+        "unconfessed": unconfessed,
+        "work": calculate_work_health(),
+        "counters": fetch_work_counters(),
+        "today": fetch_today_state(),
+    }
+
+
+class SnapshotCache:
+    """
+    The latest snapshot, reused while its (version, date) is current.
+
+    The owner reports each committed version with changed(); without one
+    (nothing listening, or the listener dropped) every get() reads afresh.
+    Concurrent scrapes of a stale snapshot wait for one read.
+    """
+
+    def __init__(self, load=collect_snapshot):
+        self.load = load
+        self.version = None
+        self.snapshot = None
+        self._lock = threading.Lock()
+
+    def changed(self, version):
+        self.version = version
+
+    def _current(self):
+        snapshot = self.snapshot
+        return (snapshot is not None and self.version is not None
+                and snapshot["version"] >= self.version
+                and snapshot["day"] == date.today())
+
+    def get(self):
+        with self._lock:
+            if not self._current():
+                self.snapshot = self.load()
+            return self.snapshot
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _gauge(lines, name, help_text, samples):
+    """samples: [(labels dict, value)]"""
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} gauge")
+    for labels, value in samples:
+        if labels:
+            pairs = ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items())
+            lines.append(f"{name}{{{pairs}}} {value}")
+        else:
+            lines.append(f"{name} {value}")
+
+
+def _histograms(lines, name, help_text, label, histograms):
+    with _lock:
+        rows = [(key, list(h.counts), h.sum, h.count) for key, h in sorted(histograms.items())]
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} histogram")
+    for key, counts, total, count in rows:
+        tag = f'{label}="{_escape(key)}"'
+        cumulative = 0
+        for bound, n in zip(LATENCY_BUCKETS, counts):
+            cumulative += n
+            lines.append(f'{name}_bucket{{{tag},le="{bound}"}} {cumulative}')
+        lines.append(f'{name}_bucket{{{tag},le="+Inf"}} {count}')
+        lines.append(f"{name}_sum{{{tag}}} {total:.6f}")
+        lines.append(f"{name}_count{{{tag}}} {count}")
+
+
+def _snapshot_gauges(lines, snapshot):
+    _gauge(lines, "logos_data_version", "Data version the health gauges were read at.",
+           [({}, snapshot["version"])])
+    _gauge(lines, "logos_alignment_state", "System alignment state (1 for the current state).",
+           [({"state": s}, int(s == snapshot["state"])) for s in STATES])
+    _gauge(lines, "logos_health_exit_code", "Exit code of `logos health` (0 stable, 1 degraded, 2 critical).",
+           [({}, EXIT_CODES.get(snapshot["state"], 2))])
+    _gauge(lines, "logos_unconfessed_sins", "Sins not yet absolved.",
+           [({}, snapshot["unconfessed"])])
+
+    work, counters = snapshot["work"], snapshot["counters"]
+    _gauge(lines, "logos_work_state", "Work health state (1 for the current state).",
+           [({"state": s}, int(s == work["state"])) for s in STATES])
+    _gauge(lines, "logos_work_signal_minutes", "Deep work minutes today.",
+           [({}, counters["signal"])])
+    _gauge(lines, "logos_work_noise_minutes", "Wasted shallow work minutes today.",
+           [({}, counters["noise"])])
+    if counters["noise"]:
+        # Undefined without noise: the sample is absent rather than invented
+        _gauge(lines, "logos_work_signal_noise_ratio", "Deep work minutes per wasted minute today.",
+               [({}, f"{counters['signal'] / counters['noise']:.4f}")])
+    _gauge(lines, "logos_entropic_debt", "Abandoned commitments not yet processed.",
+           [({}, counters["debt"])])
+
+    today = snapshot["today"]
+    _gauge(lines, "logos_today_recorded", "Whether today has a daily state yet.",
+           [({}, int(today is not None))])
+    if today is None:
+        return
+    _gauge(lines, "logos_today_prayer_minutes", "Prayer minutes today.",
+           [({}, today["prayer_minutes"])])
+    _gauge(lines, "logos_today_prayer_interruptions", "Prayer interruptions today.",
+           [({}, today["prayer_interruptions"])])
+    _gauge(lines, "logos_today_prayed", "Whether prayer is recorded today.",
+           [({}, int(today["prayed"]))])
+    _gauge(lines, "logos_today_reading_minutes", "Reading minutes today.",
+           [({}, today["reading_minutes"])])
+    _gauge(lines, "logos_today_fasted", "Whether today's fast is kept.",
+           [({}, int(today["fasted"]))])
+    _gauge(lines, "logos_today_screen_time_minutes", "Screen time today recorded without a category.",
+           [({}, today["screen_time_minutes"])])
+    _gauge(lines, "logos_today_screen_time_category_minutes", "Screen time today by category.",
+           [({"category": c}, today[f"screen_time_{c}"]) for c in SCREEN_TIME_CATEGORIES])
+
+
+def render(snapshot):
+    """
+    The exposition text: health gauges (when the snapshot could be read)
+    and every latency histogram observed by this process.
+
+    Args:
+        snapshot: From SnapshotCache.get(), or None if the read failed
+    """
+    lines = []
+    _gauge(lines, "logos_health_up", "Whether the health snapshot could be read.",
+           [({}, int(snapshot is not None))])
+    if snapshot is not None:
+        _snapshot_gauges(lines, snapshot)
+    _histograms(lines, "logos_command_duration_seconds",
+                "Command (API route) latency.", "command", _commands)
+    _histograms(lines, "logos_call_duration_seconds",
+                "Library entry point latency, one observation per call.", "call", _calls)
+    _histograms(lines, "logos_query_duration_seconds",
+                "SQL statement latency, by the function that issued it.", "query", _queries)
+    return "\n".join(lines) + "\n"
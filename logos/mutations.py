@@ -12,25 +12,22 @@ All mutations respect temporal constraints and append-only rules.
 """
 
 import sys
+import time
 from datetime import date
-from logos.db import get_connection
+from logos.db import get_connection, unconfessed_sql, bump_data_version
+from logos.metrics import observe_call
+from logos.lineage import record_lineage
+from logos.transitions import record_transition
+from logos.baseline import fold_completed_days
+from logos.constants import PASSIONS, FAST_BREAK_REASONS
 import psycopg2
 
 
-# Canonical list of the Eight Passions (Evagrius of Pontus)
-PASSIONS = [
-    "Gluttony",
-    "Lust", 
-    "Avarice",
-    "Sadness",
-    "Anger",
-    "Acedia",
-    "Vainglory",
-    "Pride"
-]
+# Sins linked per transaction when recording absolution
+ABSOLUTION_BATCH = 1000
 
-# Valid fast break reasons (from migrate_v4.py)
-FAST_BREAK_REASONS = ["temptation", "necessity", "charity", "ignorance", "none"]
+# Advisory lock namespace held while a confession is staging
+ABSOLUTION_LOCK = 7015
 
 
 def _get_passion_id(cur, passion_name):
@@ -47,6 +44,25 @@ def _get_passion_id(cur, passion_name):
         return None
 
 
+# The sin insert, the unconfessed count and list (scripts/check_plans.py plans them)
+HAMARTIA_INSERT_SQL = """
+    INSERT INTO hamartia_log (date, description, passions, passion_id, context, parent_sin_id, confessed)
+    VALUES (CURRENT_DATE, %s, %s, %s, %s, %s, FALSE)
+    RETURNING id, created_at
+"""
+
+UNCONFESSED_COUNT_SQL = f"""
+    SELECT COUNT(*) FROM hamartia_log WHERE {unconfessed_sql()}
+"""
+
+UNCONFESSED_SINS_SQL = f"""
+    SELECT id, date, description, passions
+    FROM hamartia_log
+    WHERE {unconfessed_sql()}
+    ORDER BY date ASC, id ASC
+"""
+
+
 def log_hamartia(passion, description, context=None, parent_sin_id=None):
     """
     Append a sin to the hamartia_log.
@@ -63,23 +79,25 @@ def log_hamartia(passion, description, context=None, parent_sin_id=None):
     Returns:
         int: New unconfessed count
     """
+    started = time.perf_counter()
     conn = get_connection()
     try:
-        cur = conn.cursor()
+        cur = conn.cursor(tag="mutations.log_hamartia")
         
         # Attempt to resolve passion to FK (Orthodox)
         passion_id = _get_passion_id(cur, passion)
         
         # Insert the hamartia record (with both old string and new FK for compatibility)
-        cur.execute("""
-            INSERT INTO hamartia_log (date, description, passions, passion_id, context, parent_sin_id, confessed)
-            VALUES (CURRENT_DATE, %s, %s, %s, %s, %s, FALSE)
-        """, (description, passion, passion_id, context, parent_sin_id))
+        cur.execute(HAMARTIA_INSERT_SQL, (description, passion, passion_id, context, parent_sin_id))
+        sin_id, created_at = cur.fetchone()
+        
+        # Maintain derived structures (same transaction)
+        record_lineage(cur, sin_id, parent_sin_id)
+        record_transition(cur, sin_id, passion, created_at)
+        bump_data_version(cur)
         
         # Get new unconfessed count
-        cur.execute("""
-            SELECT COUNT(*) FROM hamartia_log WHERE confessed = FALSE
-        """)
+        cur.execute(UNCONFESSED_COUNT_SQL)
         unconfessed_count = cur.fetchone()[0]
         
         conn.commit()
@@ -92,6 +110,7 @@ def log_hamartia(passion, description, context=None, parent_sin_id=None):
     finally:
         cur.close()
         conn.close()
+        observe_call("mutations.log_hamartia", time.perf_counter() - started)
 
 
 def update_daily_state(prayer_minutes=None, prayer_interruptions=None,
@@ -121,9 +140,10 @@ def update_daily_state(prayer_minutes=None, prayer_interruptions=None,
         fast_break_reason: Why fast was broken (temptation/necessity/charity/ignorance/none)
         prayed: Boolean - set prayer completion status
     """
+    started = time.perf_counter()
     conn = get_connection()
     try:
-        cur = conn.cursor()
+        cur = conn.cursor(tag="mutations.update_daily_state")
         
         # Ensure row exists for today
         cur.execute("""
@@ -186,6 +206,10 @@ def update_daily_state(prayer_minutes=None, prayer_interruptions=None,
             """
             cur.execute(query, params)
         
+        # Fold any completed days into the personal baseline (same transaction)
+        fold_completed_days(cur, "daily_state")
+        bump_data_version(cur)
+        
         conn.commit()
         
     except psycopg2.Error as e:
@@ -195,6 +219,7 @@ def update_daily_state(prayer_minutes=None, prayer_interruptions=None,
     finally:
         cur.close()
         conn.close()
+        observe_call("mutations.update_daily_state", time.perf_counter() - started)
 
 
 def fetch_unconfessed_sins():
@@ -206,13 +231,8 @@ def fetch_unconfessed_sins():
     """
     conn = get_connection()
     try:
-        cur = conn.cursor()
-        cur.execute("""
-            SELECT id, date, description, passions
-            FROM hamartia_log
-            WHERE confessed = FALSE
-            ORDER BY date ASC, id ASC
-        """)
+        cur = conn.cursor(tag="mutations.fetch_unconfessed_sins")
+        cur.execute(UNCONFESSED_SINS_SQL)
         
         rows = cur.fetchall()
         return [
@@ -233,7 +253,258 @@ def fetch_unconfessed_sins():
         conn.close()
 
 
-def record_sacrament(spiritual_father, penance_assigned=None, notes=None, sin_ids=None):
+def _unconfessed_filter(passion=None, start=None, end=None, through_id=None):
+    """
+    WHERE clause selecting unconfessed sins, optionally narrowed.
+    
+    Sins already linked to a confession that is still staging are not
+    offered again. Every combination is served by a partial index on unconfessed sins
+    ((date, id) or (passions, date, id)).
+    
+    Returns:
+        tuple: (sql, params)
+    """
+    conditions = ["confessed = FALSE"]
+    params = []
+    if passion is not None:
+        if passion not in PASSIONS:
+            raise ValueError(f"Invalid passion. Must be one of: {', '.join(PASSIONS)}")
+        conditions.append("passions = %s")
+        params.append(passion)
+    if start is not None:
+        conditions.append("date >= %s")
+        params.append(start)
+    if end is not None:
+        conditions.append("date <= %s")
+        params.append(end)
+    if through_id is not None:
+        conditions.append("id <= %s")
+        params.append(through_id)
+    return " AND ".join(conditions), params
+
+
+def unconfessed_count_query(passion=None, start=None, end=None):
+    """The statement behind count_unconfessed_sins: (sql, params)."""
+    where, params = _unconfessed_filter(passion, start, end)
+    return f"""
+        SELECT COUNT(*), MAX(id) FROM hamartia_log WHERE {where}
+    """, params
+
+
+def unconfessed_page_query(after=None, limit=50, passion=None, start=None, end=None, through_id=None):
+    """The statement behind fetch_unconfessed_page: (sql, params)."""
+    where, params = _unconfessed_filter(passion, start, end, through_id)
+    if after is not None:
+        where += " AND (date, id) > (%s, %s)"
+        params.extend(after)
+    return f"""
+        SELECT id, date, description, passions
+        FROM hamartia_log
+        WHERE {where}
+        ORDER BY date ASC, id ASC
+        LIMIT %s
+    """, params + [limit]
+
+
+def count_unconfessed_sins(passion=None, start=None, end=None):
+    """
+    Count unconfessed sins matching the filters.
+    
+    Returns:
+        tuple: (count, max_id). max_id pins the set shown to the user, so
+               sins logged while they confess are not absolved unseen.
+    """
+    query, params = unconfessed_count_query(passion, start, end)
+    conn = get_connection()
+    try:
+        cur = conn.cursor(tag="mutations.count_unconfessed_sins")
+        cur.execute(query, params)
+        return cur.fetchone()
+        
+    except psycopg2.Error as e:
+        print(f"error: failed to count unconfessed sins: {e}", flush=True)
+        raise SystemExit(1)
+    finally:
+        cur.close()
+        conn.close()
+
+
+def fetch_unconfessed_page(after=None, limit=50, passion=None, start=None, end=None, through_id=None):
+    """
+    Retrieve one page of unconfessed sins, oldest first.
+    
+    Keyset pagination: the next page starts strictly after the (date, id)
+    of the last row, so each page is one index range scan.
+    
+    Args:
+        after: (date, id) of the last row of the previous page, or None
+        limit: Page size
+        passion, start, end, through_id: Filters (see count_unconfessed_sins)
+        
+    Returns:
+        list: List of dicts with id, date, description, passions
+    """
+    query, params = unconfessed_page_query(after, limit, passion, start, end, through_id)
+    
+    conn = get_connection()
+    try:
+        cur = conn.cursor(tag="mutations.fetch_unconfessed_page")
+        cur.execute(query, params)
+        
+        return [
+            {
+                "id": row[0],
+                "date": row[1],
+                "description": row[2],
+                "passions": row[3]
+            }
+            for row in cur.fetchall()
+        ]
+        
+    except psycopg2.Error as e:
+        print(f"error: failed to fetch unconfessed sins: {e}", flush=True)
+        raise SystemExit(1)
+    finally:
+        cur.close()
+        conn.close()
+
+
+# Absolution of listed sins, one batch of ids per statement
+ABSOLVE_SINS_SQL = """
+    UPDATE hamartia_log
+    SET confessed = TRUE, 
+        confessed_at = %s,
+        absolution_id = %s
+    WHERE id = ANY(%s) AND confessed = FALSE
+"""
+
+
+def absolve_batch_query(confessed_at, confession_id, batch_size, passion=None, start=None,
+                        end=None, through_id=None):
+    """The filtered batch UPDATE behind record_sacrament: (sql, params)."""
+    where, params = _unconfessed_filter(passion, start, end, through_id)
+    return f"""
+        UPDATE hamartia_log
+        SET confessed = TRUE, 
+            confessed_at = %s,
+            absolution_id = %s
+        WHERE id IN (
+            SELECT id FROM hamartia_log
+            WHERE {where}
+            ORDER BY id
+            LIMIT %s
+            FOR UPDATE
+        )
+    """, [confessed_at, confession_id] + params + [batch_size]
+
+
+def _absolve_scope(conn, cur, confession_id, confessed_at, sin_ids, passion, start, end,
+                   through_id, batch_size, progress=None):
+    """
+    Link a confession's unconfessed sins to it, one committed batch at a time.
+    
+    Sins an interrupted run already linked are confessed, so they are
+    skipped; calling this again finishes the same scope.
+    
+    Returns:
+        int: Sins linked by this call
+    """
+    count = 0
+    if sin_ids:
+        for i in range(0, len(sin_ids), batch_size):
+            cur.execute(ABSOLVE_SINS_SQL, (confessed_at, confession_id, sin_ids[i:i + batch_size]))
+            count += cur.rowcount
+            conn.commit()
+            if progress:
+                progress(count)
+        return count
+
+    # Unconfessed sins matching the filters (all, if none)
+    query, params = absolve_batch_query(confessed_at, confession_id, batch_size,
+                                        passion, start, end, through_id)
+    while True:
+        cur.execute(query, params)
+        linked = cur.rowcount
+        conn.commit()
+        if linked == 0:
+            return count
+        count += linked
+        if progress:
+            progress(count)
+
+
+def _recover_staged_confessions(conn, batch_size=ABSOLUTION_BATCH):
+    """
+    Finish confessions left 'staging' by an interrupted record_sacrament.
+    
+    A staging confession whose advisory lock is free has no live writer.
+    Its recorded scope is linked to the end before it is completed, so
+    it absolves exactly what the uninterrupted run would have. One staged
+    before scopes were recorded cannot be finished honestly: it stays
+    staging (its sins still count as unconfessed) and is reported.
+    Nothing is unlinked or deleted: confession is the only transition.
+    
+    Returns:
+        tuple: (resumed, stranded), lists of confession IDs
+    """
+    cur = conn.cursor(tag="mutations._recover_staged_confessions")
+    resumed = []
+    stranded = []
+    try:
+        cur.execute("""
+            SELECT id, created_at, absolve_sin_ids, absolve_passion,
+                   absolve_start, absolve_end, absolve_through_id
+            FROM confession_log
+            WHERE status = 'staging'
+            ORDER BY id
+        """)
+        staged = cur.fetchall()
+        conn.commit()
+        for confession_id, confessed_at, sin_ids, passion, start, end, through_id in staged:
+            cur.execute("SELECT pg_try_advisory_lock(%s, %s)", (ABSOLUTION_LOCK, confession_id))
+            if not cur.fetchone()[0]:
+                conn.commit()
+                continue  # Still being recorded by another session
+            try:
+                if through_id is None:
+                    stranded.append(confession_id)
+                    continue
+                _absolve_scope(conn, cur, confession_id, confessed_at, sin_ids,
+                               passion, start, end, through_id, batch_size)
+                cur.execute("""
+                    UPDATE confession_log SET status = 'complete'
+                    WHERE id = %s AND status = 'staging'
+                """, (confession_id,))
+                bump_data_version(cur)
+                conn.commit()
+                resumed.append(confession_id)
+            finally:
+                _release_confession_lock(conn, cur, confession_id)
+    finally:
+        cur.close()
+    return resumed, stranded
+
+
+def _release_confession_lock(conn, cur, confession_id):
+    """
+    Release record_sacrament's session-level lock, however the run ended.
+    
+    The lock outlives transactions (it marks a live writer across the
+    batches), so a pooled or session connection would otherwise keep it.
+    """
+    try:
+        conn.rollback()
+        cur.execute("SELECT pg_advisory_unlock(%s, %s)", (ABSOLUTION_LOCK, confession_id))
+        conn.commit()
+    except psycopg2.Error as e:
+        # Session locks are released with the connection that holds them
+        print(f"warning: confession lock not released until disconnect: {e}",
+              file=sys.stderr, flush=True)
+
+
+def record_sacrament(spiritual_father, penance_assigned=None, notes=None, sin_ids=None,
+                     passion=None, start=None, end=None, through_id=None,
+                     batch_size=ABSOLUTION_BATCH, progress=None):
     """
     Record the EVENT of confession (The Sacrament).
     
@@ -243,49 +514,65 @@ def record_sacrament(spiritual_father, penance_assigned=None, notes=None, sin_id
     
     "Whose sins you forgive are forgiven them." (John 20:23)
     
+    The event is created with status 'staging' and sins are linked in
+    transactions of at most batch_size rows, so concurrent writers never
+    wait on the whole backlog. Readers treat staged sins as unconfessed
+    until the final single-row commit marks the confession 'complete'.
+    The scope (sin_ids, or the filters pinned by through_id) is stored
+    on the confession, so an interrupted run is finished, over that
+    scope and not this call's, by the next call.
+    
     Args:
         spiritual_father: Name of the priest who heard the confession
         penance_assigned: The penance given (optional but recommended)
         notes: Any notes about the confession
-        sin_ids: List of hamartia_log IDs to absolve (if None, absolves all)
+        sin_ids: List of hamartia_log IDs to absolve (if None, absolves by filter)
+        passion, start, end, through_id: Server-side filters used when sin_ids
+            is None (none given: absolves all unconfessed sins). through_id
+            defaults to the newest sin when the confession is staged.
+        batch_size: Sins linked per transaction
+        progress: Optional callable receiving the running count after each batch
         
     Returns:
-        dict: {confession_id, count_absolved}
+        dict: {confession_id, count_absolved, resumed, stranded} (resumed:
+              earlier interrupted confessions finished first; stranded: ones
+              staged without a recorded scope, left staging)
     """
     conn = get_connection()
+    cur = conn.cursor(tag="mutations.record_sacrament")
+    confession_id = None
     try:
-        cur = conn.cursor()
+        resumed, stranded = _recover_staged_confessions(conn, batch_size)
+        
+        # 1. Create the Sacramental Event (staging until every sin is linked),
+        #    with its scope pinned so sins logged meanwhile are not absolved
+        if through_id is None:
+            cur.execute("SELECT COALESCE(MAX(id), 0) FROM hamartia_log")
+            through_id = cur.fetchone()[0]
+        cur.execute("""
+            INSERT INTO confession_log (date, spiritual_father, penance_assigned, notes, status,
+                                        absolve_sin_ids, absolve_passion, absolve_start,
+                                        absolve_end, absolve_through_id)
+            VALUES (CURRENT_DATE, %s, %s, %s, 'staging', %s, %s, %s, %s, %s)
+            RETURNING id, created_at
+        """, (spiritual_father, penance_assigned, notes, sin_ids or None,
+              passion, start, end, through_id))
+        confession_id, confessed_at = cur.fetchone()
+        cur.execute("SELECT pg_advisory_lock(%s, %s)", (ABSOLUTION_LOCK, confession_id))
+        conn.commit()
+        
+        # 2. Absolve the Sins (Link to the Event), one bounded batch at a time
+        count = _absolve_scope(conn, cur, confession_id, confessed_at, sin_ids, passion,
+                               start, end, through_id, batch_size, progress)
         
-        # 1. Create the Sacramental Event
+        # 3. Complete the Sacrament: every staged sin becomes confessed at once
         cur.execute("""
-            INSERT INTO confession_log (date, spiritual_father, penance_assigned, notes)
-            VALUES (CURRENT_DATE, %s, %s, %s)
-            RETURNING id
-        """, (spiritual_father, penance_assigned, notes))
-        confession_id = cur.fetchone()[0]
-        
-        # 2. Absolve the Sins (Link to the Event)
-        if sin_ids:
-            cur.execute("""
-                UPDATE hamartia_log
-                SET confessed = TRUE, 
-                    confessed_at = NOW(),
-                    absolution_id = %s
-                WHERE id = ANY(%s) AND confessed = FALSE
-            """, (confession_id, sin_ids))
-        else:
-            # Absolve all unconfessed sins
-            cur.execute("""
-                UPDATE hamartia_log
-                SET confessed = TRUE, 
-                    confessed_at = NOW(),
-                    absolution_id = %s
-                WHERE confessed = FALSE
-            """, (confession_id,))
-        
-        count = cur.rowcount
+            UPDATE confession_log SET status = 'complete' WHERE id = %s
+        """, (confession_id,))
+        bump_data_version(cur)
         conn.commit()
-        return {"confession_id": confession_id, "count_absolved": count}
+        return {"confession_id": confession_id, "count_absolved": count,
+                "resumed": resumed, "stranded": stranded}
         
     except psycopg2.Error as e:
         conn.rollback()
@@ -293,6 +580,8 @@ def record_sacrament(spiritual_father, penance_assigned=None, notes=None, sin_id
         raise SystemExit(1)
 
     finally:
+        if confession_id is not None:
+            _release_confession_lock(conn, cur, confession_id)
         cur.close()
         conn.close()
 
@@ -312,11 +601,11 @@ def complete_penance(confession_id):
     """
     conn = get_connection()
     try:
-        cur = conn.cursor()
+        cur = conn.cursor(tag="mutations.complete_penance")
         
         cur.execute("""
             UPDATE confession_log
-            SET penance_completed = TRUE
+            SET penance_completed = TRUE, penance_completed_at = NOW()
             WHERE id = %s AND penance_completed = FALSE
             RETURNING penance_assigned
         """, (confession_id,))
@@ -325,6 +614,7 @@ def complete_penance(confession_id):
         if not row:
             raise ValueError(f"Confession {confession_id} not found or penance already complete")
         
+        bump_data_version(cur)
         conn.commit()
         return row[0]
         
@@ -349,7 +639,7 @@ def fetch_today_state():
     """
     conn = get_connection()
     try:
-        cur = conn.cursor()
+        cur = conn.cursor(tag="mutations.fetch_today_state")
         cur.execute("""
             SELECT prayer_minutes, reading_minutes, screen_time_minutes,
                    fasted, prayed,
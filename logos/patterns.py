@@ -5,7 +5,103 @@ Pattern Detection for Spiritual Direction.
 The system should surface patterns the nous cannot see.
 """
 
-from logos.db import get_connection
+from collections import deque
+from datetime import timedelta
+from logos.db import get_connection, unconfessed_sql
+from logos.constants import HORIZON_UNCONFESSED, HORIZON_DAYS, HORIZONS, ROLLUPS
+
+
+# Same buckets as the single-horizon report
+TIME_PERIODS = (
+    ("late_night", range(0, 6)),
+    ("morning", range(6, 12)),
+    ("afternoon", range(12, 18)),
+    ("evening", range(18, 24)),
+)
+
+# Causal chain window (passion A -> passion B)
+CHAIN_WINDOW = timedelta(hours=24)
+
+# The unconfessed report, in order (scripts/check_plans.py plans these)
+
+# 1. Dominant passion
+DOMINANT_PASSION_SQL = f"""
+    SELECT po.name, COUNT(*) as count
+    FROM hamartia_log hl
+    JOIN passion_ontology po ON hl.passion_id = po.id
+    WHERE {unconfessed_sql("hl")}
+    GROUP BY po.name
+    ORDER BY count DESC
+    LIMIT 1
+"""
+
+# 2. Time-of-day pattern
+PEAK_TIME_SQL = f"""
+    SELECT 
+        CASE 
+            WHEN EXTRACT(HOUR FROM created_at) BETWEEN 0 AND 5 THEN 'late_night'
+            WHEN EXTRACT(HOUR FROM created_at) BETWEEN 6 AND 11 THEN 'morning'
+            WHEN EXTRACT(HOUR FROM created_at) BETWEEN 12 AND 17 THEN 'afternoon'
+            ELSE 'evening'
+        END as time_period,
+        COUNT(*) as count
+    FROM hamartia_log
+    WHERE {unconfessed_sql()}
+    GROUP BY time_period
+    ORDER BY count DESC
+    LIMIT 1
+"""
+
+# 3. Causal chains (passion A -> passion B within 24h)
+CAUSAL_CHAIN_SQL = f"""
+    SELECT 
+        po1.name as first,
+        po2.name as second,
+        COUNT(*) as occurrences
+    FROM hamartia_log hl1
+    JOIN hamartia_log hl2 ON 
+        hl2.created_at > hl1.created_at AND
+        hl2.created_at < hl1.created_at + INTERVAL '24 hours'
+    JOIN passion_ontology po1 ON hl1.passion_id = po1.id
+    JOIN passion_ontology po2 ON hl2.passion_id = po2.id
+    WHERE {unconfessed_sql("hl1")} AND {unconfessed_sql("hl2")}
+        AND po1.name != po2.name
+    GROUP BY po1.name, po2.name
+    HAVING COUNT(*) >= 2
+    ORDER BY occurrences DESC
+    LIMIT 1
+"""
+
+# 4. Correlation with screen time
+SCREEN_CORRELATION_SQL = f"""
+    SELECT 
+        ds.screen_time_entertainment > 60 as high_entertainment,
+        COUNT(hl.id) as sin_count
+    FROM daily_state ds
+    LEFT JOIN hamartia_log hl ON hl.date = ds.date AND {unconfessed_sql("hl")}
+    WHERE ds.date >= CURRENT_DATE - INTERVAL '7 days'
+    GROUP BY high_entertainment
+"""
+
+
+def passion_join(rollup, alias="po", sin_alias="hl", outer=False):
+    """
+    FROM-clause fragment resolving a sin to the passion it is reported as.
+
+    Both forms join exactly once against passion_ontology; "root" adds a
+    single join against the maintained passion_closure table.
+    """
+    join = "LEFT JOIN" if outer else "JOIN"
+    if rollup == "root":
+        return f"""
+            {join} passion_closure pc
+                ON pc.descendant_id = {sin_alias}.passion_id AND pc.ancestor_is_root
+            {join} passion_ontology {alias} ON {alias}.id = pc.ancestor_id"""
+    if rollup == "none":
+        return f"""
+            {join} passion_ontology {alias} ON {alias}.id = {sin_alias}.passion_id"""
+    raise ValueError(f"Invalid rollup. Must be one of: {', '.join(ROLLUPS)}")
+
 
 def analyze_hamartia_patterns(conn=None):
     """
@@ -23,69 +119,22 @@ def analyze_hamartia_patterns(conn=None):
         should_close = True
         
     try:
-        cur = conn.cursor()
+        cur = conn.cursor(tag="patterns.analyze_hamartia_patterns")
         
         # 1. Dominant passion
-        cur.execute("""
-            SELECT po.name, COUNT(*) as count
-            FROM hamartia_log hl
-            JOIN passion_ontology po ON hl.passion_id = po.id
-            WHERE hl.confessed = FALSE
-            GROUP BY po.name
-            ORDER BY count DESC
-            LIMIT 1
-        """)
+        cur.execute(DOMINANT_PASSION_SQL)
         dominant = cur.fetchone()
         
         # 2. Time-of-day pattern
-        cur.execute("""
-            SELECT 
-                CASE 
-                    WHEN EXTRACT(HOUR FROM created_at) BETWEEN 0 AND 5 THEN 'late_night'
-                    WHEN EXTRACT(HOUR FROM created_at) BETWEEN 6 AND 11 THEN 'morning'
-                    WHEN EXTRACT(HOUR FROM created_at) BETWEEN 12 AND 17 THEN 'afternoon'
-                    ELSE 'evening'
-                END as time_period,
-                COUNT(*) as count
-            FROM hamartia_log
-            WHERE confessed = FALSE
-            GROUP BY time_period
-            ORDER BY count DESC
-            LIMIT 1
-        """)
+        cur.execute(PEAK_TIME_SQL)
         peak_time = cur.fetchone()
         
         # 3. Causal chains (passion A -> passion B within 24h)
-        cur.execute("""
-            SELECT 
-                po1.name as first,
-                po2.name as second,
-                COUNT(*) as occurrences
-            FROM hamartia_log hl1
-            JOIN hamartia_log hl2 ON 
-                hl2.created_at > hl1.created_at AND
-                hl2.created_at < hl1.created_at + INTERVAL '24 hours'
-            JOIN passion_ontology po1 ON hl1.passion_id = po1.id
-            JOIN passion_ontology po2 ON hl2.passion_id = po2.id
-            WHERE hl1.confessed = FALSE AND hl2.confessed = FALSE
-                AND po1.name != po2.name
-            GROUP BY po1.name, po2.name
-            HAVING COUNT(*) >= 2
-            ORDER BY occurrences DESC
-            LIMIT 1
-        """)
+        cur.execute(CAUSAL_CHAIN_SQL)
         chain = cur.fetchone()
         
         # 4. Correlation with screen time
-        cur.execute("""
-            SELECT 
-                ds.screen_time_entertainment > 60 as high_entertainment,
-                COUNT(hl.id) as sin_count
-            FROM daily_state ds
-            LEFT JOIN hamartia_log hl ON hl.date = ds.date AND hl.confessed = FALSE
-            WHERE ds.date >= CURRENT_DATE - INTERVAL '7 days'
-            GROUP BY high_entertainment
-        """)
+        cur.execute(SCREEN_CORRELATION_SQL)
         screen_correlation_data = dict(cur.fetchall())
         # Check if high entertainment correlates with more sin
         has_correlation = screen_correlation_data.get(True, 0) > screen_correlation_data.get(False, 0)
@@ -102,3 +151,134 @@ def analyze_hamartia_patterns(conn=None):
         if should_close:
             cur.close()
             conn.close()
+
+
+def _new_horizon():
+    return {"sins": 0, "passions": {}, "hourly": [0] * 24, "pairs": {}}
+
+
+def _summarize_horizon(acc):
+    """Reduce a horizon accumulator to the report fields."""
+    dominant = None
+    if acc["passions"]:
+        dominant = max(acc["passions"].items(), key=lambda kv: kv[1])
+
+    peak_time = None
+    if acc["sins"]:
+        period_counts = [
+            (name, sum(acc["hourly"][h] for h in hours))
+            for name, hours in TIME_PERIODS
+        ]
+        peak_time = max(period_counts, key=lambda kv: kv[1])[0]
+
+    chain = None
+    if acc["pairs"]:
+        (first, second), count = max(acc["pairs"].items(), key=lambda kv: kv[1])
+        if count >= 2:
+            chain = f"{first} -> {second} ({count}x)"
+
+    return {
+        "sins": acc["sins"],
+        "dominant_passion": dominant[0] if dominant else None,
+        "dominant_count": dominant[1] if dominant else 0,
+        "hourly": acc["hourly"],
+        "peak_time": peak_time,
+        "causal_chain": chain,
+        "chain_pairs": sum(acc["pairs"].values()),
+    }
+
+
+def fold_pattern_horizons(rows):
+    """
+    Compute the pattern report for every horizon in one ordered pass.
+
+    Args:
+        rows: Iterable of (created_at, passion, membership) ordered by
+              created_at, where membership is a tuple of booleans aligned
+              with HORIZONS (is the sin inside each horizon).
+
+    Returns:
+        dict: {horizon: report} for every horizon in HORIZONS
+    """
+    accs = {h: _new_horizon() for h in HORIZONS}
+    recent = deque()  # (created_at, passion, membership) within CHAIN_WINDOW
+
+    for created_at, passion, membership in rows:
+        while recent and recent[0][0] <= created_at - CHAIN_WINDOW:
+            recent.popleft()
+
+        for i, horizon in enumerate(HORIZONS):
+            if not membership[i]:
+                continue
+            acc = accs[horizon]
+            acc["sins"] += 1
+            acc["passions"][passion] = acc["passions"].get(passion, 0) + 1
+            acc["hourly"][created_at.hour] += 1
+
+        # Chains: an earlier sin of another passion within the window,
+        # counted in every horizon that contains both sins
+        for prev_at, prev_passion, prev_membership in recent:
+            if prev_at >= created_at or prev_passion == passion:
+                continue
+            pair = (prev_passion, passion)
+            for i, horizon in enumerate(HORIZONS):
+                if membership[i] and prev_membership[i]:
+                    pairs = accs[horizon]["pairs"]
+                    pairs[pair] = pairs.get(pair, 0) + 1
+
+        recent.append((created_at, passion, membership))
+
+    return {h: _summarize_horizon(accs[h]) for h in HORIZONS}
+
+
+def pattern_horizons_sql(rollup="none"):
+    """The single ordered scan behind analyze_pattern_horizons."""
+    day_flags = ",\n".join(
+        f"hl.created_at >= NOW() - INTERVAL '{days} days'" for days in HORIZON_DAYS
+    )
+    return f"""
+        SELECT
+            hl.created_at,
+            po.name,
+            {unconfessed_sql("hl")},
+            {day_flags}
+        FROM hamartia_log hl
+        {passion_join(rollup)}
+        WHERE {unconfessed_sql("hl")}
+           OR hl.created_at >= NOW() - INTERVAL '{max(HORIZON_DAYS)} days'
+        ORDER BY hl.created_at ASC, hl.id ASC
+    """
+
+
+def analyze_pattern_horizons(conn=None, rollup="none"):
+    """
+    Pattern report for every horizon (unconfessed, 7, 30, 90, 365 days).
+
+    One ordered scan of hamartia_log; horizon membership is computed
+    by the database so the fold needs no clock of its own.
+
+    Args:
+        conn: Optional database connection (will create new if None)
+        rollup: "none" (each passion) or "root" (root passions)
+
+    Returns:
+        dict: {horizon: report}, see fold_pattern_horizons
+    """
+    query = pattern_horizons_sql(rollup)
+
+    should_close = False
+    if conn is None:
+        conn = get_connection()
+        should_close = True
+
+    try:
+        cur = conn.cursor(tag="patterns.analyze_pattern_horizons")
+        cur.execute(query)
+        return fold_pattern_horizons(
+            (row[0], row[1], tuple(row[2:])) for row in cur
+        )
+
+    finally:
+        cur.close()
+        if should_close:
+            conn.close()
@@ -0,0 +1,287 @@
+"""
+Query Plan Baselines.
+
+"Ponder the path of thy feet, and let all thy ways be established."
+(Proverbs 4:26)
+
+The hot statements are declared in HOT_STATEMENTS below: the reads
+behind status, the prompt, confession and the pattern report, and the
+writes of logging a sin and of absolution. Each is planned with EXPLAIN
+against a large dataset and reduced to its shape: the plan's nodes,
+relations and indexes, in order. Two shapes are hazards on a large
+table: a sequential scan, and a nested loop joining the table to itself
+without an index on the inner side (the causal chain self-join). A
+table holding one row per day is large after a few years of days; a
+scan of it reads every day ever logged (the health view without its
+date filter). Baselines record each statement's shape and the
+hazards accepted when it was written; a new hazard is a regression.
+
+Statements carrying parameters are planned as generic plans (PREPARE
+with plan_cache_mode = force_generic_plan), the plan any value can get.
+A statement built from filters is registered once per shape it takes.
+
+Used by scripts/check_plans.py.
+"""
+
+import os
+import re
+import json
+import hashlib
+import psycopg2
+
+from logos import db, lineage, mutations, patterns
+from logos.constants import PASSIONS
+
+
+LOGOS_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(LOGOS_DIR)
+BASELINE_PATH = os.path.join(ROOT_DIR, "plan_baselines.json")
+
+# Tables with at least this many rows (pg_class.reltuples) are large
+LARGE_ROWS = 10_000
+
+# One row per day: large after about three years of days
+DAILY_TABLES = ("daily_state", "daily_work_state", "liturgical_calendar", "work_calendar")
+DAILY_ROWS = 1_000
+
+# Statements EXPLAIN can plan; the rest (SAVEPOINT, LISTEN, ...) are skipped
+PLANNABLE = ("SELECT", "WITH", "INSERT", "UPDATE", "DELETE", "VALUES")
+
+# Scans that reach a table's rows through an index
+INDEX_SCANS = ("Index Scan", "Index Only Scan", "Bitmap Heap Scan")
+
+PLACEHOLDER_PATTERN = re.compile(r"%%|%\((\w+)\)s|%s")
+
+# (id, sql, whether execute() is given parameters); the id names the function
+HOT_STATEMENTS = (
+    ("db.fetch_system_health_today", db.SYSTEM_HEALTH_SQL, False),
+    ("db.fetch_active_commitment_ids", db.ACTIVE_COMMITMENTS_SQL, False),
+    ("db.fetch_work_counters", db.WORK_COUNTERS_SQL, False),
+    ("mutations.log_hamartia[insert]", mutations.HAMARTIA_INSERT_SQL, True),
+    ("mutations.log_hamartia[count]", mutations.UNCONFESSED_COUNT_SQL, False),
+    ("lineage.record_lineage[closure]", lineage.LINEAGE_CLOSURE_SQL, True),
+    ("lineage.record_lineage[tree]", lineage.LINEAGE_TREE_SQL, True),
+    ("mutations.fetch_unconfessed_sins", mutations.UNCONFESSED_SINS_SQL, False),
+    ("mutations.count_unconfessed_sins", mutations.unconfessed_count_query()[0], True),
+    ("mutations.count_unconfessed_sins[filtered]",
+     mutations.unconfessed_count_query(PASSIONS[0], "start", "end")[0], True),
+    ("mutations.fetch_unconfessed_page", mutations.unconfessed_page_query()[0], True),
+    ("mutations.fetch_unconfessed_page[next]",
+     mutations.unconfessed_page_query(("date", "id"), through_id="id")[0], True),
+    ("mutations.fetch_unconfessed_page[passion]",
+     mutations.unconfessed_page_query(("date", "id"), passion=PASSIONS[0], through_id="id")[0], True),
+    ("mutations.record_sacrament[sin_ids]", mutations.ABSOLVE_SINS_SQL, True),
+    ("mutations.record_sacrament[filters]",
+     mutations.absolve_batch_query("at", "id", "batch", through_id="id")[0], True),
+    ("mutations.record_sacrament[passion]",
+     mutations.absolve_batch_query("at", "id", "batch", PASSIONS[0], "start", "end", "id")[0], True),
+    ("patterns.analyze_hamartia_patterns[dominant]", patterns.DOMINANT_PASSION_SQL, False),
+    ("patterns.analyze_hamartia_patterns[peak_time]", patterns.PEAK_TIME_SQL, False),
+    ("patterns.analyze_hamartia_patterns[chain]", patterns.CAUSAL_CHAIN_SQL, False),
+    ("patterns.analyze_hamartia_patterns[screen]", patterns.SCREEN_CORRELATION_SQL, False),
+    ("patterns.analyze_pattern_horizons", patterns.pattern_horizons_sql("none"), False),
+    ("patterns.analyze_pattern_horizons[root]", patterns.pattern_horizons_sql("root"), False),
+)
+
+
+def hot_statements():
+    """
+    The registered statements, in order.
+
+    Returns:
+        list: [{"id", "source", "sql", "params"}]; "params" is whether
+        execute() is given parameters (so %s and %% are placeholders)
+    """
+    return [
+        {
+            "id": statement_id,
+            "source": f"logos/{statement_id.split('.')[0]}.py",
+            "sql": sql,
+            "params": params,
+        }
+        for statement_id, sql, params in HOT_STATEMENTS
+    ]
+
+
+def to_positional(text):
+    """
+    psycopg2 placeholders as PREPARE parameters.
+
+    %s becomes $1, $2, ... in order; %(name)s gets one number per name;
+    %% becomes %.
+
+    Returns:
+        tuple: (sql, parameter count)
+    """
+    numbers = {}
+    count = 0
+
+    def replace(match):
+        nonlocal count
+        if match.group(0) == "%%":
+            return "%"
+        name = match.group(1)
+        if name is not None and name in numbers:
+            return f"${numbers[name]}"
+        count += 1
+        if name is not None:
+            numbers[name] = count
+        return f"${count}"
+
+    return PLACEHOLDER_PATTERN.sub(replace, text), count
+
+
+def statement_kind(text):
+    """First keyword of a statement, upper-cased."""
+    words = text.split(None, 1)
+    return words[0].upper().rstrip("(") if words else ""
+
+
+def digest(text):
+    """Short digest of a statement's text, whitespace-insensitive."""
+    return hashlib.sha1(" ".join(text.split()).encode("utf-8")).hexdigest()[:12]
+
+
+def large_tables(cur, min_rows=LARGE_ROWS, daily_rows=DAILY_ROWS):
+    """
+    Names of ordinary tables with at least min_rows estimated rows, or
+    daily_rows for the tables in DAILY_TABLES.
+    """
+    cur.execute("""
+        SELECT relname, reltuples
+        FROM pg_class
+        WHERE relkind = 'r'
+          AND relnamespace = 'public'::regnamespace
+    """)
+    return {
+        name for name, rows in cur.fetchall()
+        if rows >= (daily_rows if name in DAILY_TABLES else min_rows)
+    }
+
+
+def plan_statement(cur, statement):
+    """
+    The statement's EXPLAIN (FORMAT JSON) plan, without executing it.
+
+    Runs in a savepoint: a statement that fails to plan leaves the
+    transaction usable. The caller has set plan_cache_mode.
+
+    Returns:
+        dict: The root "Plan" node
+    """
+    if statement["params"]:
+        text, count = to_positional(statement["sql"])
+    else:
+        text, count = statement["sql"], 0
+
+    cur.execute("SAVEPOINT logos_plan")
+    prepared = False
+    try:
+        if count:
+            cur.execute(f"PREPARE logos_plan AS {text}")
+            prepared = True
+            cur.execute(f"EXPLAIN (FORMAT JSON) EXECUTE logos_plan({', '.join(['NULL'] * count)})")
+        else:
+            cur.execute(f"EXPLAIN (FORMAT JSON) {text}")
+        plan = cur.fetchone()[0]
+    except psycopg2.Error:
+        cur.execute("ROLLBACK TO SAVEPOINT logos_plan")
+        raise
+    finally:
+        if prepared:
+            cur.execute("DEALLOCATE logos_plan")
+        cur.execute("RELEASE SAVEPOINT logos_plan")
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return plan[0]["Plan"]
+
+
+def _walk(node, depth=0):
+    yield node, depth
+    for child in node.get("Plans", []):
+        yield from _walk(child, depth + 1)
+
+
+def shape(plan):
+    """The plan's nodes in order, one indented line each (no costs)."""
+    lines = []
+    for node, depth in _walk(plan):
+        line = "  " * depth + node["Node Type"]
+        if "Relation Name" in node:
+            line += f" on {node['Relation Name']}"
+        if "Index Name" in node:
+            line += f" using {node['Index Name']}"
+        lines.append(line)
+    return lines
+
+
+def hazards(plan, large):
+    """
+    Plan shapes that do not scale, on the given large tables.
+
+    Returns:
+        list of str: e.g. "seq scan on hamartia_log",
+        "nested-loop self-join on hamartia_log"
+    """
+    found = set()
+    for node, _ in _walk(plan):
+        relation = node.get("Relation Name")
+        if node["Node Type"] == "Seq Scan" and relation in large:
+            found.add(f"seq scan on {relation}")
+        if node["Node Type"] == "Nested Loop" and len(node.get("Plans", [])) == 2:
+            outer, inner = node["Plans"]
+            outer_relations = {n.get("Relation Name") for n, _ in _walk(outer)}
+            for table in large & outer_relations:
+                inner_scans = [n["Node Type"] for n, _ in _walk(inner) if n.get("Relation Name") == table]
+                if inner_scans and not any(scan in INDEX_SCANS for scan in inner_scans):
+                    found.add(f"nested-loop self-join on {table}")
+    return sorted(found)
+
+
+def load_baseline(path=BASELINE_PATH):
+    """{statement id: {"sql", "shape", "hazards"}}, or None if never written."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def save_baseline(results, path=BASELINE_PATH):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def compare(results, baseline):
+    """
+    Current plans against their baselines.
+
+    Args:
+        results: {statement id: {"sql", "shape", "hazards"}}
+        baseline: The same, as last accepted
+
+    Returns:
+        tuple: (regressions, notes), each a list of (statement id, message).
+        A regression is a hazard the baseline did not accept.
+    """
+    regressions = []
+    notes = []
+    for statement_id, result in sorted(results.items()):
+        accepted = baseline.get(statement_id)
+        if accepted is None:
+            for hazard in result["hazards"]:
+                regressions.append((statement_id, f"{hazard} (new statement)"))
+            if not result["hazards"]:
+                notes.append((statement_id, "new statement"))
+            continue
+        for hazard in result["hazards"]:
+            if hazard not in accepted["hazards"]:
+                regressions.append((statement_id, hazard))
+        if result["sql"] != accepted["sql"]:
+            notes.append((statement_id, "statement text changed"))
+        elif result["shape"] != accepted["shape"]:
+            notes.append((statement_id, "plan shape changed"))
+    for statement_id in sorted(set(baseline) - set(results)):
+        notes.append((statement_id, "no longer found"))
+    return regressions, notes
@@ -0,0 +1,145 @@
+"""
+Shell-Prompt Status Segment.
+
+"Watch and pray, lest you enter into temptation." (Matthew 26:41)
+A glance, not an examination: the state is shown on every prompt.
+
+The hot path reads one small snapshot file and prints a few characters.
+It imports neither psycopg2 nor the alignment module (standard library
+only: os, sys, time). The snapshot is rewritten by a detached
+`logos prompt --refresh` after mutations and whenever it is older than
+the TTL; a stale snapshot is still shown while the refresh runs.
+
+Snapshot format (one line): "<generation> <state> <unconfessed> <written_at>"
+"""
+
+import os
+import sys
+import time
+
+
+SYMBOLS = {
+    "STABLE": "●",
+    "DEGRADED": "◐",
+    "CRITICAL": "✕",
+}
+
+DEFAULT_TTL = 300  # seconds
+
+
+def snapshot_path():
+    """Location of the snapshot file ($LOGOS_PROMPT_SNAPSHOT overrides)."""
+    path = os.environ.get("LOGOS_PROMPT_SNAPSHOT")
+    if path:
+        return path
+    cache = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(cache, "logos", "prompt")
+
+
+def read_snapshot(path):
+    """
+    Parse the snapshot.
+
+    Returns:
+        dict or None: generation, state, unconfessed, written_at
+    """
+    try:
+        with open(path, encoding="utf-8") as f:
+            fields = f.readline().split()
+        return {
+            "generation": int(fields[0]),
+            "state": fields[1],
+            "unconfessed": int(fields[2]),
+            "written_at": float(fields[3]),
+        }
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def write_snapshot(path, generation, state, unconfessed):
+    """Atomically replace the snapshot (readers never see a partial line)."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(f"{generation} {state} {unconfessed} {time.time():.0f}\n")
+    os.replace(tmp, path)
+
+
+def format_segment(snapshot):
+    """Prompt text, e.g. "◐ 3". Empty when there is no snapshot yet."""
+    if snapshot is None:
+        return ""
+    return f"{SYMBOLS.get(snapshot['state'], '?')} {snapshot['unconfessed']}"
+
+
+def spawn_refresh(path=None):
+    """
+    Start a detached `logos prompt --refresh` and return immediately.
+
+    The snapshot's mtime is bumped first (an empty file is created if
+    there is none), so prompts drawn while the refresh runs, or while the
+    database is unreachable, do not start another one before the TTL.
+    """
+    import subprocess
+
+    path = path or snapshot_path()
+    try:
+        os.utime(path)
+    except FileNotFoundError:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        open(path, "a").close()
+    # The package root goes on PYTHONPATH: the prompt may run as a bare script
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(p for p in (root, env.get("PYTHONPATH")) if p)
+    subprocess.Popen(
+        [sys.executable, "-m", "logos", "prompt", "--refresh"],
+        env=env,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+
+
+def refresh_snapshot(path=None):
+    """
+    Recompute the snapshot from the database (the slow path).
+
+    Served from the health cache when the data version is unchanged.
+    The count is the one the state was computed from.
+    """
+    from logos.cli import health_snapshot
+
+    path = path or snapshot_path()
+    version, state, _, unconfessed = health_snapshot()
+    write_snapshot(path, version, state, unconfessed)
+
+
+def main(argv):
+    """logos prompt [--refresh]"""
+    path = snapshot_path()
+    if argv[:1] == ["--refresh"]:
+        refresh_snapshot(path)
+        return 0
+
+    snapshot = read_snapshot(path)
+    sys.stdout.write(format_segment(snapshot) + "\n")
+
+    try:
+        ttl = int(os.environ.get("LOGOS_PROMPT_TTL", DEFAULT_TTL))
+    except ValueError:
+        ttl = DEFAULT_TTL
+    try:
+        stale = time.time() - os.stat(path).st_mtime > ttl
+    except OSError:
+        stale = True
+    if stale:
+        spawn_refresh(path)
+    return 0
+
+
+if __name__ == "__main__":
+    # Direct execution for shell prompts: `python3 -S logos/prompt.py`
+    # skips runpy, site and the logos package import entirely.
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,135 @@
+"""
+Full-Text Search over the Hamartia Log and Confession Notes.
+
+"Search me, O God, and know my heart." (Psalm 139:23)
+Preparing for confession means remembering honestly, not approximately.
+
+Matches come from the GIN-indexed generated tsvector columns. Pages are
+keyed on (rank, kind, id), so the next page starts where the last ended
+instead of re-reading and discarding earlier results.
+"""
+
+import psycopg2
+from logos.db import get_connection
+
+
+KINDS = ("sin", "confession")
+
+
+def encode_cursor(rank, kind, row_id):
+    """Opaque token for the last row of a page."""
+    return f"{rank!r}:{kind}:{row_id}"
+
+
+def decode_cursor(token):
+    """
+    Parse a page token back into (rank, kind, id).
+
+    Raises:
+        ValueError: If the token is malformed
+    """
+    try:
+        rank, kind, row_id = token.rsplit(":", 2)
+        rank, row_id = float(rank), int(row_id)
+    except ValueError:
+        raise ValueError(f"Invalid page token '{token}'")
+    if kind not in KINDS:
+        raise ValueError(f"Invalid page token '{token}'")
+    return rank, kind, row_id
+
+
+def search_log(query, limit=20, after=None, start=None, end=None):
+    """
+    Ranked search over sin descriptions/contexts and confession notes.
+
+    Args:
+        query: Web-search syntax ("argument with", -work, "a or b")
+        limit: Results per page
+        after: Page token from the previous page (None for the first page)
+        start: Optional first date (inclusive)
+        end: Optional last date (inclusive)
+
+    Raises:
+        ValueError: If the page token is malformed
+
+    Returns:
+        dict: {"results": [dicts with kind, id, date, label, snippet, rank],
+               "next": page token, or None on the last page}
+    """
+    if not query.strip():
+        raise ValueError("Search query cannot be empty")
+
+    params = {"query": query, "limit": limit + 1, "start": start, "end": end}
+    date_filter = ""
+    if start is not None:
+        date_filter += " AND {t}.date >= %(start)s"
+    if end is not None:
+        date_filter += " AND {t}.date <= %(end)s"
+
+    keyset = ""
+    if after is not None:
+        params["rank"], params["kind"], params["id"] = decode_cursor(after)
+        keyset = "WHERE (rank, kind, id) < (%(rank)s, %(kind)s, %(id)s)"
+
+    conn = get_connection()
+    try:
+        cur = conn.cursor(tag="search.search_log")
+        cur.execute(f"""
+            WITH q AS (
+                SELECT websearch_to_tsquery('english', %(query)s) AS query
+            ),
+            matches AS (
+                SELECT ts_rank_cd(h.search_vector, q.query)::FLOAT8 AS rank,
+                       'sin' AS kind, h.id, h.date, h.passions AS label,
+                       h.description || COALESCE(' | ' || h.context, '') AS body
+                FROM hamartia_log h, q
+                WHERE h.search_vector @@ q.query{date_filter.format(t="h")}
+                UNION ALL
+                SELECT ts_rank_cd(c.search_vector, q.query)::FLOAT8,
+                       'confession', c.id, c.date,
+                       'Confession' || COALESCE(' with ' || c.spiritual_father, ''),
+                       c.notes
+                FROM confession_log c, q
+                WHERE c.search_vector @@ q.query AND c.status = 'complete'{date_filter.format(t="c")}
+            ),
+            page AS (
+                SELECT * FROM matches
+                {keyset}
+                ORDER BY rank DESC, kind DESC, id DESC
+                LIMIT %(limit)s
+            )
+            SELECT page.rank, page.kind, page.id, page.date, page.label,
+                   ts_headline('english', page.body, q.query,
+                               'StartSel=*, StopSel=*, MaxFragments=2, MaxWords=20, MinWords=5')
+            FROM page, q
+            ORDER BY page.rank DESC, page.kind DESC, page.id DESC
+        """, params)
+        rows = cur.fetchall()
+
+        next_token = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]
+            next_token = encode_cursor(last[0], last[1], last[2])
+
+        return {
+            "results": [
+                {
+                    "rank": row[0],
+                    "kind": row[1],
+                    "id": row[2],
+                    "date": row[3],
+                    "label": row[4],
+                    "snippet": row[5],
+                }
+                for row in rows
+            ],
+            "next": next_token,
+        }
+
+    except psycopg2.Error as e:
+        print(f"error: failed to search log: {e}", flush=True)
+        raise SystemExit(1)
+    finally:
+        cur.close()
+        conn.close()
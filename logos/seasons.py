@@ -0,0 +1,124 @@
+"""
+Hamartia Density per Liturgical Season.
+
+"To every thing there is a season." (Ecclesiastes 3:1)
+The fasts are a battlefield; the passions do not rest in the same way
+in Great Lent as in ordinary time.
+
+Sins are aggregated per day, then joined once against liturgical_season
+(one GiST range probe per day), never day by day against the calendar.
+"""
+
+import psycopg2
+from logos.db import get_connection
+from logos.patterns import passion_join
+
+
+# Report order; any other season label found in the calendar follows
+SEASONS = [
+    "Great Lent",
+    "Apostles' Fast",
+    "Dormition Fast",
+    "Nativity Fast",
+    "Ordinary Time",
+]
+
+
+def fold_season_rows(mix_rows, day_rows):
+    """
+    Build the season report from the two aggregate queries.
+
+    Args:
+        mix_rows: (season or None, passion or None, sins) per season/passion
+        day_rows: (season, days) — days of each season within the logged span
+
+    Returns:
+        dict: {"seasons": [dicts with season, days, sins, per_week, passions],
+               "uncovered": sins on days with no season}
+    """
+    seasons = {}
+    uncovered = 0
+    for season, passion, sins in mix_rows:
+        if season is None:
+            uncovered += sins
+            continue
+        entry = seasons.setdefault(season, {"sins": 0, "passions": {}})
+        entry["sins"] += sins
+        if passion is not None:
+            entry["passions"][passion] = entry["passions"].get(passion, 0) + sins
+
+    days = dict(day_rows)
+    order = SEASONS + sorted((set(days) | set(seasons)) - set(SEASONS))
+
+    report = []
+    for season in order:
+        if season not in days and season not in seasons:
+            continue
+        entry = seasons.get(season, {"sins": 0, "passions": {}})
+        season_days = days.get(season, 0)
+        report.append({
+            "season": season,
+            "days": season_days,
+            "sins": entry["sins"],
+            "per_week": entry["sins"] * 7 / season_days if season_days else None,
+            "passions": sorted(entry["passions"].items(), key=lambda p: (-p[1], p[0])),
+        })
+    return {"seasons": report, "uncovered": uncovered}
+
+
+def analyze_seasons(conn=None, rollup="none"):
+    """
+    Sin frequency and passion mix per liturgical season, full history.
+
+    Args:
+        conn: Optional database connection (will create new if None)
+        rollup: "none" (each passion) or "root" (root passions)
+
+    Returns:
+        dict: See fold_season_rows
+    """
+    should_close = False
+    if conn is None:
+        conn = get_connection()
+        should_close = True
+
+    try:
+        cur = conn.cursor(tag="seasons.analyze_seasons")
+
+        # Sins per season and passion: one range join over per-day counts
+        cur.execute(f"""
+            WITH per_day AS (
+                SELECT hl.date, po.name AS passion, COUNT(*) AS sins
+                FROM hamartia_log hl
+                {passion_join(rollup, outer=True)}
+                GROUP BY hl.date, po.name
+            )
+            SELECT s.season, p.passion, SUM(p.sins)::INTEGER
+            FROM per_day p
+            LEFT JOIN liturgical_season s ON s.during @> p.date
+            GROUP BY s.season, p.passion
+        """)
+        mix_rows = cur.fetchall()
+
+        # Days of each season between the first logged sin and today
+        cur.execute("""
+            WITH span AS (
+                SELECT daterange(MIN(date), CURRENT_DATE, '[]') AS r
+                FROM hamartia_log
+            )
+            SELECT s.season, SUM(upper(s.during * span.r) - lower(s.during * span.r))::INTEGER
+            FROM liturgical_season s, span
+            WHERE s.during && span.r
+            GROUP BY s.season
+        """)
+        day_rows = cur.fetchall()
+
+        return fold_season_rows(mix_rows, day_rows)
+
+    except psycopg2.Error as e:
+        print(f"error: failed to analyze seasons: {e}", flush=True)
+        raise SystemExit(1)
+    finally:
+        cur.close()
+        if should_close:
+            conn.close()
@@ -0,0 +1,543 @@
+"""
+Local HTTP/JSON API.
+
+"Ask, and it will be given to you." (Matthew 7:7)
+
+The CLI's operations as JSON over HTTP, for phone widgets and home
+automation, without a process per call. asyncio owns the sockets; the
+engine functions stay synchronous and run on worker threads, each unit
+of work on a pooled connection (one per worker). Reads go through the
+same cached paths as the CLI: health is memoized per data version.
+
+GET /metrics serves Prometheus text: health gauges from a snapshot kept
+current by LISTENing on logos_changed (so scrapes between mutations
+send no queries), and the latency histograms of every route and query.
+
+Binds to localhost by default. Set LOGOS_API_TOKEN to require
+"Authorization: Bearer <token>" on every request. Without a token, a
+web page could still reach localhost from the browser, so a POST must
+be Content-Type application/json (a cross-site page cannot send that
+without a CORS preflight, which is never granted) and must not carry
+another site's Origin.
+"""
+
+import os
+import hmac
+import json
+import time
+import asyncio
+from http import HTTPStatus
+from urllib.parse import urlsplit, parse_qs
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+from logos.constants import PASSIONS, FAST_BREAK_REASONS, WORK_CATEGORIES, SCREEN_TIME_CATEGORIES
+from logos.metrics import SnapshotCache, observe_command, CONTENT_TYPE
+
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_WORKERS = 4
+
+# Largest request body accepted (bytes)
+MAX_BODY = 64 * 1024
+
+WORK_TYPES = ("deep", "shallow", "admin")
+
+# Wait before listening for changes again after the connection drops
+RECONNECT_SECONDS = 5
+
+# Interval between appends to the latency history (logos stats)
+FLUSH_SECONDS = 60
+
+# Health gauges for /metrics, current while the listener runs
+_snapshots = SnapshotCache()
+
+
+class HTTPError(Exception):
+    """A request the server answers with an error status."""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def _field(body, name, kind, required=True, choices=None):
+    """
+    A typed field of the JSON body.
+
+    Raises:
+        ValueError: If it is missing (when required), mistyped or not a choice
+    """
+    value = body.get(name)
+    if value is None:
+        if required:
+            raise ValueError(f"'{name}' is required")
+        return None
+    # bool is an int in Python; JSON true is not a number of minutes
+    if kind is int and (isinstance(value, bool) or not isinstance(value, int)):
+        raise ValueError(f"'{name}' must be an integer")
+    if kind is not int and not isinstance(value, kind):
+        raise ValueError(f"'{name}' must be a {kind.__name__}")
+    if choices is not None and value not in choices:
+        raise ValueError(f"'{name}' must be one of: {', '.join(map(str, choices))}")
+    return value
+
+
+def _date_param(query, name):
+    value = query.get(name)
+    if value is None:
+        return None
+    try:
+        return date.fromisoformat(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"'{name}' must be a date (YYYY-MM-DD)")
+
+
+# --- Handlers: (body, query) -> (status, payload); run on a worker thread ---
+
+def get_health(body, query):
+    from logos.cli import health_snapshot
+    version, state, output, _ = health_snapshot(approx=query.get("approx") == "1")
+    return HTTPStatus.OK, {"version": version, "state": state, "report": output}
+
+
+def get_work_health(body, query):
+    from logos.agenda import calculate_work_health
+    return HTTPStatus.OK, calculate_work_health()
+
+
+def get_ascetic(body, query):
+    from logos.mutations import fetch_today_state
+    return HTTPStatus.OK, {"date": date.today(), "state": fetch_today_state()}
+
+
+def get_metrics(body, query):
+    """Prometheus text; latencies are served even when health cannot be read."""
+    from logos.metrics import render
+    try:
+        snapshot = _snapshots.get()
+    except SystemExit:
+        # The engine has already printed the database error to the log
+        snapshot = None
+    return HTTPStatus.OK, render(snapshot)
+
+
+def post_pray(body, query):
+    from logos.mutations import update_daily_state
+    minutes = _field(body, "minutes", int, required=False)
+    done = _field(body, "done", bool, required=False)
+    if not minutes and not done:
+        raise ValueError("'minutes' or 'done' is required")
+    interruptions = _field(body, "interruptions", int, required=False)
+    update_daily_state(prayer_minutes=minutes, prayed=True, prayer_interruptions=interruptions)
+    return HTTPStatus.OK, {"prayed": True, "minutes": minutes or 0}
+
+
+def post_read(body, query):
+    from logos.mutations import update_daily_state
+    minutes = _field(body, "minutes", int)
+    update_daily_state(reading_minutes=minutes)
+    return HTTPStatus.OK, {"minutes": minutes}
+
+
+def post_screen(body, query):
+    from logos.mutations import update_daily_state
+    minutes = _field(body, "minutes", int)
+    category = _field(body, "category", str, required=False, choices=SCREEN_TIME_CATEGORIES)
+    # Without a category: the legacy total, as in the CLI
+    column = f"screen_time_{category}" if category else "screen_time_minutes"
+    update_daily_state(**{column: minutes})
+    return HTTPStatus.OK, {"minutes": minutes, "category": category}
+
+
+def post_fast(body, query):
+    from logos.mutations import update_daily_state
+    kept = _field(body, "kept", bool)
+    if kept:
+        update_daily_state(fasted=True)
+        return HTTPStatus.OK, {"fasted": True}
+    reason = _field(body, "reason", str, choices=FAST_BREAK_REASONS)
+    update_daily_state(fasted=False, fast_break_reason=reason)
+    return HTTPStatus.OK, {"fasted": False, "reason": reason}
+
+
+def post_log(body, query):
+    from logos.mutations import log_hamartia
+    passion = _field(body, "passion", str, choices=PASSIONS)
+    description = _field(body, "description", str)
+    if not description.strip():
+        raise ValueError("'description' cannot be empty")
+    parent = _field(body, "parent", int, required=False)
+    unconfessed = log_hamartia(passion, description, parent_sin_id=parent)
+    return HTTPStatus.CREATED, {"unconfessed_count": unconfessed}
+
+
+def get_unconfessed(body, query):
+    """Keyset pages; `after` is the `next` token of the previous page."""
+    from logos.mutations import count_unconfessed_sins, fetch_unconfessed_page
+    filters = {
+        "passion": _field(query, "passion", str, required=False, choices=PASSIONS),
+        "start": _date_param(query, "from"),
+        "end": _date_param(query, "to"),
+    }
+    try:
+        limit = int(query.get("limit", 50))
+    except ValueError:
+        raise ValueError("'limit' must be an integer")
+    if not 1 <= limit <= 500:
+        raise ValueError("'limit' must be between 1 and 500")
+    after = None
+    if query.get("after"):
+        try:
+            day, sin_id = query["after"].rsplit(":", 1)
+            after = (date.fromisoformat(day), int(sin_id))
+        except ValueError:
+            raise ValueError("'after' must be a page token (YYYY-MM-DD:id)")
+
+    total, through_id = count_unconfessed_sins(**filters)
+    sins = fetch_unconfessed_page(after, limit, through_id=through_id, **filters) if total else []
+    next_token = None
+    if len(sins) == limit:
+        next_token = f"{sins[-1]['date']}:{sins[-1]['id']}"
+    return HTTPStatus.OK, {"total": total, "sins": sins, "next": next_token}
+
+
+def post_confess(body, query):
+    """Absolves every unconfessed sin matching the filters, as `log confess`."""
+    from logos.mutations import count_unconfessed_sins, record_sacrament
+    father = _field(body, "father", str)
+    penance = _field(body, "penance", str)
+    if not father.strip() or not penance.strip():
+        raise ValueError("Confession requires a spiritual father and a penance")
+    filters = {
+        "passion": _field(body, "passion", str, required=False, choices=PASSIONS),
+        "start": _date_param(body, "from"),
+        "end": _date_param(body, "to"),
+    }
+    total, through_id = count_unconfessed_sins(**filters)
+    if not total:
+        raise ValueError("No unconfessed sins match")
+    result = record_sacrament(father, penance, _field(body, "notes", str, required=False),
+                              through_id=through_id, **filters)
+    return HTTPStatus.CREATED, result
+
+
+def post_penance(body, query):
+    from logos.mutations import complete_penance
+    penance = complete_penance(_field(body, "confession_id", int))
+    return HTTPStatus.OK, {"penance": penance}
+
+
+def post_commit(body, query):
+    from logos.agenda import commit
+    commitment_id = commit(_field(body, "description", str),
+                           _field(body, "type", str, choices=WORK_TYPES),
+                           _field(body, "minutes", int))
+    return HTTPStatus.CREATED, {"id": commitment_id}
+
+
+def post_work(body, query):
+    from logos.agenda import log_work
+    category = _field(body, "category", str, choices=WORK_CATEGORIES)
+    minutes = _field(body, "minutes", int)
+    log_work(category, minutes, bool(_field(body, "encroached", bool, required=False)))
+    return HTTPStatus.OK, {"category": category, "minutes": minutes}
+
+
+def post_switch(body, query):
+    from logos.agenda import log_context_switch
+    log_context_switch(_field(body, "from", str, required=False),
+                       _field(body, "to", str, required=False),
+                       _field(body, "passion", str, required=False, choices=PASSIONS),
+                       _field(body, "lag", int, required=False) or 0)
+    return HTTPStatus.OK, {"recorded": True}
+
+
+def post_abandon(body, query):
+    from logos.agenda import abandon_commitment
+    commitment_id = _field(body, "id", int)
+    abandon_commitment(commitment_id, _field(body, "passion", str, choices=PASSIONS))
+    return HTTPStatus.OK, {"id": commitment_id, "status": "abandoned"}
+
+
+ROUTES = {
+    ("GET", "/health"): get_health,
+    ("GET", "/health/work"): get_work_health,
+    ("GET", "/ascetic"): get_ascetic,
+    ("POST", "/ascetic/pray"): post_pray,
+    ("POST", "/ascetic/read"): post_read,
+    ("POST", "/ascetic/screen"): post_screen,
+    ("POST", "/ascetic/fast"): post_fast,
+    ("POST", "/log"): post_log,
+    ("GET", "/log/unconfessed"): get_unconfessed,
+    ("POST", "/confess"): post_confess,
+    ("POST", "/penance"): post_penance,
+    ("POST", "/commit"): post_commit,
+    ("POST", "/work"): post_work,
+    ("POST", "/switch"): post_switch,
+    ("POST", "/abandon"): post_abandon,
+    ("GET", "/metrics"): get_metrics,
+}
+
+
+def run_handler(handler, body, query, route=None):
+    """
+    Run a handler on a worker thread, mapping engine errors to statuses.
+
+    route ("POST /ascetic/pray") names the pooled connection's command in
+    pg_stat_activity while the handler runs.
+    """
+    try:
+        if route is not None:
+            from logos.db import name_command
+            name_command(f"serve {route}")
+        return handler(body, query)
+    except ValueError as e:
+        return HTTPStatus.BAD_REQUEST, {"error": str(e)}
+    except SystemExit:
+        # The engine has already printed the database error to the log
+        return HTTPStatus.INTERNAL_SERVER_ERROR, {"error": "database error (see server log)"}
+    except Exception as e:
+        # A bug or an exhausted pool must not take the worker's request down silently
+        return _internal_error(e)
+
+
+def _internal_error(e):
+    message = f"{type(e).__name__}: {e}"
+    print(f"error: {message}", flush=True)
+    return HTTPStatus.INTERNAL_SERVER_ERROR, {"error": message}
+
+
+# --- HTTP/1.1 over asyncio streams ---
+
+async def read_request(reader):
+    """
+    Read one request.
+
+    Returns:
+        tuple: (method, path, query dict, headers dict, body bytes), or
+               None when the client closed the connection
+
+    Raises:
+        HTTPError: On a malformed or oversized request
+    """
+    line = await reader.readline()
+    if not line:
+        return None
+    try:
+        method, target, _ = line.decode("latin-1").split()
+    except ValueError:
+        raise HTTPError(HTTPStatus.BAD_REQUEST, "malformed request line")
+
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    try:
+        length = int(headers.get("content-length") or 0)
+    except ValueError:
+        raise HTTPError(HTTPStatus.BAD_REQUEST, "invalid Content-Length")
+    if length > MAX_BODY:
+        raise HTTPError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "request body too large")
+    body = await reader.readexactly(length) if length else b""
+
+    url = urlsplit(target)
+    query = {k: v[0] for k, v in parse_qs(url.query).items()}
+    return method, url.path, query, headers, body
+
+
+def write_response(writer, status, payload, keep_alive):
+    """A JSON response, or plain text when the payload is a string (/metrics)."""
+    if isinstance(payload, str):
+        data, content_type = payload.encode(), CONTENT_TYPE
+    else:
+        data, content_type = json.dumps(payload, default=str).encode(), "application/json"
+    writer.write(
+        f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+        f"Content-Type: {content_type}\r\n"
+        f"Content-Length: {len(data)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+        f"\r\n".encode("latin-1") + data
+    )
+
+
+def _authorized(headers, token):
+    if not token:
+        return True
+    return hmac.compare_digest(headers.get("authorization", ""), f"Bearer {token}")
+
+
+def _cross_site(headers):
+    """
+    Why a mutating request may come from a web page, or None.
+
+    Browsers send text/plain or form bodies cross-site without asking;
+    application/json needs a preflight this server never answers.
+    """
+    media_type = headers.get("content-type", "").partition(";")[0].strip().lower()
+    if media_type != "application/json":
+        return HTTPStatus.UNSUPPORTED_MEDIA_TYPE, "Content-Type must be application/json"
+    origin = headers.get("origin")
+    if origin is not None and urlsplit(origin).netloc != headers.get("host"):
+        return HTTPStatus.FORBIDDEN, f"cross-origin request from {origin}"
+    return None
+
+
+async def dispatch(request, executor, token):
+    """Route one parsed request; returns (status, payload)."""
+    method, path, query, headers, body = request
+    if not _authorized(headers, token):
+        return HTTPStatus.UNAUTHORIZED, {"error": "missing or invalid bearer token"}
+    if method == "GET" and path == "/":
+        return HTTPStatus.OK, {"routes": [f"{m} {p}" for m, p in ROUTES]}
+
+    handler = ROUTES.get((method, path))
+    if handler is None:
+        if any(p == path for _, p in ROUTES):
+            return HTTPStatus.METHOD_NOT_ALLOWED, {"error": f"{method} not allowed on {path}"}
+        return HTTPStatus.NOT_FOUND, {"error": f"no route {path}"}
+
+    if method == "POST":
+        refused = _cross_site(headers)
+        if refused is not None:
+            return refused[0], {"error": refused[1]}
+
+    try:
+        fields = json.loads(body) if body else {}
+    except ValueError:
+        return HTTPStatus.BAD_REQUEST, {"error": "body must be JSON"}
+    if not isinstance(fields, dict):
+        return HTTPStatus.BAD_REQUEST, {"error": "body must be a JSON object"}
+
+    loop = asyncio.get_running_loop()
+    started = time.perf_counter()
+    result = await loop.run_in_executor(executor, run_handler, handler, fields, query,
+                                        f"{method} {path}")
+    observe_command(f"{method} {path}", time.perf_counter() - started)
+    return result
+
+
+async def follow_changes(snapshots):
+    """
+    Keep the metrics snapshot's version current from logos_changed.
+
+    While the listening connection is down, the version is unknown and
+    every scrape reads afresh.
+    """
+    import psycopg2
+    from logos.db import open_listener
+
+    loop = asyncio.get_running_loop()
+    while True:
+        try:
+            conn, version = await loop.run_in_executor(None, open_listener)
+        except SystemExit:
+            await asyncio.sleep(RECONNECT_SECONDS)
+            continue
+        snapshots.changed(version)
+        readable = asyncio.Event()
+        fd = conn.fileno()
+        loop.add_reader(fd, readable.set)
+        try:
+            while True:
+                await readable.wait()
+                readable.clear()
+                conn.poll()
+                if conn.notifies:
+                    # Delivered in commit order: the last is the newest
+                    snapshots.changed(int(conn.notifies[-1].payload))
+                    conn.notifies.clear()
+        except psycopg2.OperationalError as e:
+            print(f"error: lost the change listener: {e}", flush=True)
+        finally:
+            loop.remove_reader(fd)
+            conn.close()
+            snapshots.changed(None)
+        await asyncio.sleep(RECONNECT_SECONDS)
+
+
+async def handle_client(reader, writer, executor, token):
+    """Serve requests on one connection until the client is done (keep-alive)."""
+    try:
+        while True:
+            try:
+                request = await read_request(reader)
+            except HTTPError as e:
+                write_response(writer, e.status, {"error": str(e)}, keep_alive=False)
+                await writer.drain()
+                break
+            if request is None:
+                break
+
+            method, path, _, headers, _ = request
+            started = time.perf_counter()
+            try:
+                status, payload = await dispatch(request, executor, token)
+            except Exception as e:
+                status, payload = _internal_error(e)
+            keep_alive = headers.get("connection", "").lower() != "close"
+            write_response(writer, status, payload, keep_alive)
+            await writer.drain()
+            if status >= HTTPStatus.INTERNAL_SERVER_ERROR:
+                elapsed = (time.perf_counter() - started) * 1000
+                print(f"{method} {path} -> {status.value} ({elapsed:.1f} ms)", flush=True)
+            if not keep_alive:
+                break
+    except (ConnectionError, asyncio.IncompleteReadError):
+        pass
+    finally:
+        writer.close()
+
+
+async def flush_latency():
+    """Append the latency history periodically (a CLI command does it on exit)."""
+    from logos import latency
+    while True:
+        await asyncio.sleep(FLUSH_SECONDS)
+        latency.flush()
+
+
+async def _serve(host, port, workers, executor, token):
+    server = await asyncio.start_server(
+        lambda r, w: handle_client(r, w, executor, token), host, port
+    )
+    print(f"LogOS API on http://{host}:{port} "
+          f"({workers} workers, token {'required' if token else 'not required'})",
+          flush=True)
+    background = [asyncio.create_task(follow_changes(_snapshots)),
+                  asyncio.create_task(flush_latency())]
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        for task in background:
+            task.cancel()
+
+
+def serve(host=DEFAULT_HOST, port=DEFAULT_PORT, workers=DEFAULT_WORKERS):
+    """
+    Run the API until interrupted.
+
+    Args:
+        host: Interface to bind (localhost by default)
+        port: TCP port
+        workers: Worker threads, and pooled connections (one each)
+    """
+    from logos.db import open_pool, close_pool
+
+    token = os.environ.get("LOGOS_API_TOKEN")
+    open_pool(workers)
+    executor = ThreadPoolExecutor(max_workers=workers)
+    try:
+        asyncio.run(_serve(host, port, workers, executor, token))
+    except KeyboardInterrupt:
+        print()
+    finally:
+        executor.shutdown(wait=True)
+        close_pool()
+    return 0
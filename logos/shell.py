@@ -0,0 +1,194 @@
+"""
+Interactive LogOS Shell.
+
+"Pray without ceasing." (1 Thess 5:17)
+
+Several entries in a row (pray, read, screen, work, switch) share one
+process and one database connection instead of paying for both each
+time. Every line goes through the same argument parser as `logos`, so
+the grammar is identical; the shell adds history, completion and the
+latency of each command.
+"""
+
+import os
+import sys
+import time
+import shlex
+
+from logos.constants import (
+    PASSIONS, FAST_BREAK_REASONS, WORK_CATEGORIES, SCREEN_TIME_CATEGORIES, ROLLUPS, QUERY_ORDERS
+)
+
+
+PROMPT = "logos> "
+HISTORY_LENGTH = 1000
+EXIT_COMMANDS = ("exit", "quit")
+
+# Commands that open their own session (or pool)
+SESSION_COMMANDS = ("shell", "batch", "watch", "serve")
+
+SUBCOMMANDS = {
+    "log": ["add", "confess", "lineage", "search"],
+    "ascetic": ["fast", "pray", "read", "screen", "status"],
+    "db": ["top-queries"],
+}
+
+# Option -> values offered after it (--category depends on the command)
+OPTION_VALUES = {
+    "--passion": PASSIONS,
+    "--reason": FAST_BREAK_REASONS,
+    "--rollup": ROLLUPS,
+    "--order": QUERY_ORDERS,
+}
+
+# Commands after which the active commitment IDs have changed
+COMMITMENT_COMMANDS = ("commit", "abandon")
+
+
+def history_path():
+    """Location of the history file ($LOGOS_HISTORY overrides)."""
+    return os.environ.get("LOGOS_HISTORY") or os.path.join(os.path.expanduser("~"), ".logos_history")
+
+
+def command_names():
+    """Every command the shell accepts, in --help order."""
+    from logos.cli import PARSER_BUILDERS
+    names = [name for names, _ in PARSER_BUILDERS for name in names
+             if name not in SESSION_COMMANDS]
+    return names + ["help"] + list(EXIT_COMMANDS)
+
+
+def candidates(words, commitment_ids):
+    """
+    Completions for the word after `words` (the words already typed).
+
+    Args:
+        words: Complete words before the cursor
+        commitment_ids: Callable returning the active commitment IDs
+    """
+    if not words:
+        return command_names()
+    if len(words) == 1 and words[0] in SUBCOMMANDS:
+        return SUBCOMMANDS[words[0]]
+
+    option = words[-1]
+    if option == "--category":
+        return WORK_CATEGORIES if words[0] == "work" else SCREEN_TIME_CATEGORIES
+    if option == "--id" and words[0] == "abandon":
+        return [str(i) for i in commitment_ids()]
+    return OPTION_VALUES.get(option, [])
+
+
+class Completer:
+    """readline completer; active commitment IDs are read once per change."""
+
+    def __init__(self):
+        self.ids = None
+
+    def commitment_ids(self):
+        if self.ids is None:
+            from logos.db import fetch_active_commitment_ids
+            try:
+                self.ids = fetch_active_commitment_ids()
+            except SystemExit:
+                return []
+        return self.ids
+
+    def complete(self, text, state):
+        import readline
+        line = readline.get_line_buffer()[:readline.get_begidx()]
+        try:
+            words = shlex.split(line)
+        except ValueError:
+            return None
+        matches = [c for c in candidates(words, self.commitment_ids) if c.startswith(text)]
+        return matches[state] if state < len(matches) else None
+
+
+def _setup_readline(completer):
+    """History and tab completion, where readline exists (not on Windows)."""
+    try:
+        import readline
+    except ImportError:
+        return None
+    try:
+        readline.read_history_file(history_path())
+    except OSError:
+        pass
+    readline.set_history_length(HISTORY_LENGTH)
+    readline.set_completer_delims(" \t\n")
+    readline.set_completer(completer.complete)
+    readline.parse_and_bind("tab: complete")
+    return readline
+
+
+def run_line(argv):
+    """
+    Run one command through the CLI parser and dispatcher.
+
+    Returns:
+        int: Exit code, as `logos` would have returned it
+    """
+    from logos.cli import main as cli_main
+    try:
+        return cli_main(argv)
+    except SystemExit as e:
+        # argparse errors and --help, and database errors, exit; the shell does not
+        if e.code is None:
+            return 0
+        return e.code if isinstance(e.code, int) else 1
+    except KeyboardInterrupt:
+        print()
+        return 130
+
+
+def main():
+    """logos shell — read commands until exit, quit or EOF."""
+    from logos.db import open_session, close_session
+
+    completer = Completer()
+    readline = _setup_readline(completer)
+    open_session()
+    print("LogOS shell. Same commands as `logos`; help lists them, exit leaves.")
+    try:
+        while True:
+            try:
+                line = input(PROMPT)
+            except EOFError:
+                print()
+                break
+            except KeyboardInterrupt:
+                print()
+                continue
+
+            try:
+                argv = shlex.split(line)
+            except ValueError as e:
+                print(f"error: {e}", flush=True)
+                continue
+            if not argv:
+                continue
+            if argv[0] in EXIT_COMMANDS:
+                break
+            if argv[0] == "help":
+                argv = ["--help"] + argv[1:]
+            if argv[0] in SESSION_COMMANDS:
+                print(f"error: '{argv[0]}' cannot run inside the shell", flush=True)
+                continue
+
+            started = time.perf_counter()
+            code = run_line(argv)
+            elapsed = (time.perf_counter() - started) * 1000
+            status = f"exit {code}, " if code else ""
+            print(f"({status}{elapsed:.1f} ms)")
+
+            if argv[0] in COMMITMENT_COMMANDS:
+                completer.ids = None
+    finally:
+        close_session()
+        if readline is not None:
+            try:
+                readline.write_history_file(history_path())
+            except OSError as e:
+                print(f"error: could not save history: {e}", file=sys.stderr, flush=True)
+    return 0
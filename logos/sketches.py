@@ -0,0 +1,189 @@
+"""
+Streaming Sketches for Approximate Analytics.
+
+"Count the cost." (Luke 14:28)
+When the log grows past what can be counted exactly on every call,
+count approximately, and say exactly how approximate.
+
+Every sketch here is:
+- updated in O(1) (or O(k)) per insert,
+- mergeable across time buckets,
+- serializable to plain JSON for storage,
+- able to state its own error bound.
+
+Standard library only.
+"""
+
+import base64
+import hashlib
+import math
+
+
+def _hash64(key, salt=b""):
+    """Stable 64-bit hash of a string key."""
+    digest = hashlib.blake2b(key.encode("utf-8"), digest_size=8, salt=salt).digest()
+    return int.from_bytes(digest, "big")
+
+
+class CountMinSketch:
+    """
+    Count-Min sketch (Cormode & Muthukrishnan).
+
+    estimate(key) >= true count, and with probability 1 - delta
+    estimate(key) <= true count + epsilon * total.
+    """
+
+    def __init__(self, width=272, depth=5, rows=None, total=0):
+        self.width = width
+        self.depth = depth
+        self.rows = rows if rows is not None else [[0] * width for _ in range(depth)]
+        self.total = total
+
+    def _indexes(self, key):
+        # Double hashing: h1 + i * h2 (Kirsch & Mitzenmacher)
+        h1 = _hash64(key, b"cm-h1")
+        h2 = _hash64(key, b"cm-h2") | 1
+        return [(h1 + i * h2) % self.width for i in range(self.depth)]
+
+    def add(self, key, count=1):
+        for row, idx in zip(self.rows, self._indexes(key)):
+            row[idx] += count
+        self.total += count
+
+    def estimate(self, key):
+        return min(row[idx] for row, idx in zip(self.rows, self._indexes(key)))
+
+    def epsilon(self):
+        return math.e / self.width
+
+    def delta(self):
+        return math.exp(-self.depth)
+
+    def error_bound(self):
+        """Maximum overestimate (with probability 1 - delta)."""
+        return math.ceil(self.epsilon() * self.total)
+
+    def merge(self, other):
+        if (self.width, self.depth) != (other.width, other.depth):
+            raise ValueError("Cannot merge count-min sketches of different dimensions")
+        for row, other_row in zip(self.rows, other.rows):
+            for i, value in enumerate(other_row):
+                row[i] += value
+        self.total += other.total
+        return self
+
+    def to_dict(self):
+        return {"width": self.width, "depth": self.depth, "rows": self.rows, "total": self.total}
+
+
+def count_min_from_dict(data):
+    return CountMinSketch(data["width"], data["depth"], data["rows"], data["total"])
+
+
+class SpaceSaving:
+    """
+    Space-Saving top-k (Metwally, Agrawal & El Abbadi).
+
+    Each counter holds (count, error): count - error <= true count <= count.
+    Merging follows Berinde et al.: a key absent from a full sketch may
+    have occurred up to that sketch's minimum count.
+    """
+
+    def __init__(self, k=16, counters=None, total=0):
+        self.k = k
+        self.counters = counters if counters is not None else {}
+        self.total = total
+
+    def _min_count(self):
+        if len(self.counters) < self.k:
+            return 0
+        return min(c[0] for c in self.counters.values())
+
+    def add(self, key, count=1):
+        self.total += count
+        if key in self.counters:
+            self.counters[key][0] += count
+            return
+        if len(self.counters) < self.k:
+            self.counters[key] = [count, 0]
+            return
+        victim = min(self.counters, key=lambda k: self.counters[k][0])
+        floor = self.counters.pop(victim)[0]
+        self.counters[key] = [floor + count, floor]
+
+    def top(self, n=None):
+        """
+        Returns:
+            list: (key, count, lower_bound) sorted by count, descending
+        """
+        ranked = sorted(self.counters.items(), key=lambda kv: (-kv[1][0], kv[0]))
+        if n is not None:
+            ranked = ranked[:n]
+        return [(key, c[0], c[0] - c[1]) for key, c in ranked]
+
+    def merge(self, other):
+        floor_self = self._min_count()
+        floor_other = other._min_count()
+        merged = {}
+        for key in set(self.counters) | set(other.counters):
+            c1, e1 = self.counters.get(key, (floor_self, floor_self))
+            c2, e2 = other.counters.get(key, (floor_other, floor_other))
+            merged[key] = [c1 + c2, e1 + e2]
+        ranked = sorted(merged.items(), key=lambda kv: (-kv[1][0], kv[0]))[:self.k]
+        self.counters = {key: c for key, c in ranked}
+        self.total += other.total
+        return self
+
+    def to_dict(self):
+        return {"k": self.k, "counters": self.counters, "total": self.total}
+
+
+def space_saving_from_dict(data):
+    return SpaceSaving(data["k"], {key: list(c) for key, c in data["counters"].items()}, data["total"])
+
+
+class HyperLogLog:
+    """
+    HyperLogLog distinct counter (Flajolet et al.) with linear counting
+    for small cardinalities. Relative standard error: 1.04 / sqrt(2^p).
+    """
+
+    def __init__(self, p=10, registers=None):
+        self.p = p
+        self.m = 1 << p
+        self.registers = registers if registers is not None else bytearray(self.m)
+
+    def add(self, key):
+        h = _hash64(key, b"hll")
+        idx = h >> (64 - self.p)
+        rest = h & ((1 << (64 - self.p)) - 1)
+        rank = (64 - self.p) - rest.bit_length() + 1
+        if rank > self.registers[idx]:
+            self.registers[idx] = rank
+
+    def estimate(self):
+        m = self.m
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / sum(2.0 ** -r for r in self.registers)
+        zeros = self.registers.count(0)
+        if raw <= 2.5 * m and zeros:
+            return m * math.log(m / zeros)
+        return raw
+
+    def relative_error(self):
+        return 1.04 / math.sqrt(self.m)
+
+    def merge(self, other):
+        if self.p != other.p:
+            raise ValueError("Cannot merge HyperLogLogs of different precision")
+        for i, r in enumerate(other.registers):
+            if r > self.registers[i]:
+                self.registers[i] = r
+        return self
+
+    def to_dict(self):
+        return {"p": self.p, "registers": base64.b64encode(bytes(self.registers)).decode("ascii")}
+
+
+def hyperloglog_from_dict(data):
+    return HyperLogLog(data["p"], bytearray(base64.b64decode(data["registers"])))
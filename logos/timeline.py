@@ -0,0 +1,147 @@
+"""
+Merged Timeline of Every Event Stream.
+
+"Teach us to number our days, that we may gain a heart of wisdom." (Psalm 90:12)
+
+One server-side cursor per source, each ordered by its own timestamp
+index, merged with a k-way heap merge. Memory is bounded by the cursor
+batch size times the number of sources, whatever the length of history.
+"""
+
+import heapq
+import psycopg2
+from logos.db import get_connection
+
+
+# Rows fetched per round trip, per source
+ITERSIZE = 500
+
+# (kind, query) — every query yields (timestamp, id, summary) in timestamp
+# order and takes (start, end) as a half-open range. Daily states keep only
+# their last update, so the ascetic/work streams show each day's final state.
+SOURCES = [
+    ("sin", """
+        SELECT created_at, id, passions || ': ' || description
+        FROM hamartia_log
+        WHERE created_at >= %s AND created_at < %s
+        ORDER BY created_at, id
+    """),
+    ("confession", """
+        SELECT created_at, id,
+               'Confession' || COALESCE(' with ' || spiritual_father, '')
+               || COALESCE(' (penance: ' || penance_assigned || ')', '')
+        FROM confession_log
+        WHERE status = 'complete'
+          AND created_at >= %s AND created_at < %s
+        ORDER BY created_at, id
+    """),
+    ("penance", """
+        SELECT penance_completed_at, id,
+               'Penance completed' || COALESCE(': ' || penance_assigned, '')
+        FROM confession_log
+        WHERE penance_completed_at >= %s AND penance_completed_at < %s
+        ORDER BY penance_completed_at, id
+    """),
+    ("ascetic", """
+        SELECT updated_at, 0,
+               format('%%s: prayer %%s min (%%s interruptions), reading %%s min, '
+                      'screen %%s min, fasted %%s, prayed %%s',
+                      date, prayer_minutes, prayer_interruptions, reading_minutes,
+                      COALESCE(screen_time_work, 0) + COALESCE(screen_time_social, 0)
+                      + COALESCE(screen_time_entertainment, 0)
+                      + COALESCE(screen_time_edifying, 0),
+                      fasted, prayed)
+        FROM daily_state
+        WHERE updated_at >= %s AND updated_at < %s
+        ORDER BY updated_at, date
+    """),
+    ("work", """
+        SELECT updated_at, 0,
+               format('%%s: deep %%s min, shallow %%s min (waste %%s)%%s',
+                      date,
+                      deep_work_creative + deep_work_analytical + deep_work_learning,
+                      shallow_work_necessary + shallow_work_admin + shallow_work_waste,
+                      shallow_work_waste,
+                      CASE WHEN encroached_prayer THEN ', encroached on prayer' ELSE '' END)
+        FROM daily_work_state
+        WHERE updated_at >= %s AND updated_at < %s
+        ORDER BY updated_at, date
+    """),
+    ("commitment", """
+        SELECT created_at, id,
+               upper(type) || ' ' || committed_minutes || 'm: ' || description
+        FROM commitment_log
+        WHERE created_at >= %s AND created_at < %s
+        ORDER BY created_at, id
+    """),
+    ("resolution", """
+        SELECT updated_at, id,
+               initcap(status) || ': ' || description
+               || COALESCE(' (' || failure_passion || ')', '')
+        FROM commitment_log
+        WHERE status <> 'active'
+          AND updated_at >= %s AND updated_at < %s
+        ORDER BY updated_at, id
+    """),
+    ("switch", """
+        SELECT timestamp, id,
+               COALESCE(from_type, '?') || ' -> ' || COALESCE(to_type, '?')
+               || COALESCE(' (' || trigger_passion || ')', '')
+               || CASE WHEN resumption_lag_minutes > 0
+                       THEN ', ' || resumption_lag_minutes || 'm to resume' ELSE '' END
+        FROM context_events
+        WHERE timestamp >= %s AND timestamp < %s
+        ORDER BY timestamp, id
+    """),
+]
+
+
+def _events(rows, kind):
+    """Tag each (timestamp, id, summary) row with its source kind."""
+    for timestamp, row_id, summary in rows:
+        yield (timestamp, kind, row_id, summary)
+
+
+def merge_events(streams):
+    """
+    K-way merge of ordered event streams.
+
+    Args:
+        streams: {kind: iterable of (timestamp, id, summary), each ordered}
+
+    Returns:
+        iterator: (timestamp, kind, id, summary) in timestamp order
+    """
+    return heapq.merge(*(_events(rows, kind) for kind, rows in streams.items()))
+
+
+def iter_timeline(start, end):
+    """
+    Stream every event with start <= timestamp < end, oldest first.
+
+    The connection stays open while the iterator is consumed and is closed
+    when it is exhausted or closed (e.g. when the reader quits a page).
+
+    Args:
+        start: datetime (inclusive)
+        end: datetime (exclusive)
+    """
+    conn = get_connection()
+    cursors = []
+    try:
+        streams = {}
+        for kind, query in SOURCES:
+            cur = conn.cursor(name=f"timeline_{kind}", tag="timeline.iter_timeline")
+            cur.itersize = ITERSIZE
+            cur.execute(query, (start, end))
+            cursors.append(cur)
+            streams[kind] = cur
+        yield from merge_events(streams)
+
+    except psycopg2.Error as e:
+        print(f"error: failed to read timeline: {e}", flush=True)
+        raise SystemExit(1)
+    finally:
+        for cur in cursors:
+            cur.close()
+        conn.close()
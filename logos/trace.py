@@ -0,0 +1,143 @@
+"""
+Trace: Where One Command's Time Goes.
+
+"Examine yourselves, whether ye be in the faith; prove your own selves."
+(2 Corinthians 13:5)
+
+`logos --trace <command>` records a tree of spans: connection
+acquisition, every SQL statement (issuer, duration, rows), the alignment
+evaluation and output rendering. With --explain-ms, statements slower
+than the threshold carry their EXPLAIN (ANALYZE, BUFFERS) plan. The tree
+is printed to stderr when the command ends, so its output is unchanged.
+
+Off by default: every hook is one check of a module global. Standard
+library only (db.py imports it).
+"""
+
+import time
+
+
+# Longest statement text shown on a span line
+STATEMENT_WIDTH = 72
+
+
+class Span:
+    """One timed step, and the steps inside it."""
+
+    def __init__(self, name, detail=""):
+        self.name = name
+        self.detail = detail
+        self.started = time.perf_counter()
+        self.elapsed = None
+        self.children = []
+        self.plan = None
+
+    def finish(self):
+        if self.elapsed is None:
+            self.elapsed = time.perf_counter() - self.started
+
+
+# The trace being recorded: (root span, stack of open spans, explain
+# threshold in seconds or None), or None when tracing is off
+_active = None
+
+
+def start(name, explain_ms=None):
+    """Begin tracing; the command itself is the root span."""
+    global _active
+    root = Span(name)
+    threshold = explain_ms / 1000 if explain_ms is not None else None
+    _active = (root, [root], threshold)
+
+
+def stop():
+    """
+    Stop tracing.
+
+    Returns:
+        Span: The root, with any span left open closed at this moment
+    """
+    global _active
+    root, stack, _ = _active
+    _active = None
+    for span in reversed(stack):
+        span.finish()
+    return root
+
+
+def active():
+    return _active is not None
+
+
+def begin(name, detail=""):
+    """Open a span under the current one; None when tracing is off."""
+    if _active is None:
+        return None
+    _, stack, _ = _active
+    span = Span(name, detail)
+    stack[-1].children.append(span)
+    stack.append(span)
+    return span
+
+
+def end(span, detail=None):
+    """Close a span from begin() (None is ignored)."""
+    if span is None or _active is None:
+        return
+    span.finish()
+    if detail is not None:
+        span.detail = detail
+    _, stack, _ = _active
+    if span in stack:
+        del stack[stack.index(span):]
+
+
+def wants_plan(seconds):
+    """Whether a statement this slow should carry its plan."""
+    if _active is None:
+        return False
+    threshold = _active[2]
+    return threshold is not None and seconds >= threshold
+
+
+def statement(issuer, text, seconds, rows, plan=None):
+    """Record a finished SQL statement (rows is None if it failed)."""
+    if _active is None:
+        return
+    _, stack, _ = _active
+    head = " ".join(text.split())
+    if len(head) > STATEMENT_WIDTH:
+        head = head[:STATEMENT_WIDTH - 1] + "…"
+    if rows is None:
+        outcome = "failed"
+    elif rows < 0:
+        outcome = "rows unknown"
+    else:
+        outcome = f"{rows} row{'' if rows == 1 else 's'}"
+    span = Span(f"SQL {issuer}", f"{outcome}  {head}")
+    span.started -= seconds
+    span.elapsed = seconds
+    span.plan = plan
+    stack[-1].children.append(span)
+
+
+def format_tree(root):
+    """The span tree, durations first, children indented under parents."""
+    lines = []
+
+    def add(span, prefix, last, is_root):
+        if is_root:
+            branch, child_prefix = "", ""
+        else:
+            branch = "└─ " if last else "├─ "
+            child_prefix = prefix + ("   " if last else "│  ")
+        label = f"{span.name}  {span.detail}" if span.detail else span.name
+        lines.append(f"{span.elapsed * 1000:>10.2f} ms  {prefix}{branch}{label}")
+        if span.plan:
+            for plan_line in span.plan.splitlines():
+                lines.append(f"{'':>13}  {child_prefix}  | {plan_line}")
+        for i, child in enumerate(span.children):
+            add(child, child_prefix, i == len(span.children) - 1, False)
+
+    add(root, "", True, True)
+    return "\n".join(["", "Trace:"] + lines)
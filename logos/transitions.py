@@ -0,0 +1,125 @@
+"""
+Passion Transitions (Markov Matrix).
+
+"Each one is tempted when he is drawn away by his own desires." (James 1:14)
+The passions do not come alone; one opens the door to the next (Evagrius).
+
+The matrix counts consecutive sins (A then B) and the time between them.
+It is maintained on every log_hamartia insert from the previous sin,
+so reading it never touches hamartia_log.
+"""
+
+from bisect import bisect_right
+import psycopg2
+from logos.db import get_connection
+
+
+# Upper bounds (seconds) of the inter-arrival buckets; the last is open
+GAP_THRESHOLDS = [3600, 21600, 86400, 259200, 604800, 2592000]
+GAP_LABELS = ["<1h", "1-6h", "6-24h", "1-3d", "3-7d", "7-30d", ">30d"]
+
+
+def gap_bucket(seconds):
+    """Index into GAP_LABELS for an inter-arrival time in seconds."""
+    return bisect_right(GAP_THRESHOLDS, seconds)
+
+
+def record_transition(cur, sin_id, passion, created_at):
+    """
+    Fold a newly logged sin into the transition matrix.
+
+    Must run inside the same transaction as the INSERT. The cursor row is
+    locked so concurrent writers are folded one after another.
+    """
+    cur.execute("""
+        INSERT INTO hamartia_cursor (id) VALUES (TRUE)
+        ON CONFLICT (id) DO NOTHING
+    """)
+    cur.execute("""
+        SELECT last_passion, last_created_at FROM hamartia_cursor
+        WHERE id = TRUE
+        FOR UPDATE
+    """)
+    last_passion, last_created_at = cur.fetchone()
+
+    if last_passion is not None:
+        gap = max((created_at - last_created_at).total_seconds(), 0.0)
+        histogram = [0] * len(GAP_LABELS)
+        bucket = gap_bucket(gap)
+        histogram[bucket] = 1
+        cur.execute("""
+            INSERT INTO passion_transitions
+                (from_passion, to_passion, count, total_seconds, gap_histogram)
+            VALUES (%s, %s, 1, %s, %s)
+            ON CONFLICT (from_passion, to_passion) DO UPDATE SET
+                count = passion_transitions.count + 1,
+                total_seconds = passion_transitions.total_seconds + EXCLUDED.total_seconds,
+                gap_histogram[%s] = passion_transitions.gap_histogram[%s] + 1
+        """, (last_passion, passion, gap, histogram, bucket + 1, bucket + 1))
+
+    cur.execute("""
+        UPDATE hamartia_cursor
+        SET last_sin_id = %s, last_passion = %s, last_created_at = %s
+        WHERE id = TRUE
+    """, (sin_id, passion, created_at))
+
+
+def fetch_transition_matrix():
+    """
+    Read the full passion-to-passion transition matrix.
+
+    Returns:
+        list: Dicts with from_passion, to_passion, count,
+              mean_seconds, gap_histogram (aligned with GAP_LABELS)
+    """
+    conn = get_connection()
+    try:
+        cur = conn.cursor(tag="transitions.fetch_transition_matrix")
+        cur.execute("""
+            SELECT from_passion, to_passion, count, total_seconds, gap_histogram
+            FROM passion_transitions
+            ORDER BY from_passion, count DESC, to_passion
+        """)
+        return [
+            {
+                "from_passion": row[0],
+                "to_passion": row[1],
+                "count": row[2],
+                "mean_seconds": row[3] / row[2] if row[2] else None,
+                "gap_histogram": row[4],
+            }
+            for row in cur.fetchall()
+        ]
+
+    except psycopg2.Error as e:
+        print(f"error: failed to fetch transitions: {e}", flush=True)
+        raise SystemExit(1)
+    finally:
+        cur.close()
+        conn.close()
+
+
+def most_likely_successors(matrix):
+    """
+    For each passion, the successor observed most often.
+
+    Args:
+        matrix: Output of fetch_transition_matrix
+
+    Returns:
+        dict: {from_passion: (to_passion, count, row_total, typical_gap_label)}
+    """
+    totals = {}
+    best = {}
+    for cell in matrix:
+        source = cell["from_passion"]
+        totals[source] = totals.get(source, 0) + cell["count"]
+        if source not in best or cell["count"] > best[source]["count"]:
+            best[source] = cell
+
+    successors = {}
+    for source, cell in best.items():
+        histogram = cell["gap_histogram"]
+        typical = GAP_LABELS[histogram.index(max(histogram))]
+        successors[source] = (cell["to_passion"], cell["count"], totals[source], typical)
+    return successors
@@ -0,0 +1,164 @@
+"""
+Live Dashboard.
+
+"Watch therefore, for you know neither the day nor the hour." (Matthew 25:13)
+
+Redraws only when the truth changes. Every mutation's bump_data_version()
+NOTIFYs logos_changed on commit; the dashboard LISTENs on its one
+persistent connection and sleeps in select() in between, so an idle
+dashboard sends no queries at all. Health is read from the version-keyed
+cache: however many dashboards are open, one of them computes it per
+change and the rest read one row.
+"""
+
+import sys
+import time
+import random
+import select
+from datetime import datetime, timedelta
+import psycopg2
+from logos.db import open_session, close_session, get_connection, CHANGE_CHANNEL
+from logos.prompt import SYMBOLS
+
+
+# A burst of notifications (a batch, an absolution) is drawn once. The
+# jitter spreads dashboards out, so the first to wake fills the health
+# cache and the others read it instead of all computing at once.
+SETTLE_SECONDS = 0.2
+SETTLE_JITTER = 0.5
+
+# Wait before listening again after the connection drops
+RECONNECT_SECONDS = 5
+
+
+def seconds_until_midnight(now):
+    """Today's counters reset at midnight, without any notification."""
+    midnight = datetime.combine(now.date() + timedelta(days=1), datetime.min.time())
+    return (midnight - now).total_seconds()
+
+
+def format_practice(state):
+    """Today's ascetic counters (fetch_today_state), or a note if none yet."""
+    if not state:
+        return ["  Nothing recorded today."]
+    prayer = f"Prayer {state['prayer_minutes']} min"
+    if state["prayer_interruptions"]:
+        prayer += f" ({state['prayer_interruptions']} interruptions)"
+    fast = "kept" if state["fasted"] else f"broken ({state['fast_break_reason'] or 'unrecorded'})"
+    return [
+        f"  {prayer} | Reading {state['reading_minutes']} min"
+        f" | Prayed {'yes' if state['prayed'] else 'no'} | Fast {fast}",
+        f"  Screen: work {state['screen_time_work']} | edifying {state['screen_time_edifying']}"
+        f" | social {state['screen_time_social']} | entertainment {state['screen_time_entertainment']} min",
+    ]
+
+
+def render():
+    """
+    The dashboard text. A section whose read fails (e.g. no daily state
+    yet) says so; its error has already been printed.
+    """
+    from logos.cli import health_snapshot
+    from logos.agenda import calculate_work_health
+    from logos.mutations import fetch_today_state
+
+    lines = []
+    try:
+        version, _, output, _ = health_snapshot()
+        lines.append(f"LogOS — {datetime.now():%Y-%m-%d %H:%M:%S} (version {version})")
+        lines.append(output)
+    except SystemExit:
+        lines.append(f"LogOS — {datetime.now():%Y-%m-%d %H:%M:%S}")
+        lines.append("System health unavailable.")
+
+    try:
+        work = calculate_work_health()
+        lines.append(f"{SYMBOLS.get(work['state'], '?')} Work Health: {work['state']}")
+        if work["diagnosis"] != "Nominal":
+            lines.append(f"  Diagnosis: {work['diagnosis']}")
+    except SystemExit:
+        lines.append("Work health unavailable.")
+
+    lines.append("")
+    lines.append("Today's Practice:")
+    try:
+        lines.extend(format_practice(fetch_today_state()))
+    except SystemExit:
+        lines.append("  Unavailable.")
+    return "\n".join(lines)
+
+
+def _listen():
+    """LISTEN on the session connection (reconnecting it if it dropped)."""
+    conn = get_connection().conn
+    cur = conn.cursor(tag="watch._listen")
+    cur.execute(f"LISTEN {CHANGE_CHANNEL}")
+    conn.commit()
+    cur.close()
+    return conn
+
+
+def _relisten():
+    """Listen again after the connection dropped, retrying until it is back."""
+    while True:
+        time.sleep(RECONNECT_SECONDS)
+        try:
+            return _listen()
+        except psycopg2.OperationalError as e:
+            print(f"error: database still unreachable: {e}", flush=True)
+        except SystemExit:
+            pass  # The connection error has been printed
+
+
+def wait_for_change(conn, timeout):
+    """
+    Block until a change is notified or the timeout passes.
+
+    render() queries on this same connection, and a notification that
+    arrives with a query's results is queued in conn.notifies without
+    leaving the socket readable. Queued ones are taken first, so select()
+    never sleeps through a change that has already arrived.
+    """
+    conn.poll()
+    if not conn.notifies:
+        ready, _, _ = select.select([conn], [], [], timeout)
+        if not ready:
+            return
+        conn.poll()
+    if conn.notifies:
+        time.sleep(SETTLE_SECONDS + random.uniform(0, SETTLE_JITTER))
+        conn.poll()
+        conn.notifies.clear()
+
+
+def draw():
+    """Replace the screen (when it is one) with a fresh frame."""
+    clear = "\033[H\033[2J" if sys.stdout.isatty() else ""
+    text = render()
+    print(f"{clear}{text}\n\nWaiting for changes (Ctrl-C to quit)", flush=True)
+
+
+def watch(once=False):
+    """
+    Draw, then redraw on every committed change and at midnight.
+
+    Args:
+        once: Draw a single frame and return
+    """
+    open_session()
+    try:
+        conn = _listen()
+        draw()
+        while not once:
+            try:
+                wait_for_change(conn, seconds_until_midnight(datetime.now()))
+            except psycopg2.OperationalError as e:
+                print(f"error: lost the database connection: {e}", flush=True)
+                conn = _relisten()
+            draw()
+        return 0
+    except KeyboardInterrupt:
+        print()
+        return 0
+    finally:
+        close_session()
@@ -0,0 +1,8 @@
+-- MONITORING SCHEMA
+-- Statement statistics for `logos db top-queries`.
+-- Every LogOS statement starts with a query tag, /* logos:<function> */,
+-- which the report uses to name it.
+-- Requires shared_preload_libraries = 'pg_stat_statements' (set in
+-- docker-compose.yml) and a superuser to create the extension.
+
+CREATE EXTENSION IF NOT EXISTS pg_stat_statements;
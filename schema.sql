@@ -5,7 +5,8 @@ CREATE TABLE IF NOT EXISTS liturgical_calendar (
     date DATE PRIMARY KEY,
     fast_type TEXT NOT NULL CHECK (fast_type IN ('none', 'regular', 'strict')),
     feast TEXT,
-    feast_level TEXT
+    feast_level TEXT,
+    season TEXT
 );
 
 CREATE TABLE IF NOT EXISTS passion_ontology (
@@ -22,8 +23,14 @@ CREATE TABLE IF NOT EXISTS confession_log (
     spiritual_father TEXT,
     penance_assigned TEXT,
     penance_completed BOOLEAN DEFAULT FALSE,
+    penance_completed_at TIMESTAMP,
     notes TEXT,
-    created_at TIMESTAMP DEFAULT NOW()
+    -- 'staging' while absolution is being linked in batches
+    status TEXT NOT NULL DEFAULT 'complete' CHECK (status IN ('staging', 'complete')),
+    created_at TIMESTAMP DEFAULT NOW(),
+    search_vector TSVECTOR GENERATED ALWAYS AS (
+        to_tsvector('english', COALESCE(notes, ''))
+    ) STORED
 );
 
 CREATE TABLE IF NOT EXISTS hamartia_log (
@@ -38,9 +45,17 @@ CREATE TABLE IF NOT EXISTS hamartia_log (
     confessed BOOLEAN NOT NULL DEFAULT FALSE,
     confessed_at TIMESTAMP,
     created_at TIMESTAMP NOT NULL DEFAULT NOW(),
-    UNIQUE(date, description)
+    search_vector TSVECTOR GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', description), 'A')
+        || setweight(to_tsvector('english', COALESCE(context, '')), 'B')
+    ) STORED
 );
 
+-- One sin per (date, description), enforced on a 16-byte digest of the
+-- description rather than the full text (bounded index rows, cheap inserts)
+CREATE UNIQUE INDEX IF NOT EXISTS hamartia_log_date_description_digest
+    ON hamartia_log (date, decode(md5(description), 'hex'));
+
 CREATE TABLE IF NOT EXISTS daily_state (
     date DATE PRIMARY KEY,
     prayer_minutes INTEGER DEFAULT 0,
@@ -83,10 +98,19 @@ SELECT
     lc.fast_type,
     lc.feast,
     lc.feast_level,
-    COUNT(CASE WHEN h.confessed = FALSE THEN 1 END) as unconfessed_count
+    -- One indexable branch each: the unconfessed partial indexes, then
+    -- sins under a confession still being recorded ('staging')
+    (SELECT COUNT(*) FROM (
+        SELECT id FROM hamartia_log WHERE confessed = FALSE
+        UNION ALL
+        SELECT h.id
+        FROM confession_log c
+        JOIN hamartia_log h ON h.absolution_id = c.id AND h.confessed = TRUE
+        WHERE c.status = 'staging'
+    ) AS unconfessed) as unconfessed_count
 FROM daily_state ds
 LEFT JOIN liturgical_calendar lc ON lc.date = CURRENT_DATE
-LEFT JOIN hamartia_log h ON h.confessed = FALSE
+WHERE ds.date = CURRENT_DATE
 GROUP BY
     ds.prayer_minutes,
     ds.reading_minutes,
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Insert-throughput benchmark: full-text vs digest uniqueness.
+
+"Prove all things; hold fast that which is good." (1 Thess 5:21)
+
+Inserts the same long descriptions into two temporary copies of
+hamartia_log, one with UNIQUE(date, description) and one with the digest
+index, and reports rows/second and final index size. Temporary tables
+vanish with the session; the real log is never touched.
+
+Usage:
+    python scripts/bench_hamartia_insert.py --rows 20000 --length 2000
+"""
+
+import sys
+import os
+import time
+import random
+import argparse
+import psycopg2
+
+# Ensure we can import from logos
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from logos.db import get_connection
+
+VARIANTS = [
+    ("full-text", "CREATE UNIQUE INDEX {table}_uniq ON {table} (date, description)"),
+    ("digest", "CREATE UNIQUE INDEX {table}_uniq ON {table} (date, decode(md5(description), 'hex'))"),
+]
+
+WORDS = (
+    "anger argument pride acedia vainglory thought heart prayer neglect "
+    "envy judgement word silence tongue eyes screen night morning fast "
+    "sloth despondency irritation brother sister work impatience"
+).split()
+
+
+def make_descriptions(rows, length, seed):
+    """Distinct pseudo-random descriptions of about `length` characters."""
+    rng = random.Random(seed)
+    descriptions = []
+    for i in range(rows):
+        words = [f"#{i}"]
+        size = len(words[0])
+        while size < length:
+            word = rng.choice(WORDS)
+            words.append(word)
+            size += len(word) + 1
+        descriptions.append(" ".join(words)[:length])
+    return descriptions
+
+
+def run_variant(conn, name, index_sql, descriptions, batch):
+    """Insert every description; returns (seconds, index bytes) or an error."""
+    table = f"bench_{name.replace('-', '_')}"
+    cur = conn.cursor()
+    cur.execute(f"""
+        CREATE TEMP TABLE {table} (
+            id SERIAL PRIMARY KEY,
+            date DATE NOT NULL,
+            description TEXT NOT NULL
+        )
+    """)
+    cur.execute(index_sql.format(table=table))
+    conn.commit()
+
+    started = time.perf_counter()
+    try:
+        for i in range(0, len(descriptions), batch):
+            chunk = descriptions[i:i + batch]
+            cur.executemany(
+                f"INSERT INTO {table} (date, description) VALUES (CURRENT_DATE, %s)",
+                [(d,) for d in chunk],
+            )
+            conn.commit()
+    except psycopg2.Error as e:
+        conn.rollback()
+        cur.close()
+        return None, None, str(e).strip().splitlines()[0]
+    elapsed = time.perf_counter() - started
+
+    cur.execute("SELECT pg_relation_size(%s)", (f"{table}_uniq",))
+    index_bytes = cur.fetchone()[0]
+    cur.close()
+    return elapsed, index_bytes, None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark hamartia_log uniqueness strategies")
+    parser.add_argument("--rows", type=int, default=20000, help="Rows to insert per variant")
+    parser.add_argument("--length", type=int, default=2000, help="Description length in characters")
+    parser.add_argument("--batch", type=int, default=500, help="Rows per transaction")
+    parser.add_argument("--seed", type=int, default=1, help="Random seed")
+    args = parser.parse_args()
+
+    descriptions = make_descriptions(args.rows, args.length, args.seed)
+    conn = get_connection()
+
+    print(f"Inserting {args.rows} rows of {args.length} chars, {args.batch} per commit\n")
+    print(f"{'variant':<12}{'rows/s':>10}{'seconds':>10}{'index':>12}")
+    try:
+        for name, index_sql in VARIANTS:
+            elapsed, index_bytes, error = run_variant(conn, name, index_sql, descriptions, args.batch)
+            if error:
+                print(f"{name:<12}  failed: {error}")
+                continue
+            print(f"{name:<12}{args.rows / elapsed:>10.0f}{elapsed:>10.2f}"
+                  f"{index_bytes / 1024 / 1024:>10.1f}MB")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Startup benchmark for `logos prompt`.
+
+"Be sober, be vigilant." (1 Peter 5:8)
+
+Runs the prompt against a fresh snapshot (so no refresh is spawned) and
+compares it with a bare interpreter start, so the cost the prompt adds to
+every prompt draw is visible on its own. Also checks that psycopg2,
+logos.alignment and argparse stay out of the hot path.
+
+Usage:
+    python scripts/bench_prompt.py --runs 50
+"""
+
+import sys
+import os
+import time
+import tempfile
+import argparse
+import statistics
+import subprocess
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+PROMPT = os.path.join(ROOT, 'logos', 'prompt.py')
+
+# Imports and runs the prompt in-process, reporting its own cost in ms
+IN_PROCESS = """
+import sys, time
+started = time.perf_counter()
+sys.path.insert(0, {root!r})
+from logos.prompt import main
+main([])
+elapsed = (time.perf_counter() - started) * 1000
+heavy = [m for m in ('psycopg2', 'logos.alignment', 'logos.cli', 'argparse') if m in sys.modules]
+print(elapsed, ' '.join(heavy), file=sys.stderr)
+"""
+
+
+def time_runs(cmd, env, runs):
+    """Wall-clock milliseconds per run."""
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run(cmd, env=env, cwd=ROOT, stdout=subprocess.DEVNULL, check=True)
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark logos prompt startup")
+    parser.add_argument("--runs", type=int, default=50, help="Runs per measurement")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        snapshot = os.path.join(tmp, "prompt")
+        with open(snapshot, "w") as f:
+            f.write(f"42 DEGRADED 3 {time.time():.0f}\n")
+        env = dict(os.environ, LOGOS_PROMPT_SNAPSHOT=snapshot, LOGOS_PROMPT_TTL="3600")
+
+        in_process = []
+        for _ in range(args.runs):
+            probe = subprocess.run(
+                [sys.executable, "-S", "-c", IN_PROCESS.format(root=ROOT)],
+                env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, check=True,
+            )
+            fields = probe.stderr.split()
+            if fields[1:]:
+                print(f"error: hot path imported {', '.join(fields[1:])}")
+                return 1
+            in_process.append(float(fields[0]))
+
+        rows = [
+            ("python3 -S -c pass", time_runs([sys.executable, "-S", "-c", "pass"], env, args.runs)),
+            ("python3 -S prompt.py", time_runs([sys.executable, "-S", PROMPT], env, args.runs)),
+            ("python3 -m logos prompt", time_runs([sys.executable, "-m", "logos", "prompt"], env, args.runs)),
+        ]
+
+    print(f"{'':<26}{'median':>9}{'min':>9}")
+    for label, samples in rows:
+        print(f"{label:<26}{statistics.median(samples):>7.1f}ms{min(samples):>7.1f}ms")
+    print(f"{'in-process (import+read)':<26}{statistics.median(in_process):>7.2f}ms{min(in_process):>7.2f}ms")
+
+    added = statistics.median(rows[1][1]) - statistics.median(rows[0][1])
+    print(f"\nAdded to interpreter start by prompt.py: {added:.1f}ms (median)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
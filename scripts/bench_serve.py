@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Load test for `logos serve`.
+
+"Prove all things; hold fast that which is good." (1 Thess 5:21)
+
+Opens --concurrency keep-alive connections to a running server and sends
+--requests requests in total, then reports requests/second and latency
+percentiles. Start the server against a local Postgres first:
+
+    logos serve --workers 8 &
+    python scripts/bench_serve.py --requests 5000 --concurrency 32
+    python scripts/bench_serve.py --method POST --path /ascetic/read --body '{"minutes": 1}'
+
+Standard library only. POSTs write real rows (e.g. reading minutes); run
+them against a scratch database.
+"""
+
+import os
+import json
+import time
+import asyncio
+import argparse
+
+
+def percentile(sorted_values, p):
+    """Nearest-rank percentile of an ascending list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(int(round(p / 100 * len(sorted_values))) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+def build_request(method, host, path, body, token):
+    data = body.encode() if body else b""
+    headers = [
+        f"{method} {path} HTTP/1.1",
+        f"Host: {host}",
+        "Connection: keep-alive",
+        f"Content-Length: {len(data)}",
+    ]
+    if data:
+        headers.append("Content-Type: application/json")
+    if token:
+        headers.append(f"Authorization: Bearer {token}")
+    return ("\r\n".join(headers) + "\r\n\r\n").encode() + data
+
+
+async def read_response(reader):
+    """Status code of one response (the body is read and discarded)."""
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionError("server closed the connection")
+    status = int(status_line.split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        if name.strip().lower() == "content-length":
+            length = int(value)
+    await reader.readexactly(length)
+    return status
+
+
+async def client(host, port, request, remaining, latencies, statuses):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while remaining[0] > 0:
+            remaining[0] -= 1
+            started = time.perf_counter()
+            writer.write(request)
+            await writer.drain()
+            status = await read_response(reader)
+            latencies.append((time.perf_counter() - started) * 1000)
+            statuses[status] = statuses.get(status, 0) + 1
+    finally:
+        writer.close()
+
+
+async def run(args):
+    request = build_request(args.method, args.host, args.path, args.body,
+                            os.environ.get("LOGOS_API_TOKEN"))
+    remaining = [args.requests]
+    latencies, statuses = [], {}
+    started = time.perf_counter()
+    await asyncio.gather(*(
+        client(args.host, args.port, request, remaining, latencies, statuses)
+        for _ in range(args.concurrency)
+    ))
+    return time.perf_counter() - started, sorted(latencies), statuses
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test a running logos serve")
+    parser.add_argument("--host", default="127.0.0.1", help="Server host")
+    parser.add_argument("--port", type=int, default=8765, help="Server port")
+    parser.add_argument("--method", default="GET", help="HTTP method")
+    parser.add_argument("--path", default="/health", help="Request path")
+    parser.add_argument("--body", help="JSON body (for POST)")
+    parser.add_argument("--requests", type=int, default=2000, help="Total requests")
+    parser.add_argument("--concurrency", type=int, default=16, help="Keep-alive connections")
+    args = parser.parse_args()
+
+    if args.body:
+        json.loads(args.body)  # fail before sending anything
+
+    elapsed, latencies, statuses = asyncio.run(run(args))
+    print(f"{args.method} {args.path}: {len(latencies)} requests, "
+          f"{args.concurrency} connections, {elapsed:.2f}s")
+    print(f"  Throughput: {len(latencies) / elapsed:,.0f} requests/s")
+    print(f"  Latency ms: p50 {percentile(latencies, 50):.2f}"
+          f"  p90 {percentile(latencies, 90):.2f}"
+          f"  p99 {percentile(latencies, 99):.2f}"
+          f"  max {latencies[-1] if latencies else 0:.2f}")
+    print("  Statuses: " + ", ".join(f"{code} x{count}" for code, count in sorted(statuses.items())))
+
+
+if __name__ == "__main__":
+    main()
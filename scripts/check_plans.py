@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+Query plan regression check.
+
+"Let us search and try our ways." (Lamentations 3:40)
+
+Plans the hot statements (reads and writes) registered in logos/plans.py (HOT_STATEMENTS)
+with EXPLAIN against a large dataset, and compares each plan with its
+baseline in plan_baselines.json. Exits 1 when a statement has newly
+become a sequential scan or an unindexed nested-loop self-join on a
+large table, or can no longer be planned. Nothing is executed: plans
+only, in a transaction that is rolled back.
+
+Run against a scratch database, never the real log:
+
+    LOGOS_DB_NAME=logos_plans bash scripts/init_db.sh
+    (then agenda_schema.sql, derived_schema.sql and scripts/migrate_v4.py)
+    LOGOS_DB_NAME=logos_plans python scripts/check_plans.py --generate
+    LOGOS_DB_NAME=logos_plans python scripts/check_plans.py --update   # accept plans
+    LOGOS_DB_NAME=logos_plans python scripts/check_plans.py            # check
+
+--generate fills the source tables with years of synthetic days,
+rebuilds the derived structures and runs ANALYZE. It refuses a database
+that already holds sins.
+"""
+
+import sys
+import os
+import argparse
+import psycopg2
+
+# Ensure we can import from logos
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from logos.db import get_connection
+from logos.approx import rebuild_sketches
+from logos.baseline import rebuild_baselines
+from logos import plans
+
+SEASONS = ("Ordinary", "Nativity Fast", "Great Lent", "Pascha", "Apostles Fast", "Dormition Fast")
+
+GENERATE = [
+    ("liturgical calendar", """
+        INSERT INTO liturgical_calendar (date, fast_type, season)
+        SELECT d::date,
+               (ARRAY['none', 'regular', 'strict'])[1 + EXTRACT(DOW FROM d)::INTEGER %% 3],
+               (%(seasons)s::TEXT[])[1 + EXTRACT(MONTH FROM d)::INTEGER %% cardinality(%(seasons)s::TEXT[])]
+        FROM generate_series(CURRENT_DATE - %(days)s, CURRENT_DATE, INTERVAL '1 day') AS d
+        ON CONFLICT (date) DO NOTHING
+    """),
+    ("daily state", """
+        INSERT INTO daily_state (date, prayer_minutes, reading_minutes, screen_time_minutes,
+                                 prayer_interruptions, screen_time_work, screen_time_social,
+                                 screen_time_entertainment, screen_time_edifying,
+                                 fasted, prayed, updated_at)
+        SELECT d::date, n %% 60, n %% 45, n %% 300, n %% 5, n %% 120, n %% 90, n %% 60, n %% 30,
+               n %% 3 = 0, n %% 4 <> 0, d + INTERVAL '21 hours'
+        FROM generate_series(CURRENT_DATE - %(days)s, CURRENT_DATE - 1, INTERVAL '1 day')
+             WITH ORDINALITY AS g(d, n)
+        ON CONFLICT (date) DO NOTHING
+    """),
+    ("daily work state", """
+        INSERT INTO daily_work_state (date, deep_work_creative, deep_work_analytical,
+                                      deep_work_learning, shallow_work_necessary,
+                                      shallow_work_admin, shallow_work_waste,
+                                      encroached_prayer, updated_at)
+        SELECT d::date, n %% 120, n %% 90, n %% 60, n %% 45, n %% 30, n %% 75,
+               n %% 7 = 0, d + INTERVAL '18 hours'
+        FROM generate_series(CURRENT_DATE - %(days)s, CURRENT_DATE - 1, INTERVAL '1 day')
+             WITH ORDINALITY AS g(d, n)
+        ON CONFLICT (date) DO NOTHING
+    """),
+    ("confessions", """
+        INSERT INTO confession_log (date, spiritual_father, penance_assigned,
+                                    penance_completed, penance_completed_at, notes,
+                                    status, created_at)
+        SELECT d::date, 'Fr. Generated', 'Psalm 50 daily', TRUE,
+               d + INTERVAL '7 days', 'Generated confession ' || n, 'complete',
+               d + INTERVAL '10 hours'
+        FROM generate_series(date_trunc('month', CURRENT_DATE - %(days)s) + INTERVAL '1 month',
+                             CURRENT_DATE, INTERVAL '1 month') WITH ORDINALITY AS g(d, n)
+    """),
+    # Ids, dates and created_at rise together, as in an append-only log.
+    # Sins before this month are absolved by the next month's confession.
+    ("sins", """
+        WITH passions AS (
+            SELECT id, name, ROW_NUMBER() OVER (ORDER BY id) - 1 AS k,
+                   COUNT(*) OVER () AS total
+            FROM passion_ontology
+        ), sins AS (
+            SELECT n, CURRENT_DATE - %(days)s + ((n - 1) / %(per_day)s)::INTEGER AS date
+            FROM generate_series(1, (%(days)s + 1) * %(per_day)s) AS n
+        )
+        INSERT INTO hamartia_log (date, description, passions, passion_id, context,
+                                  absolution_id, confessed, confessed_at, created_at)
+        SELECT s.date, 'generated sin ' || s.n || ' argument neglect of prayer',
+               p.name, p.id, 'context ' || s.n %% 17,
+               c.id, c.id IS NOT NULL, c.created_at,
+               s.date + (((s.n - 1) %% %(per_day)s) * 86000 / %(per_day)s) * INTERVAL '1 second'
+        FROM sins s
+        JOIN passions p ON p.k = (s.n * 7919) %% p.total
+        LEFT JOIN confession_log c
+               ON c.date = (date_trunc('month', s.date) + INTERVAL '1 month')::date
+    """),
+    ("lineage", """
+        UPDATE hamartia_log child
+        SET parent_sin_id = child.id - 1
+        WHERE child.id %% 10 = 0
+          AND child.id > (SELECT MIN(id) FROM hamartia_log)
+    """),
+    ("commitments", """
+        INSERT INTO commitment_log (date, description, type, committed_minutes, status,
+                                    actual_minutes, failure_passion, created_at, updated_at)
+        SELECT d::date, 'generated commitment ' || n,
+               (ARRAY['deep', 'shallow', 'admin'])[1 + n %% 3], 30 + n %% 90,
+               (ARRAY['completed', 'completed', 'abandoned'])[1 + n %% 3],
+               n %% 90, CASE WHEN n %% 3 = 2 THEN 'Acedia' END,
+               d + INTERVAL '9 hours', d + INTERVAL '17 hours'
+        FROM generate_series(CURRENT_DATE - %(days)s, CURRENT_DATE - 1, INTERVAL '1 day') AS d,
+             generate_series(1, 4) AS n
+    """),
+    ("context events", """
+        INSERT INTO context_events (date, timestamp, from_type, to_type, trigger_passion,
+                                    resumption_lag_minutes)
+        SELECT d::date, d + n * INTERVAL '50 minutes', 'deep', 'shallow',
+               CASE WHEN n %% 2 = 0 THEN 'Acedia' END, n %% 20
+        FROM generate_series(CURRENT_DATE - %(days)s, CURRENT_DATE - 1, INTERVAL '1 day') AS d,
+             generate_series(1, 10) AS n
+    """),
+    ("derived tables", """
+        SELECT rebuild_hamartia_lineage(), rebuild_passion_transitions(),
+               rebuild_liturgical_seasons()
+    """),
+]
+
+
+def generate(conn, days, per_day):
+    cur = conn.cursor()
+    cur.execute("SELECT EXISTS (SELECT 1 FROM hamartia_log), EXISTS (SELECT 1 FROM passion_ontology)")
+    has_sins, has_passions = cur.fetchone()
+    if has_sins:
+        print("error: hamartia_log is not empty; generate only into a scratch database")
+        raise SystemExit(1)
+    if not has_passions:
+        print("error: passion_ontology is empty; run scripts/migrate_v4.py first")
+        raise SystemExit(1)
+
+    params = {"days": days, "per_day": per_day, "seasons": list(SEASONS)}
+    for label, statement in GENERATE:
+        print(f"Generating {label}...", end='', flush=True)
+        cur.execute(statement, params)
+        print(" Done.")
+    conn.commit()
+
+    print("Rebuilding sketches and baselines...", end='', flush=True)
+    rebuild_sketches(conn)
+    rebuild_baselines(conn)
+    print(" Done.")
+
+    print("Analyzing...", end='', flush=True)
+    cur.execute("ANALYZE")
+    conn.commit()
+    cur.close()
+    print(" Done.\n")
+
+
+def plan_all(conn, statements, large):
+    """Plan every plannable statement: (results, failures, skipped)."""
+    results = {}
+    failures = {}
+    skipped = 0
+    cur = conn.cursor()
+    try:
+        cur.execute("SET LOCAL plan_cache_mode = force_generic_plan")
+        for statement in statements:
+            if plans.statement_kind(statement["sql"]) not in plans.PLANNABLE:
+                skipped += 1
+                continue
+            try:
+                plan = plans.plan_statement(cur, statement)
+            except psycopg2.Error as e:
+                failures[statement["id"]] = (statement["source"], str(e).strip().splitlines()[0])
+                continue
+            results[statement["id"]] = {
+                "sql": plans.digest(statement["sql"]),
+                "shape": plans.shape(plan),
+                "hazards": plans.hazards(plan, large),
+            }
+    finally:
+        conn.rollback()
+        cur.close()
+    return results, failures, skipped
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check SQL plans against their baselines")
+    parser.add_argument("--generate", action="store_true",
+                        help="Fill an empty scratch database with a large dataset first")
+    parser.add_argument("--years", type=int, default=10, help="Years of days to generate")
+    parser.add_argument("--sins-per-day", type=int, default=40, help="Sins per generated day")
+    parser.add_argument("--min-rows", type=int, default=plans.LARGE_ROWS,
+                        help="Rows at which a table counts as large")
+    parser.add_argument("--daily-rows", type=int, default=plans.DAILY_ROWS,
+                        help="Rows at which a one-row-per-day table counts as large")
+    parser.add_argument("--baseline", default=plans.BASELINE_PATH, help="Baseline file")
+    parser.add_argument("--update", action="store_true",
+                        help="Accept the current plans (and their hazards) as the baseline")
+    args = parser.parse_args()
+
+    conn = get_connection()
+    try:
+        if args.generate:
+            generate(conn, args.years * 365, args.sins_per_day)
+
+        cur = conn.cursor()
+        large = plans.large_tables(cur, args.min_rows, args.daily_rows)
+        cur.close()
+        conn.rollback()
+        if not large:
+            print(f"error: no table has {args.min_rows} rows; plans on small tables prove nothing "
+                  f"(generate a dataset with --generate)")
+            raise SystemExit(1)
+
+        results, failures, skipped = plan_all(conn, plans.hot_statements(), large)
+    finally:
+        conn.close()
+
+    print(f"Large tables: {', '.join(sorted(large))}")
+    print(f"Planned {len(results)} statements; skipped {skipped} that EXPLAIN cannot plan.")
+
+    failed = False
+    if failures:
+        failed = True
+        print("\nCould not be planned:")
+        for statement_id, (source, error) in sorted(failures.items()):
+            print(f"  {statement_id} ({source}): {error}")
+
+    if args.update:
+        plans.save_baseline(results, args.baseline)
+        accepted = sum(len(r["hazards"]) for r in results.values())
+        print(f"\nBaseline written to {args.baseline} ({accepted} hazards accepted).")
+        if failed:
+            raise SystemExit(1)
+        return
+
+    baseline = plans.load_baseline(args.baseline)
+    if baseline is None:
+        print(f"\nerror: no baseline at {args.baseline}; run with --update to write one")
+        raise SystemExit(1)
+
+    regressions, notes = plans.compare(results, baseline)
+    if notes:
+        print("\nChanged (run with --update to accept):")
+        for statement_id, message in notes:
+            print(f"  {statement_id}: {message}")
+    if regressions:
+        failed = True
+        print("\nRegressions:")
+        for statement_id, message in regressions:
+            print(f"  {statement_id}: {message}")
+            for line in results[statement_id]["shape"]:
+                print(f"      {line}")
+
+    if failed:
+        raise SystemExit(1)
+    print("\nNo plan regressions.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+LogOS Phase 5 Migration: Derived Structures.
+
+"Let all things be done decently and in order." (1 Cor 14:40)
+
+Applies derived_schema.sql to an existing database. The derived schema holds
+maintained structures (caches, aggregates) computed from the source-of-truth
+tables. It never alters the truth itself, and every statement is idempotent.
+"""
+
+import sys
+import os
+
+# Ensure we can import from logos
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from logos.db import get_connection
+from logos.approx import rebuild_sketches
+from logos.baseline import rebuild_baselines
+
+DERIVED_SCHEMA = os.path.join(os.path.dirname(__file__), '..', 'derived_schema.sql')
+
+
+def migrate():
+    conn = get_connection()
+    cur = conn.cursor()
+
+    print("Applying derived schema...")
+    with open(DERIVED_SCHEMA) as f:
+        cur.execute(f.read())
+
+    conn.commit()
+
+    # Backfill maintained structures on first application
+    cur.execute("SELECT COUNT(*) FROM pattern_sketches")
+    if cur.fetchone()[0] == 0:
+        print("Backfilling pattern sketches...", end='', flush=True)
+        buckets = rebuild_sketches(conn)
+        print(f" Done ({buckets} buckets).")
+
+    cur.execute("SELECT COUNT(*) FROM baseline_cursor")
+    if cur.fetchone()[0] == 0:
+        print("Backfilling metric baselines...", end='', flush=True)
+        days = rebuild_baselines(conn)
+        print(f" Done ({days} days).")
+
+    print("Derived structures in place.")
+    cur.close()
+    conn.close()
+
+
+if __name__ == "__main__":
+    try:
+        migrate()
+    except Exception as e:
+        print(f"Migration failed: {e}")
+        sys.exit(1)
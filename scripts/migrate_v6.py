@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+LogOS Phase 6 Migration: Digest-Backed Uniqueness.
+
+"Let your yes be yes, and your no, no." (Matthew 5:37)
+
+UNIQUE(date, description) indexed the full description text: the B-tree
+grew with every long entry, slowed every insert, and rejected descriptions
+past the index row size limit. The same guarantee is now enforced on
+(date, md5 digest of description).
+
+The migration is online. The digest index is built CONCURRENTLY (writes
+continue), and only then is the old constraint dropped, under a short
+lock timeout. At every moment one of the two enforces uniqueness.
+Re-running is safe; an invalid index left by an interrupted build is
+dropped and rebuilt.
+"""
+
+import sys
+import os
+import time
+import psycopg2
+
+# Ensure we can import from logos
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from logos.db import get_connection
+
+DIGEST_INDEX = "hamartia_log_date_description_digest"
+OLD_CONSTRAINT = "hamartia_log_date_description_key"
+
+LOCK_TIMEOUT = "5s"
+DROP_ATTEMPTS = 5
+
+
+def _index_state(cur):
+    """None if the digest index is missing, else whether it is valid."""
+    cur.execute("""
+        SELECT i.indisvalid
+        FROM pg_index i
+        JOIN pg_class c ON c.oid = i.indexrelid
+        WHERE c.relname = %s
+    """, (DIGEST_INDEX,))
+    row = cur.fetchone()
+    return row[0] if row else None
+
+
+def migrate():
+    conn = get_connection()
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+    conn.autocommit = True
+    cur = conn.cursor()
+
+    state = _index_state(cur)
+    if state is False:
+        print("Dropping invalid digest index from an interrupted build...")
+        cur.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {DIGEST_INDEX}")
+        state = None
+
+    if state is None:
+        print("Building digest index concurrently...", end='', flush=True)
+        cur.execute(f"""
+            CREATE UNIQUE INDEX CONCURRENTLY {DIGEST_INDEX}
+            ON hamartia_log (date, decode(md5(description), 'hex'))
+        """)
+        print(" Done.")
+
+    cur.execute("""
+        SELECT 1 FROM pg_constraint
+        WHERE conname = %s AND conrelid = 'hamartia_log'::regclass
+    """, (OLD_CONSTRAINT,))
+    if cur.fetchone():
+        print("Dropping full-text uniqueness constraint...", end='', flush=True)
+        cur.execute(f"SET lock_timeout = '{LOCK_TIMEOUT}'")
+        for attempt in range(1, DROP_ATTEMPTS + 1):
+            try:
+                cur.execute(f"ALTER TABLE hamartia_log DROP CONSTRAINT IF EXISTS {OLD_CONSTRAINT}")
+                break
+            except psycopg2.errors.LockNotAvailable:
+                if attempt == DROP_ATTEMPTS:
+                    raise
+                time.sleep(attempt)
+        print(" Done.")
+
+    print("Uniqueness enforced on (date, digest(description)).")
+    cur.close()
+    conn.close()
+
+
+if __name__ == "__main__":
+    try:
+        migrate()
+    except Exception as e:
+        print(f"Migration failed: {e}")
+        sys.exit(1)
@@ -13,18 +13,47 @@ import os
 # Ensure we can import from logos
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
-from logos.db import get_connection
+from logos.db import get_connection, bump_data_version
 
-# Paschalion calculation (simplified - full version would use Orthodox Easter algorithm)
-GREAT_LENT_2026 = (date(2026, 3, 2), date(2026, 4, 18))
-APOSTLES_FAST_2026 = (date(2026, 6, 1), date(2026, 6, 28))
 DORMITION_FAST = (8, 1, 8, 14)  # Aug 1-14 every year
 NATIVITY_FAST = (11, 28, 12, 24)  # Nov 28 - Dec 24 every year
+APOSTLES_FAST_END = (6, 28)  # Eve of Sts Peter and Paul
+
+
+def orthodox_pascha(year: int) -> date:
+    """Orthodox Pascha: the Julian computus (Meeus), moved to the Gregorian calendar."""
+    a = year % 4
+    b = year % 7
+    c = year % 19
+    d = (19 * c + 15) % 30
+    e = (2 * a + 4 * b - d + 34) % 7
+    month, day = divmod(d + e + 114, 31)
+    julian_offset = year // 100 - year // 400 - 2  # 13 days from 1900 to 2099
+    return date(year, month, day + 1) + timedelta(days=julian_offset)
+
+
+def movable_fasts(year: int):
+    """
+    The fasts that follow Pascha in a given year.
+
+    Returns:
+        tuple: (great_lent, apostles_fast), each a (first, last) date pair.
+               Great Lent runs from Clean Monday through Holy Saturday.
+               The Apostles' Fast starts the Monday after All Saints and
+               is empty in years when Pascha falls late.
+    """
+    pascha = orthodox_pascha(year)
+    great_lent = (pascha - timedelta(days=48), pascha - timedelta(days=1))
+    apostles_fast = (pascha + timedelta(days=57), date(year, *APOSTLES_FAST_END))
+    return great_lent, apostles_fast
+
 
 def get_fast_type(d: date) -> str:
     """Determine fast type for given date."""
+    great_lent, _ = movable_fasts(d.year)
+
     # Great Lent (strict)
-    if GREAT_LENT_2026[0] <= d <= GREAT_LENT_2026[1]:
+    if great_lent[0] <= d <= great_lent[1]:
         return 'strict'
     
     # Wednesday/Friday (regular)
@@ -42,6 +71,25 @@ def get_fast_type(d: date) -> str:
     
     return 'none'
 
+def get_season(d: date) -> str:
+    """Determine the liturgical season for given date."""
+    great_lent, apostles_fast = movable_fasts(d.year)
+
+    if great_lent[0] <= d <= great_lent[1]:
+        return 'Great Lent'
+    
+    if apostles_fast[0] <= d <= apostles_fast[1]:
+        return "Apostles' Fast"
+    
+    if d.month == DORMITION_FAST[0] and DORMITION_FAST[1] <= d.day <= DORMITION_FAST[3]:
+        return 'Dormition Fast'
+    
+    if (d.month == NATIVITY_FAST[0] and d.day >= NATIVITY_FAST[1]) or \
+       (d.month == NATIVITY_FAST[2] and d.day <= NATIVITY_FAST[3]):
+        return 'Nativity Fast'
+    
+    return 'Ordinary Time'
+
 def populate_year(year: int):
     """Populate entire year."""
     conn = get_connection()
@@ -56,16 +104,29 @@ def populate_year(year: int):
     count = 0
     while current <= end:
         cur.execute("""
-            INSERT INTO liturgical_calendar (date, fast_type)
-            VALUES (%s, %s)
-            ON CONFLICT (date) DO UPDATE SET fast_type = EXCLUDED.fast_type
-        """, (current, get_fast_type(current)))
+            INSERT INTO liturgical_calendar (date, fast_type, season)
+            VALUES (%s, %s, %s)
+            ON CONFLICT (date) DO UPDATE
+            SET fast_type = EXCLUDED.fast_type, season = EXCLUDED.season
+        """, (current, get_fast_type(current), get_season(current)))
         current += timedelta(days=1)
         count += 1
     
     conn.commit()
     print(f" Done ({count} days).")
 
+def refresh_seasons():
+    """Rebuild the season range table from the calendar."""
+    conn = get_connection()
+    cur = conn.cursor()
+    cur.execute("SELECT rebuild_liturgical_seasons()")
+    # The calendar feeds health (fast type, feast)
+    bump_data_version(cur)
+    conn.commit()
+    cur.close()
+    conn.close()
+
 if __name__ == "__main__":
     populate_year(2026)
     populate_year(2027)  # Stay ahead
+    refresh_seasons()
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Tests for the Welford personal baselines.
+
+Run with: python -m pytest tests/test_baseline.py
+"""
+
+import sys
+import os
+import random
+import statistics
+
+# Add logos to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from logos.baseline import welford_update, stddev, z_score, MIN_DAYS
+
+
+def test_welford_matches_two_pass():
+    """Streaming mean/stddev agree with the two-pass statistics module."""
+    rng = random.Random(7)
+    values = [rng.randint(0, 240) for _ in range(400)]
+    n, mean, m2 = 0, 0.0, 0.0
+    for value in values:
+        n, mean, m2 = welford_update(n, mean, m2, value)
+
+    assert n == len(values)
+    assert abs(mean - statistics.mean(values)) < 1e-9
+    assert abs(stddev(n, m2) - statistics.stdev(values)) < 1e-9
+    print("✓ test_welford_matches_two_pass passed")
+
+
+def test_z_score_requires_history():
+    """No verdict until MIN_DAYS are folded or when variance is zero."""
+    n, mean, m2 = 0, 0.0, 0.0
+    for value in [30] * (MIN_DAYS - 1) + [31]:
+        n, mean, m2 = welford_update(n, mean, m2, value)
+    assert z_score(300, n - 1, mean, m2) is None  # Too few days
+    assert z_score(300, n, mean, m2) > 3.0
+
+    flat = (MIN_DAYS, 30.0, 0.0)
+    assert z_score(300, *flat) is None  # Zero variance
+    assert stddev(1, 0.0) is None
+    print("✓ test_z_score_requires_history passed")
+
+
+if __name__ == "__main__":
+    test_welford_matches_two_pass()
+    test_z_score_requires_history()
+
+    print("\n✓ All tests passed")
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Tests for batch mode parsing and reporting.
+
+Run with: python -m pytest tests/test_batch.py
+"""
+
+import sys
+import os
+
+# Add logos to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from logos.batch import read_commands, run_command, format_report
+
+
+def test_read_commands_uses_cli_grammar():
+    """Lines split like a shell; blanks and comments are skipped."""
+    commands = read_commands([
+        "# morning",
+        "ascetic pray --minutes 20",
+        "",
+        'log add --passion Anger --description "sharp word, at lunch" --yes  # replayed',
+    ])
+    assert commands == [
+        (2, ["ascetic", "pray", "--minutes", "20"]),
+        (4, ["log", "add", "--passion", "Anger", "--description", "sharp word, at lunch", "--yes"]),
+    ]
+
+    for bad in (['log add --description "unclosed'], ["shell"],
+                ["log confess --father Fr. --penance Psalm"]):
+        try:
+            read_commands(bad)
+        except ValueError as e:
+            assert str(e).startswith("line 1:")
+        else:
+            raise AssertionError(f"accepted {bad}")
+    print("✓ test_read_commands_uses_cli_grammar passed")
+
+
+def test_invalid_line_fails_without_exiting():
+    """An argparse error is a failed line, not the end of the batch."""
+    args, code = run_command(["ascetic", "pray", "--minutes", "many"])
+    assert args is None and code == 2
+    print("✓ test_invalid_line_fails_without_exiting passed")
+
+
+def test_format_report_counts_lines():
+    report = {
+        "results": [(1, ["ascetic", "read", "--minutes", "15"], 0, 1.5),
+                    (2, ["work", "--minutes", "x"], 2, 0.5)],
+        "committed": False,
+        "mutated": False,
+        "elapsed_ms": 2.0,
+    }
+    text = format_report(report, total=3)
+    assert "2 of 3 line(s) run, 1 failed; rolled back (single transaction)" in text
+    assert "(1 line(s) not run)" in text
+    assert "1000 commands/s" in text
+    print("✓ test_format_report_counts_lines passed")
+
+
+if __name__ == "__main__":
+    test_read_commands_uses_cli_grammar()
+    test_invalid_line_fails_without_exiting()
+    test_format_report_counts_lines()
+
+    print("\n✓ All tests passed")
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Tests for the correlation engine (pure computation, no database).
+
+Run with: python -m pytest tests/test_correlation.py
+"""
+
+import sys
+import os
+
+# Add logos to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from logos.correlation import pearson, compute_correlations, METRICS, TARGETS, TOTAL
+
+
+def _data(length, metric_fn, sin_fn):
+    return {
+        "metrics": {m: [metric_fn(i) for i in range(length)] for m in METRICS},
+        "sins": {t: [sin_fn(i) for i in range(length)] for t in TARGETS},
+    }
+
+
+def test_pearson_perfect():
+    """Perfectly linear series correlate at +1 / -1."""
+    r, n = pearson([1, 2, 3, 4], [2, 4, 6, 8])
+    assert n == 4
+    assert abs(r - 1.0) < 1e-9
+    r, n = pearson([1, 2, 3, 4], [8, 6, 4, 2])
+    assert abs(r + 1.0) < 1e-9
+    print("✓ test_pearson_perfect passed")
+
+
+def test_pearson_skips_missing():
+    """Days without recorded state are skipped, not treated as zero."""
+    r, n = pearson([1, None, 3, 4, 5], [1, 100, 3, 4, 5])
+    assert n == 4
+    assert abs(r - 1.0) < 1e-9
+    print("✓ test_pearson_skips_missing passed")
+
+
+def test_pearson_zero_variance():
+    """A constant series has no correlation."""
+    r, n = pearson([5, 5, 5, 5], [1, 2, 3, 4])
+    assert r is None
+    assert n == 4
+    print("✓ test_pearson_zero_variance passed")
+
+
+def test_lagged_correlation():
+    """Sins following the metric by one day show up at lag 1, not lag 0."""
+    pattern = [0, 90, 0, 0, 120, 0, 30, 0, 0, 60] * 40
+    length = len(pattern)
+    data = _data(length, lambda i: pattern[i], lambda i: pattern[i - 1] // 30 if i > 0 else 0)
+
+    results = compute_correlations(data, windows=(30,), lags=(0, 1))
+    by_lag = {
+        r["lag"]: r for r in results
+        if r["metric"] == "screen_time_entertainment" and r["target"] == TOTAL
+    }
+    assert abs(by_lag[1]["r"] - 1.0) < 1e-9
+    assert by_lag[1]["n"] == 30
+    assert by_lag[0]["r"] < 0.5
+    print("✓ test_lagged_correlation passed")
+
+
+def test_result_shape():
+    """One result per (window, metric, target, lag)."""
+    data = _data(400, lambda i: i % 7, lambda i: i % 3)
+    results = compute_correlations(data)
+    assert len(results) == 3 * len(METRICS) * len(TARGETS) * 3
+    print("✓ test_result_shape passed")
+
+
+if __name__ == "__main__":
+    test_pearson_perfect()
+    test_pearson_skips_missing()
+    test_pearson_zero_variance()
+    test_lagged_correlation()
+    test_result_shape()
+
+    print("\n✓ All tests passed")
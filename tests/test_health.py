@@ -13,7 +13,7 @@ Run with: python -m pytest tests/test_health.py
 
 import sys
 import os
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch
 from datetime import date
 
 # Add logos to path
@@ -22,6 +22,14 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 from logos.cli import cmd_health, format_health_output
 from logos.alignment import calculate_system_state
 
+NO_PATTERNS = {"dominant_passion": None, "peak_time": None,
+               "causal_chain": None, "screen_correlation": False}
+
+
+def diagnostic(state):
+    """An alignment report as calculate_system_state returns it."""
+    return {"state": state, "diagnosis": "Test", "counsel": "Test counsel.", "metrics": None}
+
 
 def test_health_output_stable():
     """Test health output formatting for STABLE state."""
@@ -38,7 +46,7 @@ def test_health_output_stable():
         "unconfessed_count": 0,
     }
     
-    output = format_health_output("STABLE", health_data)
+    output = format_health_output(diagnostic("STABLE"), health_data)
     assert "● System: STABLE" in output
     assert "Prayer: 120 min" in output
     assert "Screen: 0 min" in output
@@ -61,7 +69,7 @@ def test_health_output_degraded():
         "unconfessed_count": 0,
     }
     
-    output = format_health_output("DEGRADED", health_data)
+    output = format_health_output(diagnostic("DEGRADED"), health_data)
     assert "◐ System: DEGRADED" in output
     assert "Warnings:" in output
     print("✓ test_health_output_degraded passed")
@@ -82,7 +90,8 @@ def test_health_output_critical():
         "unconfessed_count": 5,
     }
     
-    output = format_health_output("CRITICAL", health_data)
+    with patch("logos.patterns.analyze_hamartia_patterns", return_value=NO_PATTERNS):
+        output = format_health_output(diagnostic("CRITICAL"), health_data)
     assert "✕ System: CRITICAL" in output
     assert "Warnings:" in output
     assert "Hamartia buffer critical" in output
@@ -105,7 +114,7 @@ def test_alignment_stable():
     }
     unconfessed_count = 0
     
-    state = calculate_system_state(daily_state, liturgical_context, unconfessed_count)
+    state = calculate_system_state(daily_state, liturgical_context, unconfessed_count)["state"]
     assert state == "STABLE"
     print("✓ test_alignment_stable passed")
 
@@ -126,7 +135,7 @@ def test_alignment_critical_hamartia():
     }
     unconfessed_count = 5
     
-    state = calculate_system_state(daily_state, liturgical_context, unconfessed_count)
+    state = calculate_system_state(daily_state, liturgical_context, unconfessed_count)["state"]
     assert state == "CRITICAL"
     print("✓ test_alignment_critical_hamartia passed")
 
@@ -147,7 +156,7 @@ def test_alignment_critical_strict_fast():
     }
     unconfessed_count = 0
     
-    state = calculate_system_state(daily_state, liturgical_context, unconfessed_count)
+    state = calculate_system_state(daily_state, liturgical_context, unconfessed_count)["state"]
     assert state == "CRITICAL"
     print("✓ test_alignment_critical_strict_fast passed")
 
@@ -168,7 +177,7 @@ def test_alignment_degraded_no_prayer():
     }
     unconfessed_count = 0
     
-    state = calculate_system_state(daily_state, liturgical_context, unconfessed_count)
+    state = calculate_system_state(daily_state, liturgical_context, unconfessed_count)["state"]
     assert state == "DEGRADED"
     print("✓ test_alignment_degraded_no_prayer passed")
 
@@ -179,6 +188,8 @@ def test_alignment_degraded_signal_noise():
         "prayer_minutes": 10,
         "reading_minutes": 5,
         "screen_time_minutes": 600,  # High noise
+        "screen_time_social": 400,
+        "screen_time_entertainment": 200,
         "fasted": True,
         "prayed": True,
     }
@@ -189,30 +200,62 @@ def test_alignment_degraded_signal_noise():
     }
     unconfessed_count = 0
     
-    state = calculate_system_state(daily_state, liturgical_context, unconfessed_count)
+    state = calculate_system_state(daily_state, liturgical_context, unconfessed_count)["state"]
     assert state == "DEGRADED"
     print("✓ test_alignment_degraded_signal_noise passed")
 
 
 def test_cmd_health_with_mock():
     """Test cmd_health function with mocked database."""
-    with patch("logos.cli.fetch_system_health_today") as mock_fetch:
-        mock_fetch.return_value = {
-            "date": date(2026, 1, 20),
-            "prayer_minutes": 120,
-            "reading_minutes": 45,
-            "screen_time_minutes": 0,
-            "fasted": True,
-            "prayed": True,
-            "fast_type": "regular",
-            "feast": None,
-            "feast_level": None,
-            "unconfessed_count": 0,
-        }
-        
+    health_data = {
+        "date": date(2026, 1, 20),
+        "prayer_minutes": 120,
+        "reading_minutes": 45,
+        "screen_time_minutes": 0,
+        "fasted": True,
+        "prayed": True,
+        "fast_type": "regular",
+        "feast": None,
+        "feast_level": None,
+        "unconfessed_count": 0,
+    }
+    with patch("logos.db.fetch_health_cache", return_value=(1, date(2026, 1, 20), None)), \
+         patch("logos.db.store_health_cache") as store, \
+         patch("logos.db.fetch_system_health_today", return_value=health_data), \
+         patch("logos.baseline.detect_anomalies", return_value=[]):
         exit_code = cmd_health(None)
-        assert exit_code == 0  # STABLE
-        print("✓ test_cmd_health_with_mock passed")
+    assert exit_code == 0  # STABLE
+    assert store.call_args[0][3] == "STABLE"
+    print("✓ test_cmd_health_with_mock passed")
+
+
+def test_pattern_failure_not_cached():
+    """A timed-out pattern section is shown once, never memoized."""
+    import psycopg2
+    from logos.cli import health_snapshot
+    health_data = {
+        "date": date(2026, 1, 20),
+        "prayer_minutes": 120,
+        "reading_minutes": 45,
+        "screen_time_minutes": 0,
+        "fasted": True,
+        "prayed": False,
+        "fast_type": "regular",
+        "feast": None,
+        "feast_level": None,
+        "unconfessed_count": 2,
+    }
+    timeout = psycopg2.OperationalError("canceling statement due to statement timeout")
+    with patch("logos.db.fetch_health_cache", return_value=(1, date(2026, 1, 20), None)), \
+         patch("logos.db.store_health_cache") as store, \
+         patch("logos.db.fetch_system_health_today", return_value=health_data), \
+         patch("logos.baseline.detect_anomalies", return_value=[]), \
+         patch("logos.patterns.analyze_hamartia_patterns", side_effect=timeout):
+        _, _, output, unconfessed = health_snapshot()
+    assert "Unavailable: canceling statement due to statement timeout" in output
+    assert unconfessed == 2
+    assert not store.called
+    print("✓ test_pattern_failure_not_cached passed")
 
 
 if __name__ == "__main__":
@@ -225,5 +268,6 @@ if __name__ == "__main__":
     test_alignment_degraded_no_prayer()
     test_alignment_degraded_signal_noise()
     test_cmd_health_with_mock()
+    test_pattern_failure_not_cached()
     
     print("\n✓ All tests passed")
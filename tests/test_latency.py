@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Tests for the persistent latency histograms behind `logos stats`.
+
+Run with: python -m pytest tests/test_latency.py
+"""
+
+import sys
+import os
+import tempfile
+from datetime import date, timedelta
+
+# Add logos to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from logos import latency
+from logos.latency import HdrHistogram, bucket_index, bucket_upper
+
+
+def test_buckets_bound_the_relative_error():
+    """Every value lands in a bucket whose upper bound is within 1/16 of it."""
+    for micros in list(range(0, 5000)) + [10 ** 6, 123_456_789]:
+        index = bucket_index(micros)
+        assert bucket_upper(index - 1) < micros <= bucket_upper(index) if index else micros == 0
+        assert bucket_upper(index) - micros <= micros / 16
+    print("✓ test_buckets_bound_the_relative_error passed")
+
+
+def test_percentiles():
+    """Percentiles are read from the buckets; the maximum is exact."""
+    histogram = HdrHistogram()
+    for ms in range(1, 101):
+        histogram.record(ms / 1000)
+    assert abs(histogram.percentile(50) - 50_000) <= 50_000 / 16
+    assert abs(histogram.percentile(99) - 99_000) <= 99_000 / 16
+    assert histogram.max == 100_000
+    assert len(histogram.buckets) < 100
+    print("✓ test_percentiles passed")
+
+
+def test_flush_and_windows():
+    """Each flush appends to its day's file; windows merge the days they cover."""
+    today = date(2026, 3, 10)
+    with tempfile.TemporaryDirectory() as directory:
+        os.environ["LOGOS_STATS_DIR"] = directory
+        try:
+            latency.record("command", "ascetic pray", 0.010)
+            latency.record("query", "mutations.update_daily_state", 0.002)
+            latency.flush(day=today - timedelta(days=3))
+            latency.record("command", "ascetic pray", 0.030)
+            latency.flush(day=today)
+            latency.flush(day=today)  # nothing pending: nothing written
+
+            with open(os.path.join(directory, f"{today}.jsonl")) as f:
+                assert len(f.readlines()) == 1
+
+            per_day = latency.load(7, today)
+            assert per_day[0]["command"]["ascetic pray"].count == 1
+            assert latency.merge_days(per_day[:1])["query"] == {}
+            week = latency.merge_days(per_day)
+            assert week["command"]["ascetic pray"].count == 2
+            assert week["query"]["mutations.update_daily_state"].count == 1
+
+            report = latency.format_stats([1, 7], match="pray", today=today)
+            assert "ascetic pray" in report and "update_daily_state" not in report
+        finally:
+            del os.environ["LOGOS_STATS_DIR"]
+    print("✓ test_flush_and_windows passed")
+
+
+if __name__ == "__main__":
+    test_buckets_bound_the_relative_error()
+    test_percentiles()
+    test_flush_and_windows()
+
+    print("\n✓ All tests passed")
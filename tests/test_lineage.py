@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Tests for the sin lineage closure (no database needed).
+
+Run with: python -m pytest tests/test_lineage.py
+"""
+
+import sys
+import os
+from datetime import date
+from unittest.mock import patch
+
+# Add logos to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from logos import lineage
+
+
+class RecordingCursor:
+    """Records every statement; fetchall returns the rows it was given."""
+
+    def __init__(self, rows=None):
+        self.rows = rows or []
+        self.executed = []
+        self.closed = False
+
+    def execute(self, query, params=None):
+        self.executed.append((" ".join(query.split()), params))
+
+    def fetchall(self):
+        return self.rows
+
+    def fetchone(self):
+        return self.rows[0] if self.rows else None
+
+    def close(self):
+        self.closed = True
+
+
+class FakeConnection:
+    def __init__(self, cursor):
+        self.cur = cursor
+        self.closed = False
+
+    def cursor(self, name=None, tag=None):
+        return self.cur
+
+    def close(self):
+        self.closed = True
+
+
+def test_root_sin_starts_a_tree():
+    """A sin without a parent gets its self-row and a tree of its own."""
+    cur = RecordingCursor()
+    lineage.record_lineage(cur, 7)
+
+    assert len(cur.executed) == 2
+    closure, tree = cur.executed
+    assert closure[0].startswith("INSERT INTO hamartia_lineage ")
+    assert closure[1] == (7, 7, 7, None)  # Parent None: only the self-row is inserted
+    assert tree == ("INSERT INTO hamartia_lineage_tree (root_id) VALUES (%s)", (7,))
+    print("✓ test_root_sin_starts_a_tree passed")
+
+
+def test_child_inherits_parent_ancestors():
+    """A child copies its parent's ancestors one level deeper and grows the root's tree."""
+    cur = RecordingCursor()
+    lineage.record_lineage(cur, 9, parent_sin_id=4)
+
+    assert len(cur.executed) == 2
+    closure, tree = cur.executed
+    assert "depth + 1" in closure[0] and "WHERE descendant_id = %s" in closure[0]
+    assert closure[1] == (9, 9, 9, 4)
+    assert tree[0].startswith("UPDATE hamartia_lineage_tree")
+    assert "size = t.size + 1" in tree[0] and "GREATEST(t.max_depth, l.depth)" in tree[0]
+    assert tree[1] == (9,)
+    print("✓ test_child_inherits_parent_ancestors passed")
+
+
+def test_ancestors_root_first():
+    """Ancestor rows become dicts in query order; an unknown sin raises ValueError."""
+    rows = [
+        (1, date(2026, 3, 1), "Pride", "root", 2),
+        (4, date(2026, 3, 2), "Anger", "middle", 1),
+        (9, date(2026, 3, 3), "Anger", "leaf", 0),
+    ]
+    cur = RecordingCursor(rows)
+    conn = FakeConnection(cur)
+    with patch("logos.lineage.get_connection", return_value=conn):
+        chain = lineage.fetch_ancestors(9)
+
+    assert [sin["id"] for sin in chain] == [1, 4, 9]
+    assert [sin["depth"] for sin in chain] == [2, 1, 0]
+    assert chain[0]["passions"] == "Pride"
+    assert cur.executed[0][1] == (9,)
+    assert cur.closed and conn.closed
+
+    conn = FakeConnection(RecordingCursor())
+    with patch("logos.lineage.get_connection", return_value=conn):
+        try:
+            lineage.fetch_ancestors(404)
+            assert False, "expected ValueError"
+        except ValueError as e:
+            assert "404" in str(e)
+    assert conn.closed
+    print("✓ test_ancestors_root_first passed")
+
+
+def test_depth_of_unknown_sin():
+    """fetch_depth returns the deepest closure row and refuses unknown sins."""
+    with patch("logos.lineage.get_connection", return_value=FakeConnection(RecordingCursor([(3,)]))):
+        assert lineage.fetch_depth(9) == 3
+    with patch("logos.lineage.get_connection", return_value=FakeConnection(RecordingCursor([(None,)]))):
+        try:
+            lineage.fetch_depth(404)
+            assert False, "expected ValueError"
+        except ValueError:
+            pass
+    print("✓ test_depth_of_unknown_sin passed")
+
+
+if __name__ == "__main__":
+    test_root_sin_starts_a_tree()
+    test_child_inherits_parent_ancestors()
+    test_ancestors_root_first()
+    test_depth_of_unknown_sin()
+
+    print("\n✓ All tests passed")
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Tests for the Prometheus exposition and the version-stamped snapshot.
+
+Run with: python -m pytest tests/test_metrics.py
+"""
+
+import sys
+import os
+from datetime import date, datetime
+from unittest.mock import patch
+
+# Add logos to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from logos import metrics
+from logos.metrics import Histogram, SnapshotCache, render, observe_query
+
+
+def snapshot(version, noise=0):
+    return {
+        "version": version,
+        "day": date.today(),
+        "state": "DEGRADED",
+        "unconfessed": 3,
+        "work": {"state": "STABLE", "diagnosis": "Nominal"},
+        "counters": {"signal": 90, "noise": noise, "debt": 1},
+        "today": None,
+    }
+
+
+def test_histogram_buckets_are_upper_bounds():
+    """A latency equal to a bound falls in that bound's bucket."""
+    histogram = Histogram()
+    for seconds in (0.001, 0.0011, 30.0):
+        histogram.observe(seconds)
+    assert histogram.counts[1] == 1   # le 0.001
+    assert histogram.counts[2] == 1   # le 0.0025
+    assert histogram.counts[-1] == 1  # +Inf
+    assert histogram.count == 3
+    print("✓ test_histogram_buckets_are_upper_bounds passed")
+
+
+def test_snapshot_reused_until_version_changes():
+    """Scrapes read memory until a newer version is reported."""
+    loads = []
+
+    def load():
+        loads.append(1)
+        return snapshot(version=7)
+
+    cache = SnapshotCache(load)
+    cache.get()
+    cache.get()
+    assert len(loads) == 2  # no version known yet: nothing to trust
+
+    cache.changed(7)
+    cache.get()
+    cache.get()
+    assert len(loads) == 2
+
+    cache.changed(8)
+    cache.get()
+    assert len(loads) == 3
+    print("✓ test_snapshot_reused_until_version_changes passed")
+
+
+def test_render_exposition():
+    """Gauges, cumulative buckets, and no ratio without noise."""
+    observe_query("db.fetch_test", 0.002)
+    observe_query("db.fetch_test", 0.2)
+    text = render(snapshot(version=7))
+
+    assert "logos_health_up 1" in text
+    assert 'logos_alignment_state{state="DEGRADED"} 1' in text
+    assert 'logos_alignment_state{state="STABLE"} 0' in text
+    assert "logos_health_exit_code 1" in text
+    assert "logos_unconfessed_sins 3" in text
+    assert "logos_entropic_debt 1" in text
+    assert "logos_work_signal_noise_ratio" not in text
+    assert "logos_today_recorded 0" in text
+    assert 'logos_query_duration_seconds_bucket{query="db.fetch_test",le="0.0025"} 1' in text
+    assert 'logos_query_duration_seconds_bucket{query="db.fetch_test",le="0.25"} 2' in text
+    assert 'logos_query_duration_seconds_count{query="db.fetch_test"} 2' in text
+
+    assert "logos_work_signal_noise_ratio 3.0000" in render(snapshot(version=7, noise=30))
+
+    down = render(None)
+    assert "logos_health_up 0" in down
+    assert "logos_alignment_state" not in down
+    assert 'query="db.fetch_test"' in down
+    print("✓ test_render_exposition passed")
+
+
+class AnyRowCursor:
+    """Every statement succeeds; every row is (1, a timestamp)."""
+
+    rowcount = 1
+
+    def execute(self, query, params=None):
+        pass
+
+    def fetchone(self):
+        return (1, datetime(2026, 1, 20, 8, 0))
+
+    def close(self):
+        pass
+
+
+class AnyRowConnection:
+    def cursor(self, name=None, tag=None):
+        return AnyRowCursor()
+
+    def commit(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def test_entry_point_timed_as_one_call():
+    """log_hamartia runs several statements but is one observation."""
+    from logos.mutations import log_hamartia
+    before = metrics._calls.get("mutations.log_hamartia")
+    before = before.count if before else 0
+    with patch("logos.mutations.get_connection", return_value=AnyRowConnection()):
+        log_hamartia("Anger", "raised my voice")
+    assert metrics._calls["mutations.log_hamartia"].count == before + 1
+    assert 'logos_call_duration_seconds_count{call="mutations.log_hamartia"}' in render(None)
+    print("✓ test_entry_point_timed_as_one_call passed")
+
+
+if __name__ == "__main__":
+    test_histogram_buckets_are_upper_bounds()
+    test_snapshot_reused_until_version_changes()
+    test_render_exposition()
+    test_entry_point_timed_as_one_call()
+
+    print("\n✓ All tests passed")
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Tests for the multi-horizon pattern fold (pure computation, no database).
+
+Run with: python -m pytest tests/test_patterns.py
+"""
+
+import sys
+import os
+from datetime import datetime, timedelta
+
+# Add logos to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from logos.patterns import fold_pattern_horizons, passion_join, HORIZONS, HORIZON_UNCONFESSED
+
+NOW = datetime(2026, 1, 20, 12, 0)
+
+
+def _row(days_ago, hour, passion, confessed=False):
+    """Build a scan row with membership computed the way the SQL does."""
+    created_at = (NOW - timedelta(days=days_ago)).replace(hour=hour)
+    membership = tuple(
+        (not confessed) if h == HORIZON_UNCONFESSED else created_at >= NOW - timedelta(days=h)
+        for h in HORIZONS
+    )
+    return (created_at, passion, membership)
+
+
+def test_dominant_per_horizon():
+    """Each horizon sees only its own sins."""
+    rows = sorted([
+        _row(200, 10, "Anger", confessed=True),
+        _row(150, 10, "Anger", confessed=True),
+        _row(60, 10, "Anger", confessed=True),
+        _row(3, 22, "Lust"),
+        _row(2, 23, "Lust"),
+        _row(1, 9, "Acedia"),
+    ])
+    report = fold_pattern_horizons(rows)
+
+    assert report[HORIZON_UNCONFESSED]["sins"] == 3
+    assert report[HORIZON_UNCONFESSED]["dominant_passion"] == "Lust"
+    assert report[HORIZON_UNCONFESSED]["dominant_count"] == 2
+    assert report[7]["sins"] == 3
+    assert report[90]["sins"] == 4
+    assert report[365]["sins"] == 6
+    assert report[365]["dominant_passion"] == "Anger"
+    print("✓ test_dominant_per_horizon passed")
+
+
+def test_hourly_histogram_and_peak():
+    """Hourly histogram feeds the peak period."""
+    rows = sorted([_row(1, 23, "Lust"), _row(2, 22, "Lust"), _row(3, 9, "Anger")])
+    report = fold_pattern_horizons(rows)
+    assert report[7]["hourly"][23] == 1
+    assert report[7]["hourly"][22] == 1
+    assert report[7]["hourly"][9] == 1
+    assert report[7]["peak_time"] == "evening"
+    print("✓ test_hourly_histogram_and_peak passed")
+
+
+def test_causal_chain_within_24h():
+    """A -> B pairs within 24h are counted; same passion and >24h are not."""
+    rows = sorted([
+        _row(10, 8, "Acedia"), _row(10, 20, "Lust"),
+        _row(5, 8, "Acedia"), _row(5, 20, "Lust"),
+        _row(5, 21, "Lust"),
+        _row(40, 8, "Anger"),
+        _row(38, 8, "Pride"),
+    ])
+    report = fold_pattern_horizons(rows)
+    assert report[30]["causal_chain"] == "Acedia -> Lust (3x)"
+    assert report[365]["chain_pairs"] == 3
+    assert report[7]["causal_chain"] == "Acedia -> Lust (2x)"
+    print("✓ test_causal_chain_within_24h passed")
+
+
+def test_empty():
+    """No sins yields empty reports, not errors."""
+    report = fold_pattern_horizons([])
+    for horizon in HORIZONS:
+        assert report[horizon]["sins"] == 0
+        assert report[horizon]["dominant_passion"] is None
+        assert report[horizon]["peak_time"] is None
+    print("✓ test_empty passed")
+
+
+def test_passion_join_rollup():
+    """Root rollup goes through the closure table with a single join."""
+    flat = passion_join("none")
+    root = passion_join("root")
+    assert "passion_closure" not in flat
+    assert root.count("passion_closure") == 1
+    assert "ancestor_is_root" in root
+    try:
+        passion_join("ancestors")
+    except ValueError:
+        print("✓ test_passion_join_rollup passed")
+        return
+    assert False, "expected ValueError"
+
+
+def test_rollup_refused_where_ignored():
+    """--rollup root with --transitions or --approx fails instead of being dropped."""
+    from logos.cli import build_parser
+    for flag in ("--transitions", "--approx"):
+        argv = ["patterns", flag, "--rollup", "root"]
+        args = build_parser(argv).parse_args(argv)
+        try:
+            args.func(args)
+        except SystemExit as e:
+            assert e.code == 2
+            continue
+        assert False, f"expected --rollup root {flag} to be refused"
+    print("✓ test_rollup_refused_where_ignored passed")
+
+
+if __name__ == "__main__":
+    test_dominant_per_horizon()
+    test_hourly_histogram_and_peak()
+    test_causal_chain_within_24h()
+    test_empty()
+    test_passion_join_rollup()
+    test_rollup_refused_where_ignored()
+
+    print("\n✓ All tests passed")
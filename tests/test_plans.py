@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Tests for the query plan regression check (no database needed).
+
+Run with: python -m pytest tests/test_plans.py
+"""
+
+import sys
+import os
+
+# Add logos to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from logos import plans
+
+
+def scan(relation, node_type="Seq Scan", index=None):
+    node = {"Node Type": node_type, "Relation Name": relation}
+    if index:
+        node["Index Name"] = index
+    return node
+
+
+# The causal chain query before an index: hl2 rescanned for every hl1
+SELF_JOIN = {
+    "Node Type": "Nested Loop",
+    "Plans": [
+        scan("hamartia_log", "Index Scan", "idx_hamartia_unconfessed_created_at"),
+        {"Node Type": "Materialize", "Plans": [scan("hamartia_log")]},
+    ],
+}
+
+
+def test_registry_is_plannable():
+    """Unique ids, a source per module, placeholders only where execute() gets params."""
+    statements = plans.hot_statements()
+    ids = [s["id"] for s in statements]
+    assert len(ids) == len(set(ids))
+    assert "db.fetch_system_health_today" in ids
+    assert "mutations.record_sacrament[filters]" in ids and "mutations.log_hamartia[insert]" in ids
+    for statement in statements:
+        assert os.path.exists(os.path.join(plans.ROOT_DIR, statement["source"])), statement["id"]
+        assert plans.statement_kind(statement["sql"]) in plans.PLANNABLE, statement["id"]
+        count = plans.to_positional(statement["sql"])[1]
+        assert statement["params"] or count == 0, statement["id"]
+    by_id = {s["id"]: s for s in statements}
+    assert plans.to_positional(by_id["mutations.fetch_unconfessed_page[next]"]["sql"])[1] == 4
+    print("✓ test_registry_is_plannable passed")
+
+
+def test_placeholders_become_prepare_parameters():
+    """%s in order, one number per %(name)s, %% unescaped."""
+    assert plans.to_positional("SELECT %s, %s") == ("SELECT $1, $2", 2)
+    assert plans.to_positional(
+        "WHERE a >= %(start)s AND b < %(start)s + %(days)s AND c LIKE 'x%%'"
+    ) == ("WHERE a >= $1 AND b < $1 + $2 AND c LIKE 'x%'", 2)
+    assert plans.to_positional("format('%%s')") == ("format('%s')", 0)
+    print("✓ test_placeholders_become_prepare_parameters passed")
+
+
+def test_hazards_only_on_large_tables():
+    """Seq scans and unindexed self-joins count only where the table is large."""
+    large = {"hamartia_log"}
+    assert plans.hazards(SELF_JOIN, large) == ["nested-loop self-join on hamartia_log",
+                                               "seq scan on hamartia_log"]
+    assert plans.hazards(SELF_JOIN, set()) == []
+    assert plans.hazards(scan("passion_ontology"), large) == []
+
+    indexed = {"Node Type": "Nested Loop", "Plans": [
+        scan("hamartia_log", "Index Scan", "idx_hamartia_created_at"),
+        scan("hamartia_log", "Index Scan", "idx_hamartia_created_at"),
+    ]}
+    assert plans.hazards(indexed, large) == []
+    assert plans.shape(SELF_JOIN) == [
+        "Nested Loop",
+        "  Index Scan on hamartia_log using idx_hamartia_unconfessed_created_at",
+        "  Materialize",
+        "    Seq Scan on hamartia_log",
+    ]
+    print("✓ test_hazards_only_on_large_tables passed")
+
+
+class StatsCursor:
+    """Answers the pg_class query with fixed estimates."""
+
+    def __init__(self, rows):
+        self.rows = rows
+
+    def execute(self, query, params=None):
+        pass
+
+    def fetchall(self):
+        return self.rows
+
+
+def test_daily_tables_are_large_sooner():
+    """A few years of days makes daily_state large; other tables need LARGE_ROWS."""
+    cur = StatsCursor([("daily_state", 3651.0), ("hamartia_log", 146000.0),
+                       ("confession_log", 3651.0), ("passion_ontology", 8.0)])
+    assert plans.large_tables(cur) == {"daily_state", "hamartia_log"}
+    assert plans.hazards(scan("daily_state"), plans.large_tables(cur)) == ["seq scan on daily_state"]
+    print("✓ test_daily_tables_are_large_sooner passed")
+
+
+def test_only_new_hazards_regress():
+    """Accepted hazards pass; a new one fails; a changed shape is only noted."""
+    baseline = {
+        "patterns.report#1": {"sql": "abc", "shape": ["Seq Scan on hamartia_log"],
+                              "hazards": ["seq scan on hamartia_log"]},
+        "db.fetch#1": {"sql": "def", "shape": ["Index Scan on daily_state"], "hazards": []},
+        "db.gone#1": {"sql": "123", "shape": ["Result"], "hazards": []},
+    }
+    results = {
+        "patterns.report#1": {"sql": "abc", "shape": ["Seq Scan on hamartia_log"],
+                              "hazards": ["seq scan on hamartia_log"]},
+        "db.fetch#1": {"sql": "def", "shape": ["Seq Scan on daily_state"],
+                       "hazards": ["seq scan on daily_state"]},
+        "db.new#1": {"sql": "456", "shape": ["Result"], "hazards": []},
+    }
+    regressions, notes = plans.compare(results, baseline)
+    assert regressions == [("db.fetch#1", "seq scan on daily_state")]
+    assert notes == [("db.fetch#1", "plan shape changed"), ("db.new#1", "new statement"),
+                     ("db.gone#1", "no longer found")]
+    print("✓ test_only_new_hazards_regress passed")
+
+
+if __name__ == "__main__":
+    test_registry_is_plannable()
+    test_placeholders_become_prepare_parameters()
+    test_hazards_only_on_large_tables()
+    test_daily_tables_are_large_sooner()
+    test_only_new_hazards_regress()
+
+    print("\n✓ All tests passed")
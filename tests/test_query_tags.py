@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Tests for query tags and connection naming (no database needed).
+
+Run with: python -m pytest tests/test_query_tags.py
+"""
+
+import sys
+import os
+import threading
+
+# Add logos to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from psycopg2 import sql
+from psycopg2.extensions import STATUS_READY, STATUS_IN_TRANSACTION
+from logos.db import (_tag, _is_read, _connect_params, _rename, name_command,
+                      SessionConnection, TimedCursor)
+
+
+def test_statements_carry_a_stable_tag():
+    """Plain and composed statements are prefixed with the issuer's tag."""
+    assert _tag("mutations.log_hamartia", "INSERT INTO hamartia_log VALUES (%s)") == \
+        "/* logos:mutations.log_hamartia */ INSERT INTO hamartia_log VALUES (%s)"
+    composed = _tag("timeline.fetch", sql.SQL("SELECT * FROM {}").format(sql.Identifier("t")))
+    assert isinstance(composed, sql.Composed)
+    assert composed.seq[0] == sql.SQL("/* logos:timeline.fetch */ ")
+    print("✓ test_statements_carry_a_stable_tag passed")
+
+
+def test_session_cursors_keep_their_tag():
+    """Session connections hand the caller's tag to the real connection."""
+    class ConnectionStub:
+        def cursor(self, name=None, tag=None):
+            return name, tag
+
+    session = SessionConnection(ConnectionStub())
+    assert session.cursor(tag="mutations.log_hamartia") == (None, "mutations.log_hamartia")
+    assert session.cursor("timeline_sins", tag="timeline.iter_timeline") == \
+        ("timeline_sins", "timeline.iter_timeline")
+    assert TimedCursor.tag == "other"  # A cursor opened without one
+    print("✓ test_session_cursors_keep_their_tag passed")
+
+
+def test_only_reads_are_analyzed_again():
+    """EXPLAIN ANALYZE re-runs a statement: only plain SELECTs qualify."""
+    assert _is_read("\n    SELECT date, prayer_minutes FROM system_health_today")
+    assert not _is_read("UPDATE daily_state SET prayed = TRUE")
+    assert not _is_read("INSERT INTO hamartia_log (date) VALUES (%s) RETURNING id")
+    assert not _is_read("WITH bumped AS (UPDATE data_version SET version = version + 1) SELECT 1")
+    assert not _is_read("SELECT pg_advisory_lock(%s, %s)")
+    assert not _is_read("SELECT NEXTVAL('hamartia_log_id_seq')")
+    assert not _is_read("")
+    print("✓ test_only_reads_are_analyzed_again passed")
+
+
+def test_application_name_follows_the_command():
+    """cli.main names connections after the running command."""
+    saved = os.environ.pop("PGAPPNAME", None)
+    try:
+        assert _connect_params()["application_name"] == "logos"
+        os.environ["PGAPPNAME"] = "logos ascetic pray"
+        assert _connect_params()["application_name"] == "logos ascetic pray"
+    finally:
+        os.environ.pop("PGAPPNAME", None)
+        if saved is not None:
+            os.environ["PGAPPNAME"] = saved
+    print("✓ test_application_name_follows_the_command passed")
+
+
+class NamedConnectionStub:
+    """Records set_config calls and commits."""
+
+    closed = 0
+
+    def __init__(self, status=STATUS_READY):
+        self.status = status
+        self.names = []
+        self.commits = 0
+
+    def cursor(self, name=None, tag=None):
+        stub = self
+
+        class Cursor:
+            def execute(self, query, params=None):
+                stub.names.append(params[0])
+
+            def close(self):
+                pass
+
+        return Cursor()
+
+    def commit(self):
+        self.commits += 1
+
+
+def test_shared_connections_renamed_per_command():
+    """A batch line or route renames its thread's shared connection once per command."""
+    def run():
+        name_command("ascetic pray")
+        idle = NamedConnectionStub()
+        _rename(idle)
+        _rename(idle)
+        assert idle.names == ["logos ascetic pray"] and idle.commits == 1
+        name_command("serve POST /log/add")
+        _rename(idle)
+        assert idle.names[-1] == "logos serve POST /log/add"
+
+        # In a deferred batch a rolled-back line undoes it: set every time
+        deferred = NamedConnectionStub(STATUS_IN_TRANSACTION)
+        _rename(deferred)
+        _rename(deferred)
+        assert len(deferred.names) == 2 and deferred.commits == 0
+
+    # Names are per thread: the server's workers do not share them
+    failures = []
+
+    def worker():
+        try:
+            run()
+        except AssertionError as e:
+            failures.append(e)
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    thread.join()
+    assert not failures, failures
+    assert _connect_params()["application_name"] == os.environ.get("PGAPPNAME", "logos")
+    print("✓ test_shared_connections_renamed_per_command passed")
+
+
+if __name__ == "__main__":
+    test_statements_carry_a_stable_tag()
+    test_session_cursors_keep_their_tag()
+    test_only_reads_are_analyzed_again()
+    test_application_name_follows_the_command()
+    test_shared_connections_renamed_per_command()
+
+    print("\n✓ All tests passed")
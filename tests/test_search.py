@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+Tests for full-text search paging.
+
+Run with: python -m pytest tests/test_search.py
+"""
+
+import sys
+import os
+
+# Add logos to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from logos.search import encode_cursor, decode_cursor
+
+
+def test_page_token_round_trip():
+    """Tokens carry the exact rank so keyset comparison does not drift."""
+    rank = 0.06079271
+    token = encode_cursor(rank, "confession", 4211)
+    assert decode_cursor(token) == (rank, "confession", 4211)
+    print("✓ test_page_token_round_trip passed")
+
+
+def test_page_token_rejects_garbage():
+    """Malformed tokens fail loudly."""
+    for token in ("", "abc", "0.1:penance:3", "0.1:sin:x"):
+        try:
+            decode_cursor(token)
+        except ValueError:
+            continue
+        assert False, f"expected ValueError for {token!r}"
+    print("✓ test_page_token_rejects_garbage passed")
+
+
+if __name__ == "__main__":
+    test_page_token_round_trip()
+    test_page_token_rejects_garbage()
+
+    print("\n✓ All tests passed")
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Tests for the liturgical season report.
+
+Run with: python -m pytest tests/test_seasons.py
+"""
+
+import sys
+import os
+
+# Add logos to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from logos.seasons import fold_season_rows
+
+
+def test_fold_season_rows():
+    """Seasons keep liturgical order; density is per week of season days."""
+    mix_rows = [
+        ("Ordinary Time", "Acedia", 10),
+        ("Great Lent", "Gluttony", 6),
+        ("Great Lent", "Anger", 8),
+        ("Ordinary Time", None, 2),
+        (None, "Lust", 3),
+    ]
+    day_rows = [("Ordinary Time", 70), ("Great Lent", 14), ("Nativity Fast", 27)]
+
+    report = fold_season_rows(mix_rows, day_rows)
+    seasons = [s["season"] for s in report["seasons"]]
+    assert seasons == ["Great Lent", "Nativity Fast", "Ordinary Time"]
+
+    lent = report["seasons"][0]
+    assert lent["sins"] == 14
+    assert lent["per_week"] == 7.0
+    assert lent["passions"] == [("Anger", 8), ("Gluttony", 6)]
+
+    nativity = report["seasons"][1]
+    assert nativity["sins"] == 0 and nativity["per_week"] == 0
+
+    ordinary = report["seasons"][2]
+    assert ordinary["sins"] == 12
+    assert ordinary["passions"] == [("Acedia", 10)]
+    assert report["uncovered"] == 3
+    print("✓ test_fold_season_rows passed")
+
+
+if __name__ == "__main__":
+    test_fold_season_rows()
+
+    print("\n✓ All tests passed")
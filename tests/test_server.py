@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Tests for the HTTP API's routing and validation (no database needed).
+
+Run with: python -m pytest tests/test_server.py
+"""
+
+import sys
+import os
+import asyncio
+from http import HTTPStatus
+
+# Add logos to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from logos.server import dispatch, read_request, run_handler, post_screen
+
+
+JSON = {"content-type": "application/json", "host": "localhost:8765"}
+
+
+def request(method, path, body=b"", headers=None):
+    return method, path, {}, headers or {}, body
+
+
+def test_read_request_parses_keep_alive_stream():
+    """Two pipelined requests are read one at a time from the same stream."""
+    async def read_two():
+        reader = asyncio.StreamReader()
+        reader.feed_data(b"POST /ascetic/read?x=1 HTTP/1.1\r\nContent-Length: 15\r\n\r\n{\"minutes\": 10}"
+                         b"GET /health HTTP/1.1\r\n\r\n")
+        reader.feed_eof()
+        return await read_request(reader), await read_request(reader), await read_request(reader)
+
+    first, second, end = asyncio.run(read_two())
+    assert first == ("POST", "/ascetic/read", {"x": "1"}, {"content-length": "15"}, b'{"minutes": 10}')
+    assert second[:2] == ("GET", "/health")
+    assert end is None
+    print("✓ test_read_request_parses_keep_alive_stream passed")
+
+
+def test_dispatch_rejects_before_touching_the_engine():
+    """Routing, token and body errors are answered without a worker thread."""
+    async def statuses():
+        return [
+            (await dispatch(request("GET", "/nowhere"), None, None))[0],
+            (await dispatch(request("GET", "/log"), None, None))[0],
+            (await dispatch(request("POST", "/log", b"not json", JSON), None, None))[0],
+            (await dispatch(request("POST", "/log", b"[1]", JSON), None, None))[0],
+            (await dispatch(request("GET", "/health"), None, "secret"))[0],
+        ]
+
+    assert asyncio.run(statuses()) == [
+        HTTPStatus.NOT_FOUND,
+        HTTPStatus.METHOD_NOT_ALLOWED,
+        HTTPStatus.BAD_REQUEST,
+        HTTPStatus.BAD_REQUEST,
+        HTTPStatus.UNAUTHORIZED,
+    ]
+    print("✓ test_dispatch_rejects_before_touching_the_engine passed")
+
+
+def test_cross_site_writes_are_refused():
+    """Without a token, a POST a web page could send is refused before parsing."""
+    body = b'{"minutes": 20}'
+    form = {"content-type": "text/plain", "host": "localhost:8765"}
+    foreign = dict(JSON, origin="https://example.com")
+    same = dict(JSON, origin="http://localhost:8765")
+
+    async def statuses():
+        return [
+            (await dispatch(request("POST", "/ascetic/pray", body), None, None))[0],
+            (await dispatch(request("POST", "/ascetic/pray", body, form), None, None))[0],
+            (await dispatch(request("POST", "/ascetic/pray", body, foreign), None, None))[0],
+            (await dispatch(request("POST", "/ascetic/pray", b"[1]", same), None, None))[0],
+        ]
+
+    assert asyncio.run(statuses()) == [
+        HTTPStatus.UNSUPPORTED_MEDIA_TYPE,
+        HTTPStatus.UNSUPPORTED_MEDIA_TYPE,
+        HTTPStatus.FORBIDDEN,
+        HTTPStatus.BAD_REQUEST,  # Same origin: reaches body validation
+    ]
+    print("✓ test_cross_site_writes_are_refused passed")
+
+
+def test_unexpected_errors_are_server_errors():
+    """Any exception in a handler becomes a 500 carrying its message."""
+    def broken(body, query):
+        raise TypeError("unsupported operand")
+
+    status, payload = run_handler(broken, {}, {})
+    assert status == HTTPStatus.INTERNAL_SERVER_ERROR
+    assert payload == {"error": "TypeError: unsupported operand"}
+    print("✓ test_unexpected_errors_are_server_errors passed")
+
+
+def test_invalid_fields_are_bad_requests():
+    """Field validation happens before any write."""
+    for body in ({}, {"minutes": True}, {"minutes": 5, "category": "games"}):
+        status, payload = run_handler(post_screen, body, {})
+        assert status == HTTPStatus.BAD_REQUEST, body
+        assert "error" in payload
+    print("✓ test_invalid_fields_are_bad_requests passed")
+
+
+if __name__ == "__main__":
+    test_read_request_parses_keep_alive_stream()
+    test_dispatch_rejects_before_touching_the_engine()
+    test_cross_site_writes_are_refused()
+    test_unexpected_errors_are_server_errors()
+    test_invalid_fields_are_bad_requests()
+
+    print("\n✓ All tests passed")
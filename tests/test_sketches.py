@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Tests for the streaming sketches used by approximate analytics.
+
+Run with: python -m pytest tests/test_sketches.py
+"""
+
+import sys
+import os
+import random
+
+# Add logos to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from logos.sketches import (CountMinSketch, SpaceSaving, HyperLogLog,
+                            space_saving_from_dict, hyperloglog_from_dict)
+
+
+def _stream(seed, n):
+    rng = random.Random(seed)
+    keys = [f"desc-{i}" for i in range(500)]
+    weights = [1.0 / (i + 1) for i in range(500)]  # Zipf-like
+    return rng.choices(keys, weights=weights, k=n)
+
+
+def test_count_min_bounds():
+    """Estimates never undercount and stay within epsilon * N."""
+    stream = _stream(1, 20000)
+    truth = {}
+    cm = CountMinSketch()
+    for key in stream:
+        cm.add(key)
+        truth[key] = truth.get(key, 0) + 1
+
+    bound = cm.error_bound()
+    for key, count in truth.items():
+        est = cm.estimate(key)
+        assert est >= count
+        assert est <= count + bound
+    print("✓ test_count_min_bounds passed")
+
+
+def test_space_saving_bounds():
+    """Top-k counters bracket the true count."""
+    stream = _stream(2, 20000)
+    truth = {}
+    ss = SpaceSaving(k=32)
+    for key in stream:
+        ss.add(key)
+        truth[key] = truth.get(key, 0) + 1
+
+    top = ss.top(5)
+    assert top[0][0] == "desc-0"
+    for key, count, lower in top:
+        assert lower <= truth[key] <= count
+    print("✓ test_space_saving_bounds passed")
+
+
+def test_space_saving_merge():
+    """Merged sketches keep the bounds across buckets."""
+    stream = _stream(3, 20000)
+    truth = {}
+    a, b = SpaceSaving(k=32), SpaceSaving(k=32)
+    for i, key in enumerate(stream):
+        (a if i % 2 else b).add(key)
+        truth[key] = truth.get(key, 0) + 1
+
+    merged = space_saving_from_dict(a.to_dict()).merge(b)
+    assert merged.total == len(stream)
+    for key, count, lower in merged.top(5):
+        assert lower <= truth[key] <= count
+    print("✓ test_space_saving_merge passed")
+
+
+def test_hyperloglog_estimate_and_merge():
+    """Distinct-day estimates stay within a few standard errors."""
+    days = [f"2026-{m:02d}-{d:02d}" for m in range(1, 13) for d in range(1, 29)]
+    first, second = HyperLogLog(), HyperLogLog()
+    for i, day in enumerate(days):
+        (first if i < 200 else second).add(day)
+        first.add(days[0])  # Duplicates do not count twice
+
+    merged = hyperloglog_from_dict(first.to_dict()).merge(second)
+    est = merged.estimate()
+    assert abs(est - len(days)) <= 3 * merged.relative_error() * len(days)
+    print("✓ test_hyperloglog_estimate_and_merge passed")
+
+
+def test_count_min_merge_dimensions():
+    """Sketches of different shape cannot be merged."""
+    try:
+        CountMinSketch(width=10).merge(CountMinSketch(width=20))
+    except ValueError:
+        print("✓ test_count_min_merge_dimensions passed")
+        return
+    assert False, "expected ValueError"
+
+
+if __name__ == "__main__":
+    test_count_min_bounds()
+    test_space_saving_bounds()
+    test_space_saving_merge()
+    test_hyperloglog_estimate_and_merge()
+    test_count_min_merge_dimensions()
+
+    print("\n✓ All tests passed")
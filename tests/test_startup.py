@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Startup imports of the logos CLI.
+
+Runs real commands under `python -X importtime` and checks which modules
+they load. The set of modules is the budget: it does not flake on a busy
+host the way milliseconds do. No database is needed: `ascetic status`
+fails to connect after importing everything it needs.
+
+Run with: python -m pytest tests/test_startup.py
+"""
+
+import sys
+import os
+import tempfile
+import subprocess
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+# Never needed to print help or read today's state
+ANALYSIS_MODULES = ("logos.alignment", "logos.patterns", "logos.correlation",
+                    "logos.agenda", "logos.timeline", "logos.search", "logos.seasons")
+
+
+def imported_modules(args):
+    """Names of every module imported by `python -X importtime <args>`."""
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ, LOGOS_DB_HOST=os.path.join(tmp, "no-socket"),
+                   LOGOS_PROMPT_SNAPSHOT=os.path.join(tmp, "prompt"),
+                   LOGOS_STATS_DIR=os.path.join(tmp, "latency"))
+        result = subprocess.run([sys.executable, "-X", "importtime", *args],
+                                cwd=ROOT, env=env, capture_output=True, text=True)
+    modules = set()
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "imported package" not in line:
+            modules.add(line.rsplit("|", 1)[1].strip())
+    return modules
+
+
+def test_help_skips_database():
+    """logos --help loads neither psycopg2 nor any database module."""
+    modules = imported_modules(["-m", "logos", "--help"])
+    assert "logos.cli" in modules
+    for name in ("psycopg2", "logos.db", "logos.mutations") + ANALYSIS_MODULES:
+        assert name not in modules, f"{name} imported by logos --help"
+    print("✓ test_help_skips_database passed")
+
+
+def test_ascetic_status_loads_only_its_path():
+    """logos ascetic status loads the database layer and nothing analytical."""
+    modules = imported_modules(["-m", "logos", "ascetic", "status"])
+    assert "psycopg2" in modules
+    for name in ANALYSIS_MODULES:
+        assert name not in modules, f"{name} imported by logos ascetic status"
+    print("✓ test_ascetic_status_loads_only_its_path passed")
+
+
+if __name__ == "__main__":
+    test_help_skips_database()
+    test_ascetic_status_loads_only_its_path()
+
+    print("\n✓ All tests passed")
@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""
+Tests for the merged timeline.
+
+Run with: python -m pytest tests/test_timeline.py
+"""
+
+import sys
+import os
+from datetime import datetime, timedelta
+
+# Add logos to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from logos.timeline import merge_events
+
+
+def test_merge_events_orders_all_streams():
+    """Events from every source come out in timestamp order, lazily."""
+    t0 = datetime(2026, 3, 1, 8, 0)
+    sins = ((t0 + timedelta(hours=h), h, "Anger: ...") for h in (1, 5, 9))
+    confessions = iter([(t0 + timedelta(hours=6), 1, "Confession")])
+    switches = iter([])
+
+    merged = merge_events({"sin": sins, "confession": confessions, "switch": switches})
+    first = next(merged)
+    assert first[1] == "sin" and first[0] == t0 + timedelta(hours=1)
+
+    rest = list(merged)
+    assert [e[1] for e in rest] == ["sin", "confession", "sin"]
+    assert all(a[0] <= b[0] for a, b in zip(rest, rest[1:]))
+    print("✓ test_merge_events_orders_all_streams passed")
+
+
+if __name__ == "__main__":
+    test_merge_events_orders_all_streams()
+
+    print("\n✓ All tests passed")
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Tests for --trace span trees (no database needed).
+
+Run with: python -m pytest tests/test_trace.py
+"""
+
+import sys
+import os
+
+# Add logos to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from logos import trace
+from logos.cli import _requested_command
+
+
+def test_spans_nest_and_statements_attach_to_the_open_span():
+    """SQL lands under the span that was open when it ran."""
+    trace.start("health")
+    outer = trace.begin("compute health")
+    trace.statement("db.fetch_system_health_today", "SELECT date\n  FROM system_health_today", 0.004, 1)
+    inner = trace.begin("alignment (calculate_system_state)")
+    trace.end(inner)
+    trace.end(outer)
+    trace.statement("db.store_health_cache", "INSERT INTO health_cache ...", 0.001, None)
+    root = trace.stop()
+
+    assert not trace.active()
+    assert [c.name for c in root.children] == ["compute health", "SQL db.store_health_cache"]
+    assert [c.name for c in outer.children] == ["SQL db.fetch_system_health_today",
+                                                "alignment (calculate_system_state)"]
+    text = trace.format_tree(root)
+    assert "1 row  SELECT date FROM system_health_today" in text
+    assert "failed  INSERT INTO health_cache" in text
+    print("✓ test_spans_nest_and_statements_attach_to_the_open_span passed")
+
+
+def test_tracing_off_is_a_no_op():
+    """Hooks do nothing without an active trace; plans only over the threshold."""
+    assert trace.begin("connect") is None
+    trace.end(None)
+    trace.statement("db.x", "SELECT 1", 0.5, 1)
+    assert not trace.wants_plan(10.0)
+
+    trace.start("health", explain_ms=5)
+    assert not trace.wants_plan(0.004)
+    assert trace.wants_plan(0.005)
+    trace.stop()
+    print("✓ test_tracing_off_is_a_no_op passed")
+
+
+def test_requested_command_skips_trace_options():
+    """Only the traced command's parsers are built."""
+    assert _requested_command(["--trace", "health"]) == "health"
+    assert _requested_command(["--trace", "--explain-ms", "5", "log", "add"]) == "log"
+    assert _requested_command(["--explain-ms=5", "--trace", "health"]) == "health"
+    assert _requested_command(["--help"]) is None
+    print("✓ test_requested_command_skips_trace_options passed")
+
+
+if __name__ == "__main__":
+    test_spans_nest_and_statements_attach_to_the_open_span()
+    test_tracing_off_is_a_no_op()
+    test_requested_command_skips_trace_options()
+
+    print("\n✓ All tests passed")
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Tests for the passion transition matrix (no database needed).
+
+Run with: python -m pytest tests/test_transitions.py
+"""
+
+import sys
+import os
+from datetime import datetime, timedelta
+
+# Add logos to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from logos.transitions import (
+    GAP_LABELS, GAP_THRESHOLDS, gap_bucket, record_transition, most_likely_successors,
+)
+
+
+class CursorStub:
+    """Records statements; the hamartia_cursor SELECT returns `last`."""
+
+    def __init__(self, last):
+        self.last = last
+        self.executed = []
+
+    def execute(self, query, params=None):
+        self.executed.append((" ".join(query.split()), params))
+
+    def fetchone(self):
+        return self.last
+
+
+def test_gap_buckets():
+    """Each threshold opens the next bucket; the last bucket is open-ended."""
+    assert len(GAP_LABELS) == len(GAP_THRESHOLDS) + 1
+    assert GAP_LABELS[gap_bucket(0)] == "<1h"
+    assert GAP_LABELS[gap_bucket(3599)] == "<1h"
+    assert GAP_LABELS[gap_bucket(3600)] == "1-6h"
+    assert GAP_LABELS[gap_bucket(86399)] == "6-24h"
+    assert GAP_LABELS[gap_bucket(2 * 86400)] == "1-3d"
+    assert GAP_LABELS[gap_bucket(400 * 86400)] == ">30d"
+    print("✓ test_gap_buckets passed")
+
+
+def test_first_sin_only_moves_cursor():
+    """With no previous sin there is no transition to count."""
+    created = datetime(2026, 3, 1, 9, 0)
+    cur = CursorStub((None, None))
+    record_transition(cur, 1, "Anger", created)
+
+    statements = [query for query, _ in cur.executed]
+    assert not any("passion_transitions" in query for query in statements)
+    assert statements[-1].startswith("UPDATE hamartia_cursor")
+    assert cur.executed[-1][1] == (1, "Anger", created)
+    print("✓ test_first_sin_only_moves_cursor passed")
+
+
+def test_transition_counts_gap():
+    """A→B is upserted with the gap in seconds and its histogram bucket (1-based)."""
+    previous = datetime(2026, 3, 1, 9, 0)
+    created = previous + timedelta(hours=2)
+    cur = CursorStub(("Acedia", previous))
+    record_transition(cur, 2, "Gluttony", created)
+
+    upserts = [(q, p) for q, p in cur.executed if q.startswith("INSERT INTO passion_transitions")]
+    assert len(upserts) == 1
+    query, params = upserts[0]
+    assert "count = passion_transitions.count + 1" in query
+    source, target, gap, histogram, index, again = params
+    assert (source, target, gap) == ("Acedia", "Gluttony", 7200.0)
+    assert histogram == [0, 1, 0, 0, 0, 0, 0]
+    assert index == again == 2  # PostgreSQL arrays start at 1
+    assert cur.executed[-1][1] == (2, "Gluttony", created)
+    print("✓ test_transition_counts_gap passed")
+
+
+def test_clock_skew_counts_as_zero_gap():
+    """A sin stamped before its predecessor lands in the first bucket, not a negative one."""
+    previous = datetime(2026, 3, 1, 9, 0)
+    cur = CursorStub(("Anger", previous))
+    record_transition(cur, 3, "Anger", previous - timedelta(minutes=5))
+
+    params = [p for q, p in cur.executed if q.startswith("INSERT INTO passion_transitions")][0]
+    assert params[2] == 0.0 and params[4] == 1
+    print("✓ test_clock_skew_counts_as_zero_gap passed")
+
+
+def test_most_likely_successors():
+    """Per source: the most frequent successor, the row total and its typical gap."""
+    matrix = [
+        {"from_passion": "Acedia", "to_passion": "Gluttony", "count": 5,
+         "mean_seconds": 3000.0, "gap_histogram": [4, 1, 0, 0, 0, 0, 0]},
+        {"from_passion": "Acedia", "to_passion": "Lust", "count": 2,
+         "mean_seconds": 90000.0, "gap_histogram": [0, 0, 0, 2, 0, 0, 0]},
+        {"from_passion": "Anger", "to_passion": "Sadness", "count": 3,
+         "mean_seconds": 20000.0, "gap_histogram": [0, 3, 0, 0, 0, 0, 0]},
+    ]
+    assert most_likely_successors(matrix) == {
+        "Acedia": ("Gluttony", 5, 7, "<1h"),
+        "Anger": ("Sadness", 3, 3, "1-6h"),
+    }
+    assert most_likely_successors([]) == {}
+    print("✓ test_most_likely_successors passed")
+
+
+if __name__ == "__main__":
+    test_gap_buckets()
+    test_first_sin_only_moves_cursor()
+    test_transition_counts_gap()
+    test_clock_skew_counts_as_zero_gap()
+    test_most_likely_successors()
+
+    print("\n✓ All tests passed")
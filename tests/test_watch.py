@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Tests for the live dashboard's wait loop (no database needed).
+
+Run with: python -m pytest tests/test_watch.py
+"""
+
+import sys
+import os
+from unittest.mock import patch
+
+# Add logos to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from logos import watch
+
+
+class ListenerStub:
+    """A LISTEN connection: poll() delivers whatever `pending` holds."""
+
+    def __init__(self, queued=(), pending=()):
+        self.notifies = list(queued)
+        self.pending = list(pending)
+
+    def poll(self):
+        self.notifies.extend(self.pending)
+        self.pending = []
+
+
+def test_queued_notification_skips_select():
+    """A change read along with render()'s queries wakes the loop at once."""
+    conn = ListenerStub(queued=["7"])
+    with patch("logos.watch.select.select", side_effect=AssertionError("slept")), \
+         patch("logos.watch.time.sleep"):
+        watch.wait_for_change(conn, 3600)
+    assert conn.notifies == []
+    print("✓ test_queued_notification_skips_select passed")
+
+
+def test_timeout_without_change():
+    """Nothing queued and nothing readable: return after select's timeout."""
+    conn = ListenerStub()
+    with patch("logos.watch.select.select", return_value=([], [], [])) as wait, \
+         patch("logos.watch.time.sleep") as sleep:
+        watch.wait_for_change(conn, 12.5)
+    assert wait.call_args[0][3] == 12.5
+    sleep.assert_not_called()
+    print("✓ test_timeout_without_change passed")
+
+
+def test_relisten_retries_until_connected():
+    """A failed reconnect is retried instead of ending the dashboard."""
+    attempts = [SystemExit(1), watch.psycopg2.OperationalError("refused"), "conn"]
+
+    def listen():
+        outcome = attempts.pop(0)
+        if isinstance(outcome, BaseException):
+            raise outcome
+        return outcome
+
+    with patch("logos.watch._listen", side_effect=listen), \
+         patch("logos.watch.time.sleep") as sleep:
+        assert watch._relisten() == "conn"
+    assert sleep.call_count == 3
+    print("✓ test_relisten_retries_until_connected passed")
+
+
+if __name__ == "__main__":
+    test_queued_notification_skips_select()
+    test_timeout_without_change()
+    test_relisten_retries_until_connected()
+
+    print("\n✓ All tests passed")